@@ -1,12 +1,27 @@
 """ This module contains our UI and front end code that users can interact with in order
 
-to create and visualize routes to visit up to 6 MLB stadiums on a path.
+to create and visualize routes to visit up to 12 MLB stadiums on a path.
 
 """
 
+from contextlib import nullcontext
 from datetime import date
-
-from dash import Dash, html, dcc, callback, Output, Input, dash_table, no_update
+from glob import glob
+import logging
+import os
+
+import diskcache
+from dash import (
+    Dash,
+    DiskcacheManager,
+    html,
+    dcc,
+    callback,
+    Output,
+    Input,
+    dash_table,
+    no_update,
+)
 from dash.exceptions import PreventUpdate
 import plotly.graph_objects as go
 import dash_loading_spinners as dls
@@ -15,18 +30,204 @@ import pandas as pd
 import numpy as np
 
 from make_route.exhaustive_search import (
-    reduce_routes,
     reduce_schedule,
-    sort_order,
-    find_all_routes,
+    build_league_matrix,
+    build_fare_matrix,
+    pick_route,
 )
-
-df = pd.read_csv("data/final_mlb_schedule.csv")
-cost_dfx = pd.read_csv("data/cost_df.csv")
+from make_route.dynamic_search import GAME_COLUMNS, find_best_route
+from make_route.incremental_search import IncrementalSearch
+from make_route.file_hash import hash_data_files
+from make_route.solve_cache import DiskRouteCache
+from make_route.schedule_store import load_schedule, schedule_files
+from make_route.timing import SolveTimer, SolveProgress
+
+MAX_TEAMS = 12
+# above this many teams the Pareto front takes much longer than one search per sort method
+PARETO_MAX_TEAMS = 8
+# route solves run in background processes, with their progress and results kept here
+BACKGROUND_CACHE_DIR = "cache"
+# seconds between two progress updates of a background solve
+PROGRESS_INTERVAL = 0.25
+# seconds a background result stays cached after it was last used
+BACKGROUND_CACHE_EXPIRE = 3600
+# most sets of teams kept in the saved search of one date window
+SEARCH_MAX_SETS = 4096
+# seconds a lock on the saved search of a date window is held at most, if its process dies.
+# It is only held to merge and write the table, never during a search
+SEARCH_LOCK_EXPIRE = 60
+COST_CSV = "data/cost_df.csv"
+# best routes are kept in this file for every worker and restart, keyed by the data files.
+# Set ROUTE_CACHE_ON_DISK=0 to solve every new query instead, e.g. on a read only disk
+ROUTE_CACHE_ON_DISK = os.environ.get("ROUTE_CACHE_ON_DISK", "1") != "0"
+ROUTE_CACHE_PATH = "cache/routes.sqlite3"
+ROUTE_CACHE_SIZE = 10000
+
+logger = logging.getLogger(__name__)
+
+df = load_schedule()
+cost_dfx = pd.read_csv(COST_CSV)
+# the files the routes are solved from, and the code that solves them
+DATA_FILES = schedule_files() + [COST_CSV]
+CODE_FILES = sorted(
+    glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "make_route", "*.py"))
+) + [os.path.abspath(__file__)]
+# background results are keyed by the deployed code and data, so every worker shares them
+# and a deploy or a change of the data never reuses old routes
+LAUNCH_UID = hash_data_files(CODE_FILES + DATA_FILES)
 
 schedule = df.copy()
-schedule["date"] = pd.to_datetime(schedule["date"])
+league_matrix = build_league_matrix(schedule)
+# one fare per pair of teams: the label searches raise an error for a fare store with the
+# fares of each quarter, which only the exhaustive search functions take
+fare_matrix = build_fare_matrix(cost_dfx)
+background_cache = diskcache.Cache(BACKGROUND_CACHE_DIR)
+
+
+def solve_front(teams, start_date, end_date):
+    """
+    Finds every route of the teams that is not dominated in time, distance and cost. The
+
+    table of the search of the dates is kept in the disk cache, at most SEARCH_MAX_SETS sets
+
+    of teams, so adding or removing a team only searches the sets of teams that were not
+
+    searched before, in any background process. The search runs on a copy of the table, so
+
+    processes searching the same dates run at once. Its sets are merged into the table saved
+
+    at the end under a lock, so two processes never overwrite each other's sets.
+
+    """
+    teamlist = list(teams)
+    short_sched = reduce_schedule(schedule, teamlist, start_date, end_date)
+    key = ("search", LAUNCH_UID, start_date, end_date)
+    search = IncrementalSearch(
+        schedule,
+        cost_dfx,
+        start_date,
+        end_date,
+        league_matrix=league_matrix,
+        fare_matrix=fare_matrix,
+        table=background_cache.get(key),
+        max_sets=SEARCH_MAX_SETS,
+    )
+    front = search.pareto_front(teamlist)
+    with diskcache.Lock(background_cache, key + ("lock",), expire=SEARCH_LOCK_EXPIRE):
+        # sets saved by other processes while this one searched
+        search.merge(background_cache.get(key, {}))
+        background_cache.set(key, search.table, expire=BACKGROUND_CACHE_EXPIRE)
+    return short_sched, front
+
+
+def solve_query(teams, start_date, end_date, sort_method):
+    """
+    Finds the best route for one query. Called through disk_route_cache, so every background
+
+    process shares one solve of each query. Sorted by time, the route may start at any home game
+
+    of its first team, to find the shortest trip in the dates. Otherwise, up to
+
+    PARETO_MAX_TEAMS teams, the route is picked from the cached Pareto front of the teams
+
+    and dates. With debug logging on, logs the time of each stage.
+
+    """
+    teamlist = list(teams)
+    timing = SolveTimer() if logger.isEnabledFor(logging.DEBUG) else nullcontext()
+    with timing as timer:
+        if sort_method != "time" and len(teamlist) <= PARETO_MAX_TEAMS:
+            short_sched, front = solve_front(teams, start_date, end_date)
+            best_route = pick_route(front, short_sched, sort_method)
+        else:
+            short_sched = reduce_schedule(schedule, teamlist, start_date, end_date)
+            best_route = find_best_route(
+                teamlist,
+                short_sched,
+                cost_dfx,
+                sort_method,
+                league_matrix=league_matrix,
+                fare_matrix=fare_matrix,
+                all_starts=sort_method == "time",
+            )
+    if timer is not None:
+        logger.debug("solve %s %s: %s", len(teamlist), sort_method, timer.summary())
+    return best_route
+
+
+# no cache is kept in memory in front of the disk: every background solve runs in a new
+# process, which would start with an empty one
+disk_route_cache = (
+    DiskRouteCache(
+        solve_query,
+        ROUTE_CACHE_PATH,
+        data_files=DATA_FILES,
+        maxsize=ROUTE_CACHE_SIZE,
+    )
+    if ROUTE_CACHE_ON_DISK
+    else None
+)
+
+
+def get_best_route(teams, start_date, end_date, sort_method):
+    """
+    Returns the best route for the parameters from the disk route cache, shared by every
+
+    background process, or solves it when the disk cache is turned off. The teams are sorted so
+
+    that the same set of teams is one query in any selection order. With debug logging on,
+
+    logs the hits and misses of the cache, of this process and of every process.
+
+    """
+    query = (tuple(sorted(teams)), start_date, end_date, str(sort_method).lower())
+    if disk_route_cache is None:
+        return solve_query(*query)
+    best_route = disk_route_cache.get(*query)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("route cache: %s", disk_route_cache.cache_info())
+    return best_route
+
+
+def route_data(teams, start_date, end_date, sort_method):
+    """
+    Finds the best route for the parameters and converts it to the data kept in the route
+
+    store, with the games as records. None if fewer than 2 teams are selected. When no
+
+    route is valid in the dates, the games are empty and the totals are None.
 
+    """
+    if teams is None or len(teams) < 2:
+        return None
+    best_route = get_best_route(teams, start_date, end_date, sort_method)
+    if best_route.empty:
+        return {"games": [], "time": None, "distance": None, "cost": None}
+    games = best_route["games"][0].copy()
+    games["date"] = games["date"].dt.strftime("%Y-%m-%d")
+    return {
+        "games": games.to_dict("records"),
+        "time": int(best_route["time"][0]),
+        "distance": int(best_route["distance"][0]),
+        "cost": float(best_route["cost"][0]),
+    }
+
+
+def route_games(route):
+    """
+    Converts the games of the route store back to a data frame in the order of the route.
+
+    """
+    games = pd.DataFrame(route["games"], columns=GAME_COLUMNS)
+    games["date"] = pd.to_datetime(games["date"])
+    return games
+
+
+background_callback_manager = DiskcacheManager(
+    background_cache,
+    cache_by=[lambda: LAUNCH_UID],
+    expire=BACKGROUND_CACHE_EXPIRE,
+)
 
 fig = go.Figure(
     go.Scattermapbox(
@@ -63,7 +264,7 @@ CONTENT_STYLE = {
 
 
 instructions_label = html.H5(
-    "Choose up to 6 MLB teams you would like to visit this season within \
+    f"Choose up to {MAX_TEAMS} MLB teams you would like to visit this season within \
 the time frame you want. \
 We will create the optimal route that is optimized by time, distance or cost."
 )
@@ -124,7 +325,13 @@ path = html.Div(id="image_route", children=[], style={"margin-top": "15px"})
 
 content = html.Div(
     [
-        dls.BallTriangle(dcc.Graph(figure=fig, id="graph-content")),
+        dls.BallTriangle(
+            [
+                dcc.Graph(figure=fig, id="graph-content"),
+                dcc.Store(id="route_store", storage_type="memory"),
+            ]
+        ),
+        html.Div(id="solve_progress", style={"textAlign": "center"}),
         schedule_table,
         path,
         dcc.Store(
@@ -172,44 +379,60 @@ def update_dropdown(teams_selected, remaining_teams):
     """
     Updates the dropdown selections to remove teams already selected as well as not allow
 
-    anymore selections once the user selects 6 teams.
+    anymore selections once the user selects MAX_TEAMS teams.
 
     """
 
-    # Limit the number of teams selected to 6
-    if teams_selected is not None and len(teams_selected) > 5:
+    # Limit the number of teams selected to MAX_TEAMS
+    if teams_selected is not None and len(teams_selected) >= MAX_TEAMS:
         return teams_selected, remaining_teams
 
     return remaining_teams, remaining_teams
 
 
 @callback(
-    Output("graph-content", "figure"),
+    Output("route_store", "data"),
     Input("dropdown-selection", "value"),
     Input("date-selection", "start_date"),
     Input("date-selection", "end_date"),
     Input("prioritize", "value"),
+    background=True,
+    manager=background_callback_manager,
+    progress=Output("solve_progress", "children"),
+    running=[(Output("solve_progress", "hidden"), False, True)],
+    interval=500,
+    prevent_initial_call=True,
 )
-# pylint: disable=too-many-locals
-def update_graph(teams, start_date, end_date, sort_method):
+def solve_route(set_progress, teams, start_date, end_date, sort_method):
     """
-    Updates the map and plots the new route calculated based on the parameters.
+    Solves the route in a background process, so a slow solve does not block the server.
+
+    Shows the sets of teams searched out of the total below the map. Changing the inputs
+
+    while a solve runs cancels it and starts a new one.
 
     """
-    dff = df.copy()
-    dff = dff.groupby("home team").first().reset_index()
 
-    sched = df.copy()
+    def report(done, total):
+        set_progress(f"Searched {done} of {total} sets of teams")
 
-    if teams is None or len(teams) < 2:
-        sched = sched[sched["home team"].isin([])]
+    with SolveProgress(report, PROGRESS_INTERVAL):
+        return route_data(teams, start_date, end_date, sort_method)
+
+
+@callback(
+    Output("graph-content", "figure"),
+    Input("route_store", "data"),
+)
+def update_graph(route):
+    """
+    Updates the map and plots the new route from the route store.
+
+    """
+    if route is None:
+        sched = df[df["home team"].isin([])].copy()
     else:
-        teamlist = teams
-        short_sched = reduce_schedule(schedule, teamlist, start_date, end_date)
-        routes = find_all_routes(teamlist)
-        route_df = reduce_routes(routes, short_sched, cost_dfx)
-        sorted_route = sort_order(route_df, sort_method)
-        sched = sorted_route["games"][0]
+        sched = route_games(route)
 
     team_lons = sched["Longitude"].tolist()
     team_lats = sched["Latitude"].tolist()
@@ -298,62 +521,50 @@ def update_image_path(table_data):
 
 @callback(
     Output("table", "data"),
-    Input("dropdown-selection", "value"),
-    Input("date-selection", "start_date"),
-    Input("date-selection", "end_date"),
-    Input("prioritize", "value"),
+    Input("route_store", "data"),
 )
-def update_game_schedule_table(teams, start_date, end_date, sort_method):
+def update_game_schedule_table(route):
     """
-    Updates the game schedule table based on the parameters and route
-
-    calculation.
+    Updates the game schedule table from the route in the route store.
 
     """
-    if teams is None or len(teams) < 2:
+    if route is None:
         return no_update
-    teamlist = teams
-    short_sched = reduce_schedule(schedule, teamlist, start_date, end_date)
-    routes = find_all_routes(teamlist)
-    route_df = reduce_routes(routes, short_sched, cost_dfx)
-    sorted_route = sort_order(route_df, sort_method)
-    sched = sorted_route["games"][0]
-    sched["date"] = sched["date"].dt.strftime("%m-%d-%Y")
-    sched = sched.reset_index()
-    sched["Route Order"] = sched["index"] + 1
-    sched = sched[["Route Order", "date", "time", "home team", "away team"]]
-    sched.columns = ["Route Order", "Date", "Time", "Home Team", "Away Team"]
+    if not route["games"]:
+        return []
+    games = route_games(route)
+    sched = pd.DataFrame(
+        {
+            "Route Order": range(1, len(games) + 1),
+            "Date": games["date"].dt.strftime("%m-%d-%Y").to_numpy(),
+            "Time": games["time"].to_numpy(),
+            "Home Team": games["home team"].to_numpy(),
+            "Away Team": games["away team"].to_numpy(),
+        }
+    )
     return sched.to_dict("records")
 
 
 @callback(
     Output("total_table", "data"),
-    Input("dropdown-selection", "value"),
-    Input("date-selection", "start_date"),
-    Input("date-selection", "end_date"),
-    Input("prioritize", "value"),
+    Input("route_store", "data"),
 )
 # pylint: disable=consider-using-f-string
-def update_sidebar_metrics_table(teams, start_date, end_date, sort_method):
+def update_sidebar_metrics_table(route):
     """
-    Updates the sidebar metrics table based on the parameters and route
-
-    calculation.
+    Updates the sidebar metrics table from the route in the route store.
 
     """
-    if teams is None or len(teams) < 2:
+    if route is None:
         return no_update
-    teamlist = teams
-    short_sched = reduce_schedule(schedule, teamlist, start_date, end_date)
-    routes = find_all_routes(teamlist)
-
-    route_df = reduce_routes(routes, short_sched, cost_dfx)
-    sorted_route = sort_order(route_df, sort_method)
+    if not route["games"]:
+        totals = pd.DataFrame({"Metric": ["Route"], "Total": ["No valid route in the dates"]})
+        return totals.to_dict("records")
     metrics = ["Time", "Distance", "Travel Cost"]
     metric_val = [
-        str(sorted_route["time"][0]) + " days",
-        str(sorted_route["distance"][0]) + " miles",
-        "${0:.2f}".format(sorted_route["cost"][0]),
+        str(route["time"]) + " days",
+        str(route["distance"]) + " miles",
+        "${0:.2f}".format(route["cost"]),
     ]
     totals = pd.DataFrame({"Metric": metrics, "Total": metric_val})
 
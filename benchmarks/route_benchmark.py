@@ -0,0 +1,315 @@
+"""
+This module times each stage of the route pipeline on the bundled data files, and compares
+two sets of results to find stages that got slower or use more memory.
+
+Every case is a fixed set of teams and a date window. The exhaustive stages run for up to 6
+teams, and the dynamic search also runs for larger sets. Each stage is timed several times,
+keeping the fastest run, and run once more under tracemalloc for its peak memory.
+
+Functions:
+time_stage(stage, repeat): Function that times a stage and measures its peak memory.
+run_case(teams, start_date, end_date, data, repeat=3): Function that times every stage of
+    the pipeline for one set of teams and date window.
+run_benchmarks(repeat=3, max_teams=12): Function that runs every benchmark case.
+compare_results(baseline, current, threshold=25.0, min_seconds=0.001, memory_threshold=25.0,
+    min_bytes=MIN_PEAK_BYTES): Function that finds the stages whose time or peak memory
+    regressed past the thresholds.
+
+Run using 'python -m benchmarks.route_benchmark run --output results.json' and
+'python -m benchmarks.route_benchmark compare baseline.json results.json' from the root repo.
+
+It requires the packages argparse, json, platform, sys, time, tracemalloc, pandas and
+make_route to run.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import pandas as pd
+from make_route.exhaustive_search import (
+    reduce_schedule,
+    find_all_routes,
+    reduce_routes,
+    sort_order,
+    check_valid_route,
+    calculate_distance,
+    calculate_cost,
+    build_league_matrix,
+    build_fare_matrix,
+    build_transition_table,
+)
+from make_route.dynamic_search import find_best_route
+from make_route.schedule_store import load_schedule
+
+TEAM_SETS = [
+    ["Seattle Mariners", "Boston Red Sox"],
+    ["Seattle Mariners", "Kansas City Royals", "Boston Red Sox"],
+    ["Seattle Mariners", "Kansas City Royals", "Houston Astros", "Boston Red Sox"],
+    [
+        "Seattle Mariners",
+        "Kansas City Royals",
+        "Houston Astros",
+        "Boston Red Sox",
+        "Chicago Cubs",
+    ],
+    [
+        "Seattle Mariners",
+        "Kansas City Royals",
+        "Houston Astros",
+        "Boston Red Sox",
+        "Chicago Cubs",
+        "New York Yankees",
+    ],
+    [
+        "Seattle Mariners",
+        "New York Yankees",
+        "Boston Red Sox",
+        "Baltimore Orioles",
+        "Texas Rangers",
+        "New York Mets",
+        "Atlanta Braves",
+        "Chicago Cubs",
+    ],
+    [
+        "Seattle Mariners",
+        "New York Yankees",
+        "Boston Red Sox",
+        "Baltimore Orioles",
+        "Texas Rangers",
+        "New York Mets",
+        "Atlanta Braves",
+        "Chicago Cubs",
+        "Los Angeles Dodgers",
+        "Houston Astros",
+        "Minnesota Twins",
+        "Detroit Tigers",
+    ],
+]
+DATE_WINDOWS = [
+    ("2024-04-01", "2024-04-28"),
+    ("2024-05-06", "2024-06-02"),
+    ("2024-07-01", "2024-08-15"),
+]
+METHODS = ["time", "distance", "cost"]
+# the exhaustive stages enumerate every permutation, so they are limited like find_all_routes
+MAX_EXHAUSTIVE_TEAMS = 6
+# stages with a smaller peak memory than this in both results are not compared
+MIN_PEAK_BYTES = 65536
+
+
+def time_stage(stage, repeat):
+    """
+    Function that times a stage, keeping the fastest of several runs, then runs it once more
+        under tracemalloc to find its peak memory.
+    :param stage: function - stage to run, takes no arguments
+    :param repeat: int - number of timed runs
+    :return: dictionary - 'seconds' is the fastest run time, 'peak_bytes' is the peak memory
+    """
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage()
+        seconds = min(seconds, time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        stage()
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": seconds, "peak_bytes": peak_bytes}
+
+
+# pylint: disable=too-many-locals
+def run_case(teams, start_date, end_date, data, repeat=3):
+    """
+    Function that times every stage of the pipeline for one set of teams and date window.
+    :param teams: list - list of teams
+    :param start_date: string - earliest date of the trip
+    :param end_date: string - latest date of the trip
+    :param data: tuple - (schedule, cost data frame) from the data folder
+    :param repeat: int - number of timed runs of each stage
+    :return: dictionary - timing and peak memory of each stage, with the stage as the key.
+        Empty if the teams have no home game in the window.
+    """
+    schedule, cost_df = data
+    try:
+        short_sched = reduce_schedule(schedule, teams, start_date, end_date)
+    except ValueError:
+        return {}
+    stages = {}
+    stages["reduce_schedule"] = lambda: reduce_schedule(
+        schedule, teams, start_date, end_date
+    )
+    league_matrix = build_league_matrix(short_sched)
+    fare_matrix = build_fare_matrix(cost_df)
+    if len(teams) <= MAX_EXHAUSTIVE_TEAMS:
+        routes = find_all_routes(teams)
+        transition_table = build_transition_table(short_sched)
+        game_log = reduce_routes(routes, short_sched, cost_df)
+        stages["find_all_routes"] = lambda: find_all_routes(teams)
+        stages["check_valid_route"] = lambda: [
+            check_valid_route(route, short_sched, transition_table=transition_table)
+            for route in routes
+        ]
+        stages["calculate_distance"] = lambda: [
+            calculate_distance(route, short_sched, league_matrix) for route in routes
+        ]
+        stages["calculate_cost"] = lambda: [
+            calculate_cost(route, cost_df, fare_matrix) for route in routes
+        ]
+        stages["reduce_routes"] = lambda: reduce_routes(routes, short_sched, cost_df)
+        for method in METHODS:
+            stages[f"sort_order[{method}]"] = lambda method=method: sort_order(
+                game_log, method
+            )
+    for method in METHODS:
+        stages[f"find_best_route[{method}]"] = lambda method=method: find_best_route(
+            teams,
+            short_sched,
+            cost_df,
+            method,
+            league_matrix=league_matrix,
+            fare_matrix=fare_matrix,
+        )
+        stages[f"find_best_route_all_starts[{method}]"] = (
+            lambda method=method: find_best_route(
+                teams,
+                short_sched,
+                cost_df,
+                method,
+                league_matrix=league_matrix,
+                fare_matrix=fare_matrix,
+                all_starts=True,
+            )
+        )
+    return {name: time_stage(stage, repeat) for name, stage in stages.items()}
+
+
+def run_benchmarks(repeat=3, max_teams=12):
+    """
+    Function that runs every benchmark case on the bundled schedule and cost data.
+    :param repeat: int - number of timed runs of each stage
+    :param max_teams: int - largest set of teams to run
+    :return: results: dictionary - the platform, and the stages of each case, with a case id
+        of the number of teams and the date window as the key.
+    """
+    data = (load_schedule(), pd.read_csv("data/cost_df.csv"))
+    cases = {}
+    for teams in TEAM_SETS:
+        if len(teams) > max_teams:
+            continue
+        for start_date, end_date in DATE_WINDOWS:
+            case_id = f"{len(teams)}teams_{start_date}_{end_date}"
+            stages = run_case(teams, start_date, end_date, data, repeat)
+            if stages:
+                cases[case_id] = stages
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "cases": cases,
+    }
+
+
+# pylint: disable=too-many-arguments
+def compare_results(
+    baseline,
+    current,
+    threshold=25.0,
+    min_seconds=0.001,
+    memory_threshold=25.0,
+    min_bytes=MIN_PEAK_BYTES,
+):
+    """
+    Function that finds the stages that got slower, or whose peak memory grew, compared to
+        the baseline by more than the thresholds. Stages faster than min_seconds, or with a
+        smaller peak than min_bytes, in both results are ignored as noise for that metric.
+    :param baseline: dictionary - output of run_benchmarks to compare against
+    :param current: dictionary - output of run_benchmarks to check
+    :param threshold: float - allowed slowdown in percent
+    :param min_seconds: float - stages faster than this in both results are not compared
+    :param memory_threshold: float - allowed growth of the peak memory in percent, None to
+        not compare the peak memory
+    :param min_bytes: int - stages with a smaller peak than this in both results are not
+        compared for memory
+    :return: regressions: list of tuples - (case id, stage, baseline value, current value,
+        percent change, metric) of every stage past a threshold, where metric is 'seconds'
+        or 'peak_bytes'.
+    """
+    limits = [("seconds", threshold, min_seconds)]
+    if memory_threshold is not None:
+        limits.append(("peak_bytes", memory_threshold, min_bytes))
+    regressions = []
+    for case_id, stages in current["cases"].items():
+        for stage, result in stages.items():
+            old = baseline["cases"].get(case_id, {}).get(stage)
+            if old is None:
+                continue
+            for metric, limit, least in limits:
+                if metric not in old or metric not in result:
+                    continue
+                if max(old[metric], result[metric]) < least:
+                    continue
+                change = (result[metric] - old[metric]) / old[metric] * 100
+                if change > limit:
+                    regressions.append(
+                        (case_id, stage, old[metric], result[metric], change, metric)
+                    )
+    return regressions
+
+
+def main(argv=None):
+    """
+    Runs the benchmarks or compares two results from the command line.
+    :param argv: list - command line arguments, sys.argv if not given
+    :return: int - 1 if a stage regressed past a threshold, 0 otherwise
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the route pipeline")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="time every stage and write json")
+    run_parser.add_argument("--output", default="-", help="json file, '-' for stdout")
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--max-teams", type=int, default=12)
+    compare_parser = commands.add_parser("compare", help="compare two json results")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=25.0)
+    compare_parser.add_argument("--min-seconds", type=float, default=0.001)
+    compare_parser.add_argument("--memory-threshold", type=float, default=25.0)
+    compare_parser.add_argument("--min-bytes", type=int, default=MIN_PEAK_BYTES)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = run_benchmarks(args.repeat, args.max_teams)
+        if args.output == "-":
+            json.dump(results, sys.stdout, indent=2)
+        else:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(results, file, indent=2)
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)
+    regressions = compare_results(
+        baseline,
+        current,
+        args.threshold,
+        args.min_seconds,
+        args.memory_threshold,
+        args.min_bytes,
+    )
+    for case_id, stage, old, new, change, metric in regressions:
+        if metric == "seconds":
+            print(f"{case_id} {stage}: {old:.4f}s -> {new:.4f}s ({change:+.1f}%)")
+        else:
+            print(f"{case_id} {stage}: {old} -> {new} peak bytes ({change:+.1f}%)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+This module solves many trip queries against one set of indexes. The schedule index,
+distance matrix and fare matrix are built once for the whole season, and each query only
+cuts the game days of its teams down to its date window, instead of filtering the schedule
+data frame with reduce_schedule.
+
+Each query is solved with the dynamic programming search of find_best_route, and only the
+schedule rows of the best route are kept, so no data frames are built per query.
+
+Functions:
+solve_many(queries, schedule, cost_df, workers=1): Function that finds the best route of
+    every query and returns them as one table.
+
+It requires the packages concurrent.futures, numpy, pandas, exhaustive_search,
+dynamic_search, labels and timing to run.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from .exhaustive_search import (
+    build_league_matrix,
+    build_fare_matrix,
+    build_schedule_index,
+)
+from .dynamic_search import best_label
+from .labels import team_games
+from .timing import timed_stage
+
+RESULT_COLUMNS = [
+    "teams",
+    "start_date",
+    "end_date",
+    "method",
+    "route",
+    "game_rows",
+    "time",
+    "distance",
+    "cost",
+    "error",
+]
+# queries per task sent to a worker process
+BATCH_CHUNK_SIZE = 64
+# indexes of the schedule and cost data of a worker process, set once by _init_worker
+_worker_state = {}
+
+
+def _window_index(teams, schedule_index, start_date, end_date):
+    """
+    Function that cuts the game days of the teams down to a date window, with the same
+        checks as reduce_schedule.
+    :param teams: list - list of teams
+    :param schedule_index: dictionary - output of build_schedule_index for the whole season
+    :param start_date: datetime - earliest date of the trip
+    :param end_date: datetime - latest date of the trip
+    :return: window: dictionary - same as schedule_index, for the teams and dates only
+    """
+    first_day = np.datetime64(pd.Timestamp(start_date), "D").astype(np.int64)
+    last_day = np.datetime64(pd.Timestamp(end_date), "D").astype(np.int64)
+    if last_day - first_day + 1 < len(teams):
+        raise ValueError("More teams than days")
+    window = {}
+    for team in teams:
+        days, rows = schedule_index.get(team, (np.empty(0), np.empty(0)))
+        start = np.searchsorted(days, first_day, side="left")
+        end = np.searchsorted(days, last_day, side="right")
+        if start == end:
+            raise ValueError(team + " do not have a home game in this time frame")
+        window[team] = (days[start:end], rows[start:end])
+    return window
+
+
+def _solve_query(query, indexes):
+    """
+    Function that finds the best route of one query.
+    :param query: tuple - (teams, start date, end date, method)
+    :param indexes: tuple - output of build_schedule_index, build_league_matrix and
+        build_fare_matrix for the whole season
+    :return: tuple - one row of the result table, matching RESULT_COLUMNS
+    """
+    teams, start_date, end_date, method = query
+    teams = list(teams)
+    method = str(method).lower()
+    schedule_index, league_matrix, fare_matrix = indexes
+    try:
+        if method not in ("time", "distance", "cost"):
+            raise ValueError("Invalid Sort")
+        game_days, game_rows = team_games(
+            teams, _window_index(teams, schedule_index, start_date, end_date)
+        )
+        best = best_label(
+            teams, (game_days, game_rows, league_matrix, fare_matrix), method
+        )
+    except ValueError as error:
+        return (teams, start_date, end_date, method, None, None, None, None, None, str(error))
+    if best is None:
+        return (teams, start_date, end_date, method, None, None, None, None, None, None)
+    return (
+        teams,
+        start_date,
+        end_date,
+        method,
+        [teams[team] for team in best[4]],
+        best[5],
+        best[0] - best[1] + 1,
+        round(best[3]),
+        round(best[2], 2),
+        None,
+    )
+
+
+def _init_worker(indexes):
+    """
+    Function that runs once in each worker process, and keeps the indexes for every task.
+    :param indexes: tuple - output of build_schedule_index, build_league_matrix and
+        build_fare_matrix for the whole season
+    """
+    _worker_state["indexes"] = indexes
+
+
+def _solve_chunk(queries):
+    """
+    Function that solves a chunk of queries in a worker process.
+    :param queries: list - queries of (teams, start date, end date, method)
+    :return: list - one row of the result table for each query
+    """
+    return [_solve_query(query, _worker_state["indexes"]) for query in queries]
+
+
+@timed_stage("solve_many")
+def solve_many(queries, schedule, cost_df, workers=1):
+    """
+    Function that finds the best route of every query, building the schedule index,
+        distance matrix and fare matrix once for all of them. Each query gives the same
+        route and metrics as reduce_schedule followed by find_best_route. A query that
+        reduce_schedule would reject gets its error message instead of a route.
+    :param queries: iterable - queries of (teams, start date, end date, method)
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param workers: int - number of worker processes. With more than 1, chunks of
+        BATCH_CHUNK_SIZE queries are solved across a process pool.
+    :return: results: data frame - one row per query, in the order of the queries, with the
+        query, the best route, the positions of its games in the schedule, the total trip
+        length, distance, and cost. The route is None if no route is valid, and error holds
+        the message of a rejected query.
+    """
+    queries = list(queries)
+    indexes = (
+        build_schedule_index(schedule),
+        build_league_matrix(schedule),
+        build_fare_matrix(cost_df),
+    )
+    if workers > 1 and len(queries) > BATCH_CHUNK_SIZE:
+        chunks = [
+            queries[start : start + BATCH_CHUNK_SIZE]
+            for start in range(0, len(queries), BATCH_CHUNK_SIZE)
+        ]
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(indexes,)
+        ) as executor:
+            rows = [row for chunk in executor.map(_solve_chunk, chunks) for row in chunk]
+    else:
+        rows = [_solve_query(query, indexes) for query in queries]
+    return pd.DataFrame(rows, columns=RESULT_COLUMNS)
@@ -0,0 +1,195 @@
+"""
+This module implements a depth first branch and bound search that finds the best route of
+games by extending routes one leg at a time, instead of checking every full permutation
+like reduce_routes.
+
+A partial route is dropped as soon as a lower bound of the desired method for any route that
+completes it is worse than the best complete route found so far. For time, every remaining
+team needs its own day and can not be visited before its next game. For distance and cost,
+every remaining team has to be reached by one leg, so the shortest or cheapest leg into each
+remaining team is added. Only routes that are worse in the desired method are dropped, so the
+search returns the same best route as reduce_routes followed by sort_order, including its
+tie breaks.
+
+Functions:
+branch_and_bound(teams, schedule, cost_df, method='distance', *, league_matrix=None,
+    fare_matrix=None): Function that finds the best route of games for the teams, ordered
+    by the desired method, and counts the partial routes expanded and pruned.
+
+It requires the packages bisect, pandas, dynamic_search, labels and timing to run.
+"""
+
+from bisect import bisect_right
+import pandas as pd
+from .dynamic_search import ROUTE_COLUMNS, label_frame
+from .labels import route_key, search_tables
+from .timing import count_routes, timed_stage
+
+# slack on the lower bounds, so that float error in the order of the sums never drops a tie
+BOUND_SLACK = 1e-6
+
+
+def _primary(label, method):
+    """
+    Function that gives the rounded total of the desired method of a route, as in the output
+        of reduce_routes.
+    :param label: tuple - (day, start, cost, distance, route, games)
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :return: the rounded total of the route
+    """
+    return route_key(label, method)[0]
+
+
+def _lower_bound(label, remaining, game_days, legs, method):
+    """
+    Function that finds a lower bound of the desired method for any route that completes a
+        partial route. Returns None if a remaining team has no game after the last game.
+    :param label: tuple - (day, start, cost, distance, route, games) of the partial route
+    :param remaining: list - teams not yet visited
+    :param game_days: list - for each team, a sorted list of game days as integers.
+    :param legs: list of lists - distance or fare from the row team to the column team.
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :return: the lower bound, rounded like the route totals, or None
+    """
+    day = label[0]
+    last_day = day + len(remaining)
+    for team in remaining:
+        game = bisect_right(game_days[team], day)
+        if game == len(game_days[team]):
+            return None
+        last_day = max(last_day, game_days[team][game])
+    if method == "time":
+        return last_day - label[1] + 1
+    last = label[4][-1]
+    rest = 0
+    for team in remaining:
+        rest += min(
+            [legs[last][team]] + [legs[other][team] for other in remaining if other != team]
+        )
+    if method == "cost":
+        return round(label[2] + rest - BOUND_SLACK, 2)
+    return round(label[3] + rest - BOUND_SLACK)
+
+
+def _pruned(label, remaining, search):
+    """
+    Function that checks if a partial route can be dropped, because a remaining team has no
+        game after its last game, or because no route that completes it can beat the best
+        complete route found so far.
+    :param label: tuple - (day, start, cost, distance, route, games) of the partial route
+    :param remaining: list - teams not yet visited
+    :param search: tuple - state of the search, see _search
+    :return: boolean - true if the partial route can be dropped
+    """
+    tables, method, best, _ = search
+    legs = tables[3] if method == "cost" else tables[2]
+    bound = _lower_bound(label, remaining, tables[0], legs, method)
+    return bound is None or (best[0] is not None and bound > _primary(best[0], method))
+
+
+def _children(label, remaining, tables, stats):
+    """
+    Function that extends a partial route with each remaining team, at the team's soonest
+        game at least one day after the last game.
+    :param label: tuple - (day, start, cost, distance, route, games) of the partial route
+    :param remaining: list - teams not yet visited
+    :param tables: tuple - (game_days, game_rows, distances, fares)
+    :param stats: dictionary - counts of the partial routes expanded and pruned
+    :return: list - labels of the extended routes
+    """
+    game_days, game_rows, distances, fares = tables
+    last = label[4][-1]
+    children = []
+    for team in remaining:
+        game = bisect_right(game_days[team], label[0])
+        if game == len(game_days[team]):
+            stats["pruned"] += 1
+            continue
+        children.append(
+            (
+                game_days[team][game],
+                label[1],
+                label[2] + fares[last][team],
+                label[3] + distances[last][team],
+                label[4] + (team,),
+                label[5] + (game_rows[team][game],),
+            )
+        )
+    return children
+
+
+def _search(label, remaining, search):
+    """
+    Function that extends a partial route with every remaining team, depth first, and keeps
+        the best complete route found.
+    :param label: tuple - (day, start, cost, distance, route, games) of the partial route
+    :param remaining: list - teams not yet visited
+    :param search: tuple - (tables, method, best, stats) where tables is (game_days,
+        game_rows, distances, fares), method is the method of sorting, best is a list that
+        holds the best complete label found so far, or None, and stats counts the partial
+        routes expanded and pruned
+    """
+    _, method, best, stats = search
+    if not remaining:
+        count_routes("routes_valid")
+        if best[0] is None or route_key(label, method) < route_key(best[0], method):
+            best[0] = label
+        return
+    stats["expanded"] += 1
+    children = _children(label, remaining, search[0], stats)
+    # try the most promising teams first, so a good route is found early
+    position = 0 if method == "time" else (2 if method == "cost" else 3)
+    children.sort(key=lambda child: child[position])
+    for child in children:
+        rest = [team for team in remaining if team != child[4][-1]]
+        if _pruned(child, rest, search):
+            stats["pruned"] += 1
+            continue
+        _search(child, rest, search)
+
+
+@timed_stage("branch_and_bound")
+def branch_and_bound(  # pylint: disable=too-many-arguments
+    teams, schedule, cost_df, method="distance", *, league_matrix=None, fare_matrix=None
+):
+    """
+    Function that finds the best route of games for the teams with a depth first branch and
+        bound search. Like check_valid_route, each route starts at the first team's earliest
+        game and takes the soonest game of the next team at least one day later. Gives the
+        same result as the first row of sort_order on the output of reduce_routes.
+    :param teams: list - list of teams
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc. Usually the output of reduce_schedule.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :param league_matrix: tuple - output of build_league_matrix. Built from the schedule if
+        not given.
+    :param fare_matrix: tuple - output of build_fare_matrix. Built from cost_df if not given.
+    :return:
+        best_route: data frame - one row with the route, the games on the schedule,
+            the total trip length, distance, and cost. Empty if no route is valid.
+        stats: dictionary - 'expanded' is the number of partial routes that were extended,
+            'pruned' is the number of partial routes dropped by the bounds.
+    """
+    method = str(method).lower()
+    if method not in ("time", "distance", "cost"):
+        raise ValueError("Invalid Sort")
+    stats = {"expanded": 0, "pruned": 0}
+    tables = search_tables(teams, schedule, cost_df, league_matrix, fare_matrix)
+    if tables is None:
+        return pd.DataFrame(columns=ROUTE_COLUMNS), stats
+    best = [None]
+    search = (tables, method, best, stats)
+    for team in range(len(teams)):
+        day = tables[0][team][0]
+        label = (day, day, 0, 0, (team,), (tables[1][team][0],))
+        rest = [other for other in range(len(teams)) if other != team]
+        if _pruned(label, rest, search):
+            stats["pruned"] += 1
+            continue
+        _search(label, rest, search)
+
+    if best[0] is None:
+        return pd.DataFrame(columns=ROUTE_COLUMNS), stats
+    return label_frame(best[0], teams, schedule), stats
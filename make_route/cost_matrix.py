@@ -0,0 +1,590 @@
+"""
+This module builds the cost data frame, the fare of every trip between two team stadiums,
+from the Consumer Airfare Report and the team airport key, and writes it to 'cost_df.csv'.
+
+Download the airfare report as a csv from:
+https://data.transportation.gov/Aviation/Consumer-Airfare-Report-Table-6-Contiguous-State-C/yj5y-b2ir/data
+
+Every pair of teams gets the airfare between their airport cities for one year and quarter.
+Pairs with no flight get the cost of driving instead, and pairs closer than DRIVE_MILES get
+the cheaper of flying and driving. The inputs and parameters of the last build are hashed
+into a file next to the output, and the build is skipped when they have not changed.
+
+The airfare report covers decades of quarters, so it is read in chunks of FARE_CHUNK_ROWS
+rows, with only the columns in AIRFARE_COLUMNS, and each chunk keeps only the markets between
+two team airport cities before the next one is read.
+
+The fare store keeps the fares of every quarter of the year, so that the cost of each leg of a
+route can come from the date of the game traveled to. When build_cost_matrix is given a fare
+store path, the cost csv and the fare store are built from one pass over the report. The
+searches of the app use the one fare per pair of the cost csv, not the fare store.
+
+Functions:
+iter_airfares(airfare_csv=AIRFARE_CSV, team_airport_key=None, chunk_rows=FARE_CHUNK_ROWS):
+    Function that streams the markets between team airport cities from the airfare report.
+read_airfares(airfare_csv=AIRFARE_CSV, year=FARE_YEAR, quarter=FARE_QUARTER,
+    team_airport_key=None, chunk_rows=FARE_CHUNK_ROWS): Function that reads the fares of one
+    year and quarter from the airfare report.
+build_fare_matrices(airfare_csv=AIRFARE_CSV, team_airport_key=None,
+    chunk_rows=FARE_CHUNK_ROWS): Function that builds the airfare matrix between the teams for
+    every quarter of the airfare report.
+read_fare_tables(airfare_csv=AIRFARE_CSV, year=FARE_YEAR, quarter=FARE_QUARTER,
+    team_airport_key=None, chunk_rows=FARE_CHUNK_ROWS): Function that reads the fares of one
+    year and quarter and builds the airfare matrices of every quarter in one pass.
+read_stadiums(schedule_csv=SCHEDULE_CSV): Function that reads the stadium coordinates of
+    every home team from the schedule.
+build_cost_df(airfares, team_airport_key, stadiums, cost_per_gallon=COST_PER_GALLON,
+    mpg=AVG_MPG): Function that builds the cost data frame of every pair of teams.
+build_fare_store(cost_df, teams, fare_matrices, year=None): Function that builds the fares
+    between the teams for each quarter of the year.
+save_fare_store(fare_store, store_path=FARE_STORE): Function that saves a fare store to a
+    folder of .npy files.
+load_fare_store(store_path=FARE_STORE): Function that loads a fare store saved by
+    save_fare_store.
+build_cost_matrix(airfare_csv=AIRFARE_CSV, key_csv=TEAM_AIRPORT_CSV,
+    schedule_csv=SCHEDULE_CSV, cost_csv=COST_CSV, *, year=FARE_YEAR, quarter=FARE_QUARTER,
+    cost_per_gallon=COST_PER_GALLON, mpg=AVG_MPG, fare_store=None, force=False): Function
+    that builds the cost data frame, and the fare store if asked, from the files and writes
+    them, unless the inputs have not changed.
+
+Run using 'python -m make_route.cost_matrix' from the root repo, see '--help' for the
+parameters.
+
+It requires the packages argparse, json, os, numpy, pandas, distance, exhaustive_search,
+file_hash and schedule_store to run.
+"""
+
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+from .distance import haversine
+from .exhaustive_search import FARE_PERIODS, build_fare_matrix
+from .file_hash import hash_data_files
+from .schedule_store import SCHEDULE_CSV
+
+# file name may change depending on the local download
+AIRFARE_CSV = (
+    "data/Consumer_Airfare_Report__Table_6_-_Contiguous_State_City-Pair_Markets_That_"
+    "Average_At_Least_10_Passengers_Per_Day_20240309.csv"
+)
+TEAM_AIRPORT_CSV = "data/team_airport_key.csv"
+COST_CSV = "data/cost_df.csv"
+FARE_STORE = "data/fare_store"
+# columns of the airfare report that are read, and their types
+AIRFARE_COLUMNS = ["Year", "quarter", "city1", "city2", "fare"]
+AIRFARE_TYPES = {
+    "Year": np.int16,
+    "quarter": np.int8,
+    "city1": str,
+    "city2": str,
+    "fare": np.float64,
+}
+# rows of the airfare report read at once, which bounds the memory of reading it
+FARE_CHUNK_ROWS = 100000
+FARE_YEAR = 2023
+FARE_QUARTER = 3
+# average price of a gallon of gas in 2023, and average miles per gallon of a car
+COST_PER_GALLON = 3.29
+AVG_MPG = 36
+# pairs closer than this, less than about 2.5 hours of driving, take the cheaper of flying and
+# driving
+DRIVE_MILES = 125
+COST_COLUMNS = [
+    "Team1",
+    "Team2",
+    "city1",
+    "city2",
+    "airfare",
+    "coords1",
+    "coords2",
+    "dist",
+    "car_fare",
+    "fare",
+    "min_fare",
+]
+
+
+def _city_codes(cities, team_airport_key):
+    """
+    Function that gives the index of each city in the list of team airport cities, so that
+        the rows of other cities can be dropped with one comparison.
+    :param cities: pandas series - city names
+    :param team_airport_key: data frame - Team and the AirportCity closest to its stadium
+    :return: numpy array - index of each city in the sorted airport cities, -1 for others
+    """
+    airport_cities = sorted(team_airport_key["AirportCity"].unique())
+    return pd.Categorical(cities, categories=airport_cities).codes
+
+
+def iter_airfares(
+    airfare_csv=AIRFARE_CSV, team_airport_key=None, chunk_rows=FARE_CHUNK_ROWS
+):
+    """
+    Function that streams the airfare report in chunks of rows, reading only the columns
+        that are used, and keeps the markets between two team airport cities of each chunk
+        before reading the next one.
+    :param airfare_csv: string - path of the airfare report csv
+    :param team_airport_key: data frame - Team and the AirportCity closest to its stadium.
+        Read from TEAM_AIRPORT_CSV if not given.
+    :param chunk_rows: int - number of rows of the csv read at once
+    :return: generator of data frames - Year, quarter, city1, city2 and fare of the markets
+        between two team airport cities, one data frame for each chunk
+    """
+    if team_airport_key is None:
+        team_airport_key = pd.read_csv(TEAM_AIRPORT_CSV)
+    chunks = pd.read_csv(
+        airfare_csv, usecols=AIRFARE_COLUMNS, dtype=AIRFARE_TYPES, chunksize=chunk_rows
+    )
+    for chunk in chunks:
+        keep = (_city_codes(chunk["city1"], team_airport_key) >= 0) & (
+            _city_codes(chunk["city2"], team_airport_key) >= 0
+        )
+        yield chunk.loc[keep, AIRFARE_COLUMNS]
+
+
+def read_airfares(
+    airfare_csv=AIRFARE_CSV,
+    year=FARE_YEAR,
+    quarter=FARE_QUARTER,
+    team_airport_key=None,
+    chunk_rows=FARE_CHUNK_ROWS,
+):
+    """
+    Function that reads the fares of one year and quarter from the airfare report, in chunks
+        so that the whole report is never in memory.
+    :param airfare_csv: string - path of the airfare report csv
+    :param year: int - year of the fares
+    :param quarter: int - quarter of the fares, 1 to 4
+    :param team_airport_key: data frame - Team and the AirportCity closest to its stadium.
+        Read from TEAM_AIRPORT_CSV if not given.
+    :param chunk_rows: int - number of rows of the csv read at once
+    :return: airfares: data frame - city1, city2 and fare of every city pair market between
+        two team airport cities
+    """
+    airfares = [
+        _quarter_fares(chunk, year, quarter)
+        for chunk in iter_airfares(airfare_csv, team_airport_key, chunk_rows)
+    ]
+    return _concat_fares(airfares)
+
+
+def _quarter_fares(chunk, year, quarter):
+    """
+    Function that keeps the markets of one year and quarter of a chunk of the report.
+    :param chunk: data frame - chunk of the report from iter_airfares
+    :param year: int - year of the fares
+    :param quarter: int - quarter of the fares, 1 to 4
+    :return: data frame - the rows of the chunk in the year and quarter
+    """
+    return chunk.loc[(chunk["Year"] == year) & (chunk["quarter"] == quarter)]
+
+
+def _concat_fares(airfares):
+    """
+    Function that joins the markets kept from each chunk of the report.
+    :param airfares: list - data frames of the markets kept from each chunk
+    :return: airfares: data frame - city1, city2 and fare of every market
+    """
+    airfares = pd.concat(airfares) if airfares else pd.DataFrame(columns=AIRFARE_COLUMNS)
+    return airfares[["city1", "city2", "fare"]].reset_index(drop=True)
+
+
+def _add_fare_totals(totals, chunk, team_airport_key):
+    """
+    Function that adds the fares of a chunk of the report to the sum and count of the fares
+        of each quarter and pair of airport cities.
+    :param totals: dictionary - year * 10 + quarter as the key, and the sum and count of the
+        fares as arrays indexed by airport city code as the value. Updated in place.
+    :param chunk: data frame - chunk of the report from iter_airfares
+    :param team_airport_key: data frame - Team and the AirportCity closest to its stadium
+    """
+    size = team_airport_key["AirportCity"].nunique()
+    city1 = _city_codes(chunk["city1"], team_airport_key)
+    city2 = _city_codes(chunk["city2"], team_airport_key)
+    fares = chunk["fare"].to_numpy()
+    periods = chunk["Year"].to_numpy() * 10 + chunk["quarter"].to_numpy()
+    for period in np.unique(periods):
+        rows = periods == period
+        if period not in totals:
+            totals[period] = (np.zeros((size, size)), np.zeros((size, size)))
+        fare_sum, fare_count = totals[period]
+        np.add.at(fare_sum, (city1[rows], city2[rows]), fares[rows])
+        np.add.at(fare_count, (city1[rows], city2[rows]), 1)
+
+
+def _fare_matrices(totals, team_airport_key):
+    """
+    Function that turns the sums and counts of the fares into the airfare matrix between
+        the teams of each quarter.
+    :param totals: dictionary - output of _add_fare_totals over every chunk
+    :param team_airport_key: data frame - Team and the AirportCity closest to its stadium
+    :return: fare_matrices: dictionary - same as build_fare_matrices
+    """
+    team_cities = _city_codes(team_airport_key["AirportCity"], team_airport_key)
+    team_cities = np.ix_(team_cities, team_cities)
+    fare_matrices = {}
+    for period in sorted(totals):
+        fare_sum, fare_count = totals[period]
+        # the report lists each market once, so every fare is used in both directions
+        fare_sum = fare_sum + fare_sum.T
+        fare_count = fare_count + fare_count.T
+        with np.errstate(invalid="ignore"):
+            city_fares = np.where(fare_count > 0, fare_sum / fare_count, np.nan)
+        fare_matrices[(int(period // 10), int(period % 10))] = city_fares[team_cities]
+    return fare_matrices
+
+
+def build_fare_matrices(
+    airfare_csv=AIRFARE_CSV, team_airport_key=None, chunk_rows=FARE_CHUNK_ROWS
+):
+    """
+    Function that builds the airfare matrix between every pair of teams for every quarter of
+        the airfare report, in one pass over the report in chunks. Only the sum and count of
+        the fares of each quarter and pair of airport cities are kept between chunks.
+    :param airfare_csv: string - path of the airfare report csv
+    :param team_airport_key: data frame - Team and the AirportCity closest to its stadium.
+        Read from TEAM_AIRPORT_CSV if not given.
+    :param chunk_rows: int - number of rows of the csv read at once
+    :return:
+        teams: list - teams of the airport key, the order of the rows and columns
+        fare_matrices: dictionary - (year, quarter) as the key and a numpy array of the
+            average airfare from the row team to the column team as the value, in both
+            directions, NaN where there is no flight.
+    """
+    if team_airport_key is None:
+        team_airport_key = pd.read_csv(TEAM_AIRPORT_CSV)
+    totals = {}
+    for chunk in iter_airfares(airfare_csv, team_airport_key, chunk_rows):
+        _add_fare_totals(totals, chunk, team_airport_key)
+    return team_airport_key["Team"].tolist(), _fare_matrices(totals, team_airport_key)
+
+
+def read_fare_tables(
+    airfare_csv=AIRFARE_CSV,
+    year=FARE_YEAR,
+    quarter=FARE_QUARTER,
+    team_airport_key=None,
+    chunk_rows=FARE_CHUNK_ROWS,
+):
+    """
+    Function that reads the fares of one year and quarter, like read_airfares, and builds the
+        airfare matrices of every quarter, like build_fare_matrices, in one pass over the
+        report in chunks.
+    :param airfare_csv: string - path of the airfare report csv
+    :param year: int - year of the fares
+    :param quarter: int - quarter of the fares, 1 to 4
+    :param team_airport_key: data frame - Team and the AirportCity closest to its stadium.
+        Read from TEAM_AIRPORT_CSV if not given.
+    :param chunk_rows: int - number of rows of the csv read at once
+    :return:
+        airfares: data frame - same as read_airfares
+        teams: list - same as build_fare_matrices
+        fare_matrices: dictionary - same as build_fare_matrices
+    """
+    if team_airport_key is None:
+        team_airport_key = pd.read_csv(TEAM_AIRPORT_CSV)
+    airfares = []
+    totals = {}
+    for chunk in iter_airfares(airfare_csv, team_airport_key, chunk_rows):
+        airfares.append(_quarter_fares(chunk, year, quarter))
+        _add_fare_totals(totals, chunk, team_airport_key)
+    return (
+        _concat_fares(airfares),
+        team_airport_key["Team"].tolist(),
+        _fare_matrices(totals, team_airport_key),
+    )
+
+
+def read_stadiums(schedule_csv=SCHEDULE_CSV):
+    """
+    Function that reads the stadium coordinates of every home team from the schedule.
+    :param schedule_csv: string - path of the schedule csv
+    :return: stadiums: data frame - home team, Latitude and Longitude, one row per team
+    """
+    stadiums = pd.read_csv(schedule_csv, usecols=["home team", "Latitude", "Longitude"])
+    return stadiums.drop_duplicates().reset_index(drop=True)
+
+
+def build_cost_df(
+    airfares, team_airport_key, stadiums, cost_per_gallon=COST_PER_GALLON, mpg=AVG_MPG
+):
+    """
+    Function that builds the cost data frame of every pair of teams, in the order of the team
+        airport key, with merges instead of loops over the teams.
+    :param airfares: data frame - city1, city2 and fare of each city pair market, in one
+        direction or both, like the output of read_airfares. The fares of a market listed
+        more than once are averaged.
+    :param team_airport_key: data frame - Team and the AirportCity closest to its stadium
+    :param stadiums: data frame - home team, Latitude and Longitude, like the output of
+        read_stadiums
+    :param cost_per_gallon: float - price of a gallon of gas
+    :param mpg: float - miles per gallon of the car
+    :return: cost_df: data frame - one row per pair of teams with the cities, the airfare,
+        the stadium coordinates, the distance, the cost of driving and the fare.
+    """
+    if mpg <= 0:
+        raise ValueError("Miles per gallon must be positive")
+    teams = team_airport_key[["Team", "AirportCity"]].merge(
+        stadiums, left_on="Team", right_on="home team", how="left"
+    )
+    if teams["Latitude"].isna().any():
+        missing = teams.loc[teams["Latitude"].isna(), "Team"].iloc[0]
+        raise ValueError(missing + " do not have a location in the schedule")
+    teams = teams[["Team", "AirportCity", "Latitude", "Longitude"]]
+    pairs = teams.add_suffix("1").merge(teams.add_suffix("2"), how="cross")
+
+    # the report lists each market once, so every fare is used in both directions
+    fares = pd.concat(
+        [
+            airfares[["city1", "city2", "fare"]],
+            airfares.rename(columns={"city1": "city2", "city2": "city1"}),
+        ]
+    )
+    # a market listed more than once gets the average of its fares, like the fare store, and
+    # keeps one row per pair of teams. The old script kept a row per listing instead.
+    fares = fares.groupby(["city1", "city2"], as_index=False)["fare"].mean()
+    pairs = pairs.merge(
+        fares.rename(columns={"fare": "airfare"}),
+        left_on=["AirportCity1", "AirportCity2"],
+        right_on=["city1", "city2"],
+        how="left",
+    )
+
+    cost_df = pd.DataFrame(
+        {
+            "Team1": pairs["Team1"],
+            "Team2": pairs["Team2"],
+            "city1": pairs["AirportCity1"],
+            "city2": pairs["AirportCity2"],
+            "airfare": pairs["airfare"],
+            "coords1": list(zip(pairs["Latitude1"], pairs["Longitude1"])),
+            "coords2": list(zip(pairs["Latitude2"], pairs["Longitude2"])),
+            "dist": haversine(
+                pairs["Latitude1"].to_numpy(),
+                pairs["Longitude1"].to_numpy(),
+                pairs["Latitude2"].to_numpy(),
+                pairs["Longitude2"].to_numpy(),
+            ),
+        }
+    )
+    cost_df["car_fare"] = cost_df["dist"] * (cost_per_gallon / mpg)
+    fare = cost_df["airfare"].fillna(cost_df["car_fare"])
+    cost_df["min_fare"] = np.minimum(cost_df["car_fare"], fare)
+    cost_df["fare"] = np.where(cost_df["dist"] < DRIVE_MILES, cost_df["min_fare"], fare)
+    return cost_df[COST_COLUMNS]
+
+
+def build_fare_store(cost_df, teams, fare_matrices, year=None):
+    """
+    Function that builds the fares between every pair of teams for each quarter of the year,
+        from the airfare matrices of build_fare_matrices and the driving costs of the cost data
+        frame, the same way as build_cost_df. Quarters with no airfares keep the fares of the
+        cost data frame.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param teams: list - teams of the rows and columns of the fare matrices
+    :param fare_matrices: dictionary - output of build_fare_matrices
+    :param year: int - year of the airfares. The latest year with airfares for the quarter
+        if not given.
+    :return: fare_store: tuple -
+        team_index - dictionary of team codes with teams as the key, same as
+            build_fare_matrix.
+        fares - (FARE_PERIODS,n,n) numpy array of fares from the row team to the column team
+            for each quarter, indexed by fare_periods of the date of the game traveled to.
+    """
+    team_index, base_fares = build_fare_matrix(cost_df)
+    car_fares = build_fare_matrix(cost_df.assign(fare=cost_df["car_fare"]))[1]
+    distances = build_fare_matrix(cost_df.assign(fare=cost_df["dist"]))[1]
+    codes = np.ix_([team_index[team] for team in teams], [team_index[team] for team in teams])
+    fares = np.repeat(base_fares[np.newaxis], FARE_PERIODS, axis=0)
+    for period in range(FARE_PERIODS):
+        quarters = [
+            key
+            for key in fare_matrices
+            if key[1] == period + 1 and (year is None or key[0] == year)
+        ]
+        if not quarters:
+            continue
+        airfares = np.full(base_fares.shape, np.nan)
+        airfares[codes] = fare_matrices[max(quarters)]
+        fare = np.where(np.isnan(airfares), car_fares, airfares)
+        fares[period] = np.where(distances < DRIVE_MILES, np.minimum(car_fares, fare), fare)
+    return team_index, fares
+
+
+def save_fare_store(fare_store, store_path=FARE_STORE):
+    """
+    Function that saves a fare store as a folder of .npy files.
+    :param fare_store: tuple - output of build_fare_store
+    :param store_path: string - path of the folder, created if it does not exist
+    """
+    team_index, fares = fare_store
+    os.makedirs(store_path, exist_ok=True)
+    np.save(os.path.join(store_path, "teams.npy"), np.array(list(team_index)))
+    np.save(os.path.join(store_path, "fares.npy"), fares)
+
+
+def load_fare_store(store_path=FARE_STORE):
+    """
+    Function that loads a fare store saved by save_fare_store.
+    :param store_path: string - path of the folder
+    :return: fare_store: tuple - same as build_fare_store
+    """
+    teams = np.load(os.path.join(store_path, "teams.npy"))
+    team_index = {str(team): code for code, team in enumerate(teams)}
+    return team_index, np.load(os.path.join(store_path, "fares.npy"))
+
+
+def _inputs_path(cost_csv):
+    """
+    Function that gives the path of the file holding the inputs of the last build.
+    :param cost_csv: string - path of the cost csv
+    :return: string - path of the inputs file, next to the cost csv
+    """
+    return os.path.splitext(cost_csv)[0] + "_inputs.json"
+
+
+def _inputs_unchanged(cost_csv, fare_store, inputs):
+    """
+    Function that checks if the outputs of a build were written from the same inputs.
+    :param cost_csv: string - path of the cost csv
+    :param fare_store: string - folder of the fare store, None if it is not built
+    :param inputs: dictionary - hash of the files and parameters of the build
+    :return: boolean - true if the cost csv, and the fare store if asked, exist and were
+        written from the same inputs
+    """
+    inputs_path = _inputs_path(cost_csv)
+    if not (
+        os.path.exists(cost_csv)
+        and os.path.exists(inputs_path)
+        and (fare_store is None or os.path.exists(fare_store))
+    ):
+        return False
+    with open(inputs_path, encoding="utf-8") as file:
+        return json.load(file) == inputs
+
+
+def _write_fare_store(cost_csv, fare_tables, year, fare_store):
+    """
+    Function that builds the fare store from the cost csv that was just written and the
+        airfare matrices of every quarter, and saves it.
+    :param cost_csv: string - path of the cost csv
+    :param fare_tables: tuple - (teams, fare_matrices) from read_fare_tables
+    :param year: int - year of the fares
+    :param fare_store: string - folder to save the fare store to
+    """
+    # read back from the csv, so the store has the same fares as the cost csv the app reads
+    cost_df = pd.read_csv(cost_csv, index_col=0)
+    teams, fare_matrices = fare_tables
+    save_fare_store(build_fare_store(cost_df, teams, fare_matrices, year), fare_store)
+
+
+def build_cost_matrix(  # pylint: disable=too-many-arguments
+    airfare_csv=AIRFARE_CSV,
+    key_csv=TEAM_AIRPORT_CSV,
+    schedule_csv=SCHEDULE_CSV,
+    cost_csv=COST_CSV,
+    *,
+    year=FARE_YEAR,
+    quarter=FARE_QUARTER,
+    cost_per_gallon=COST_PER_GALLON,
+    mpg=AVG_MPG,
+    fare_store=None,
+    force=False,
+):
+    """
+    Function that builds the cost data frame from the airfare report, the team airport key
+        and the schedule, and writes it to the cost csv. With a fare store path, the fare
+        store is built from the same pass over the report and saved too. The build is
+        skipped when the cost csv, and the fare store if asked, were written from the same
+        files and parameters.
+    :param airfare_csv: string - path of the airfare report csv
+    :param key_csv: string - path of the team airport key csv
+    :param schedule_csv: string - path of the schedule csv, for the stadium coordinates
+    :param cost_csv: string - path to write the cost csv to
+    :param year: int - year of the fares
+    :param quarter: int - quarter of the fares, 1 to 4
+    :param cost_per_gallon: float - price of a gallon of gas
+    :param mpg: float - miles per gallon of the car
+    :param fare_store: string - folder to save the fare store to, not built if not given
+    :param force: boolean - build even if the inputs have not changed
+    :return: boolean - true if the cost csv was written, false if the build was skipped
+    """
+    inputs = {
+        "files": hash_data_files([airfare_csv, key_csv, schedule_csv]),
+        "year": year,
+        "quarter": quarter,
+        "cost_per_gallon": cost_per_gallon,
+        "mpg": mpg,
+    }
+    if fare_store is not None:
+        inputs["fare_store"] = fare_store
+    if not force and _inputs_unchanged(cost_csv, fare_store, inputs):
+        return False
+    team_airport_key = pd.read_csv(key_csv)
+    if fare_store is None:
+        airfares = read_airfares(airfare_csv, year, quarter, team_airport_key)
+    else:
+        airfares, *fare_tables = read_fare_tables(
+            airfare_csv, year, quarter, team_airport_key
+        )
+    build_cost_df(
+        airfares,
+        team_airport_key,
+        read_stadiums(schedule_csv),
+        cost_per_gallon,
+        mpg,
+    ).to_csv(cost_csv)
+    if fare_store is not None:
+        _write_fare_store(cost_csv, fare_tables, year, fare_store)
+    with open(_inputs_path(cost_csv), "w", encoding="utf-8") as file:
+        json.dump(inputs, file, indent=2)
+    return True
+
+
+def main(args=None):
+    """
+    Function that reads the parameters from the command line and builds the cost csv.
+    :param args: list - command line arguments, sys.argv if not given
+    """
+    parser = argparse.ArgumentParser(description="Build the cost matrix of the teams")
+    parser.add_argument("--airfare-csv", default=AIRFARE_CSV, help="airfare report csv")
+    parser.add_argument("--key-csv", default=TEAM_AIRPORT_CSV, help="team airport key csv")
+    parser.add_argument("--schedule-csv", default=SCHEDULE_CSV, help="schedule csv")
+    parser.add_argument("--output", default=COST_CSV, help="cost csv to write")
+    parser.add_argument("--year", type=int, default=FARE_YEAR, help="year of the fares")
+    parser.add_argument(
+        "--quarter", type=int, default=FARE_QUARTER, help="quarter of the fares"
+    )
+    parser.add_argument(
+        "--gas-price", type=float, default=COST_PER_GALLON, help="price of a gallon of gas"
+    )
+    parser.add_argument("--mpg", type=float, default=AVG_MPG, help="miles per gallon")
+    parser.add_argument(
+        "--force", action="store_true", help="build even if the inputs have not changed"
+    )
+    parser.add_argument(
+        "--fare-store", help="folder to write the fares of each quarter of the year to"
+    )
+    options = parser.parse_args(args)
+    built = build_cost_matrix(
+        options.airfare_csv,
+        options.key_csv,
+        options.schedule_csv,
+        options.output,
+        year=options.year,
+        quarter=options.quarter,
+        cost_per_gallon=options.gas_price,
+        mpg=options.mpg,
+        fare_store=options.fare_store,
+        force=options.force,
+    )
+    print(("Wrote " if built else "Inputs have not changed, kept ") + options.output)
+    if built and options.fare_store is not None:
+        print("Wrote " + options.fare_store)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,15 +4,24 @@ and build a distance matrix for multiple points.
 
 dist(x, y): function to compute geographic distance in miles between two points.
 
+haversine(lat1, lon1, lat2, lon2): function to compute geographic distances in miles between
+    arrays of points, element by element.
+
+pairwise_dist(lat_long): function to compute the distances in miles between every pair of
+    points in an array.
+
 dist_matrix(lat_long_df): function to compute distance matrix for data frame of points.
 
-It requires the packages math, scipy, and pandas to run.
+It requires the packages math, numpy, and pandas to run.
 """
 
 from math import sin, cos, sqrt, atan2, radians
-from scipy.spatial.distance import pdist, squareform
+import numpy as np
 import pandas as pd
 
+EARTH_RADIUS_KM = 6373.0
+KM_PER_MILE = 1.609344
+
 
 # pylint: disable=invalid-name
 def dist(x, y):
@@ -30,7 +39,7 @@ def dist(x, y):
     lat2 = radians(y[0])
     lon2 = radians(y[1])
 
-    r = 6373.0
+    r = EARTH_RADIUS_KM
 
     dlon = lon2 - lon1
     dlat = lat2 - lat1
@@ -41,11 +50,56 @@ def dist(x, y):
     distance = r * c
 
     # convert to miles
-    distance = distance / 1.609344
+    distance = distance / KM_PER_MILE
 
     return round(distance, 4)
 
 
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Function to compute the distances between arrays of points, element by element, with the
+        same formula and rounding as dist.
+    :param lat1: numpy array - latitudes of the first locations
+    :param lon1: numpy array - longitudes of the first locations
+    :param lat2: numpy array - latitudes of the second locations
+    :param lon2: numpy array - longitudes of the second locations
+    :return: numpy array - distances in miles between the points, broadcast to a common shape
+    """
+    lat1 = np.radians(np.asarray(lat1, dtype=float))
+    lon1 = np.radians(np.asarray(lon1, dtype=float))
+    lat2 = np.radians(np.asarray(lat2, dtype=float))
+    lon2 = np.radians(np.asarray(lon2, dtype=float))
+
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    distance = EARTH_RADIUS_KM * c / KM_PER_MILE
+
+    return np.round(distance, 4)
+
+
+def pairwise_dist(lat_long):
+    """
+    Function to compute the distances between every pair of points in an array.
+    :param lat_long: numpy array - shape(n,2), latitude and longitude of each point
+    :return: numpy array - shape(n,n), each entry is the distance in miles between the row
+        point and column point
+    """
+    lat_long = np.asarray(lat_long, dtype=float)
+    if lat_long.ndim != 2 or lat_long.shape[1] != 2:
+        raise TypeError("Incorrect coordinate shape")
+    rows, cols = np.triu_indices(len(lat_long), k=1)
+    distances = np.zeros((len(lat_long), len(lat_long)))
+    distances[rows, cols] = haversine(
+        lat_long[rows, 0], lat_long[rows, 1], lat_long[cols, 0], lat_long[cols, 1]
+    )
+    distances[cols, rows] = distances[rows, cols]
+    return distances
+
+
 def dist_matrix(lat_long_df):
     """
     Method that computes a distance matrix from a data frame of latitudes and longitudes.
@@ -61,7 +115,7 @@ def dist_matrix(lat_long_df):
     if len(lat_long_df) < 1:
         raise ValueError("Need at least 1 row of data")
     lat_long = lat_long_df[["Latitude", "Longitude"]]
-    distances = pdist(lat_long.values, metric=dist)
+    distances = pairwise_dist(lat_long.values)
     points = lat_long_df["home team"]
-    result = pd.DataFrame(squareform(distances), columns=points, index=points)
+    result = pd.DataFrame(distances, columns=points, index=points)
     return result.to_numpy()
@@ -0,0 +1,622 @@
+"""
+This module implements a Held-Karp style dynamic programming search that finds the best
+route of games without enumerating every permutation of the teams.
+
+Each state of the search is a set of visited teams and the last team visited. A state
+holds a small list of labels (last game day, first game day, cost, distance) that are not
+dominated by any other label of the same state, so the search returns the same best route
+as reduce_routes followed by sort_order, including its tie breaks. States that can not beat
+a quick greedy route are dropped early.
+
+With all_starts, a route can start at any home game of its first team instead of only the
+earliest one, so the search finds the truly shortest trip in the dates. The labels then also
+keep their first game day, and the next game of every team after every day is looked up in
+a table built once from the game days.
+
+Functions:
+find_best_route(teams, schedule, cost_df, method='distance', *, league_matrix=None,
+    fare_matrix=None, all_starts=False): Function that finds the best route of games for the
+    teams, ordered by the desired method.
+find_pareto_front(teams, schedule, cost_df, *, league_matrix=None, fare_matrix=None):
+    Function that finds every route that is not dominated in time, distance and cost.
+subset_states(table, subset, tables, bound, remaining=None): Function that builds the states
+    of a set of teams from the states of its subsets with one team less.
+label_frame(label, teams, schedule): Function that turns the label of a complete route back
+    into a one row data frame of the route.
+best_label(teams, game_tables, method, all_starts=False): Function that runs the search on
+    the game tables of the teams and finds the label of the best complete route.
+
+It requires the packages bisect, itertools, numpy, pandas, exhaustive_search, labels and
+timing to run.
+"""
+
+from bisect import bisect_right
+from itertools import combinations, permutations, product
+import numpy as np
+import pandas as pd
+from .exhaustive_search import (
+    build_league_matrix,
+    build_fare_matrix,
+    build_schedule_index,
+    pareto_routes,
+)
+from .labels import fare_legs, greedy_route, next_games, route_key, team_games
+from .timing import count_routes, report_progress, timed_stage
+
+GAME_COLUMNS = ["date", "time", "away team", "home team", "Latitude", "Longitude"]
+ROUTE_COLUMNS = ["route", "games", "time", "distance", "cost"]
+# gaps in cost and distance that always survive rounding the route totals
+COST_MARGIN = 0.011
+DISTANCE_MARGIN = 1.001
+
+
+def _dominates(label, other):
+    """
+    Function that checks if a label can never lead to a worse route than another label of the
+        same state. It has to be at least as good in every metric, and either come first in
+        the permutation order or be better by more than the rounding of the final metrics,
+        so that the other label can not win a tie.
+    :param label: tuple - (day, start, cost, distance, route, games) of the label
+    :param other: tuple - (day, start, cost, distance, route, games) of the other label, with
+        a day no earlier than the label's
+    :return: boolean - true if the label dominates the other
+    """
+    if label[1] < other[1] or label[2] > other[2] or label[3] > other[3]:
+        return False
+    return (
+        label[4] < other[4]
+        or label[1] > other[1]
+        or other[2] - label[2] > COST_MARGIN
+        or other[3] - label[3] > DISTANCE_MARGIN
+    )
+
+
+def _keep_labels(labels):
+    """
+    Function that keeps the labels of a state that are not dominated by another label. The
+        labels are sorted by day, so a label can only be dominated by one kept before it.
+    :param labels: list - labels of the state, as (day, start, cost, distance, route, games)
+    :return: kept: list - non-dominated labels of the state
+    """
+    kept = []
+    for label in sorted(labels, key=lambda label: (label[0], -label[1]) + label[2:5]):
+        if not any(_dominates(kept_label, label) for kept_label in kept):
+            kept.append(label)
+    return kept
+
+
+def _route_total(route, game_days, legs, method):
+    """
+    Function that calculates the total of the desired method for a route of team indexes,
+        using the same game choice as check_valid_route.
+    :param route: list - team indexes in order of visit
+    :param game_days: list - for each team, a sorted list of game days as integers.
+    :param legs: list of lists - distance or fare from the row team to the column team.
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :return: float - total of the desired method, infinity if the route is not valid.
+    """
+    day = start = game_days[route[0]][0]
+    total = 0
+    for last, team in zip(route, route[1:]):
+        game = bisect_right(game_days[team], day)
+        if game == len(game_days[team]):
+            return float("inf")
+        day = game_days[team][game]
+        total += legs[last][team]
+    if method == "time":
+        return day - start + 1
+    if method == "cost":
+        return round(total, 2)
+    return round(total)
+
+
+@timed_stage("greedy_bound")
+def _greedy_bound(game_days, legs, method):
+    """
+    Function that builds quick routes from every first team, then improves the best one by
+        moving single teams to other positions. Returns the total of the desired method of
+        the best route, used as an upper bound of the search.
+    :param game_days: list - for each team, a sorted list of game days as integers.
+    :param legs: list of lists - distance or fare from the row team to the column team.
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :return: float - best total of the quick routes, infinity if none are valid.
+    """
+    num_teams = len(game_days)
+    best, best_route = float("inf"), None
+    for first, soonest in product(range(num_teams), (True, False)):
+        route = greedy_route(first, game_days, legs, soonest)
+        if route is not None and _route_total(route, game_days, legs, method) < best:
+            best, best_route = _route_total(route, game_days, legs, method), route
+    improved = best_route is not None
+    while improved:
+        improved = False
+        for old, new in permutations(range(num_teams), 2):
+            route = best_route[:old] + best_route[old + 1 :]
+            route.insert(new, best_route[old])
+            total = _route_total(route, game_days, legs, method)
+            if total < best:
+                best, best_route, improved = total, route, True
+    return best
+
+
+@timed_stage("start_bound")
+def _start_bound(game_days, fares):
+    """
+    Function that builds a quick route from every game of every team, always taking the next
+        team with the soonest game, and finds the shortest trip length, used as an upper
+        bound of the search over all start days.
+    :param game_days: list - for each team, a sorted list of game days as integers.
+    :param fares: list of lists - fare from the row team to the column team.
+    :return: tuple - (trip length, cost) of the shortest, then cheapest, quick route.
+        Infinity for both if none are valid.
+    """
+    best = (float("inf"), float("inf"))
+    for first, days in enumerate(game_days):
+        for start in days:
+            route = greedy_route(first, game_days, fares, True, start)
+            if route is None:
+                # later starts of this team only get stuck sooner
+                break
+            day = start
+            for team in route[1:]:
+                day = game_days[team][bisect_right(game_days[team], day)]
+            cost = sum(fares[last][team] for last, team in zip(route, route[1:]))
+            best = min(best, (day - start + 1, cost))
+    return best
+
+
+def _rest_bounds(legs, subset, remaining):
+    """
+    Function that finds a lower bound of the distance or cost of the rest of a route for each
+        possible last team. Every remaining team has to be reached from the last team or from
+        another remaining team, so the smallest of those legs into each remaining team is summed.
+    :param legs: numpy array - distance or fare from the row team to the column team.
+    :param subset: tuple - teams already visited
+    :param remaining: list - teams not yet visited
+    :return: list - lower bound of the rest of the route for each last team in subset
+    """
+    if not remaining:
+        return [0.0] * len(subset)
+    between = legs[np.ix_(remaining, remaining)]
+    np.fill_diagonal(between, np.inf)
+    from_last = legs[np.ix_(subset, remaining)]
+    return np.minimum(from_last, between.min(axis=0)).sum(axis=1).tolist()
+
+
+@timed_stage("completion_bounds")
+def _completion_bounds(legs):
+    """
+    Function that finds the smallest distance or cost to finish a route from every state,
+        ignoring the game days, with a backwards Held-Karp pass over the sets of teams.
+    :param legs: numpy array - distance or fare from the row team to the column team.
+    :return: numpy array - the smallest total of the legs that visit every team not in the
+        set, starting from the last team, with the bit mask of the set as the row and the
+        last team as the column.
+    """
+    num_teams = len(legs)
+    full = (1 << num_teams) - 1
+    bits = 1 << np.arange(num_teams)
+    completion = np.zeros((full + 1, num_teams))
+    for mask in range(full - 1, 0, -1):
+        remaining = np.flatnonzero((mask & bits) == 0)
+        completion[mask] = (
+            legs[:, remaining] + completion[mask | bits[remaining], remaining]
+        ).min(axis=1)
+    return completion
+
+
+def _time_bound(label, remaining, tables):
+    """
+    Function that finds a lower bound of the trip length of any route that completes a label.
+        Every remaining team needs its own day, and can not be visited before its next game.
+    :param label: tuple - (day, start, cost, distance, route, games)
+    :param remaining: list - teams not yet visited, each with a game after the label's day
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :return: int - lower bound of the trip length in days
+    """
+    game_days = tables[0]
+    first_day, next_game = tables[4]
+    day = label[0]
+    position = day - first_day
+    last_day = day + len(remaining)
+    for team in remaining:
+        last_day = max(last_day, game_days[team][next_game[team][position]])
+    return last_day - label[1] + 1
+
+
+def _extend_labels(previous, team, tables):
+    """
+    Function that extends the labels of the states of a set of teams with a visit to one more
+        team, at the team's soonest game at least one day after the last game.
+    :param previous: dictionary - labels of the set of teams, with the last team as the key
+    :param team: int - team to visit next
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :return: list - new labels, ending at team
+    """
+    days = tables[0][team]
+    rows = tables[1][team]
+    first_day, next_game = tables[4]
+    next_game = next_game[team]
+    labels = []
+    for last, last_labels in previous.items():
+        fare = tables[3][last][team]
+        distance = tables[2][last][team]
+        for label in last_labels:
+            game = next_game[label[0] - first_day]
+            if game < len(days):
+                labels.append(
+                    (
+                        days[game],
+                        label[1],
+                        label[2] + fare,
+                        label[3] + distance,
+                        label[4] + (team,),
+                        label[5] + (rows[game],),
+                    )
+                )
+    return labels
+
+
+def _bound_metric(bound):
+    """
+    Function that finds the metric of the labels that is checked against the bound.
+    :param bound: tuple - bound of the search, see subset_states
+    :return: tuple - (index of the metric in the labels, largest total of the metric that
+        can still win, with the rounding margin of the metric)
+    """
+    method, best, _, tie, _ = bound
+    if method == "time":
+        # a label that can only match the best trip length also has to match its cost
+        return 2, tie + COST_MARGIN
+    if method == "cost":
+        return 2, best + COST_MARGIN / 2
+    return 3, best + DISTANCE_MARGIN / 2
+
+
+def _rest_totals(subset, mask, remaining, bound):
+    """
+    Function that finds a lower bound of the distance or cost of the rest of a route for each
+        possible last team of a set of teams.
+    :param subset: tuple - set of teams
+    :param mask: int - bit mask of the set of teams
+    :param remaining: list - teams still to visit after the set
+    :param bound: tuple - bound of the search, see subset_states
+    :return: list - lower bound of the rest of the route for each last team in subset
+    """
+    method, best, legs, tie, completion = bound
+    if (tie if method == "time" else best) == float("inf"):
+        return [0.0] * len(subset)
+    if completion is not None:
+        return completion[mask, list(subset)].tolist()
+    return _rest_bounds(legs, subset, remaining)
+
+
+def _can_win(label, tables, bound, limits):
+    """
+    Function that checks if a label can be completed and can still beat the bound.
+    :param label: tuple - (day, start, cost, distance, route, games)
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :param bound: tuple - bound of the search, see subset_states
+    :param limits: tuple - (teams still to visit, first day no route can go past, index of
+        the metric checked against the bound, largest value of the metric that can win)
+    :return: boolean - true if the label has to be kept
+    """
+    method, best, _, tie, _ = bound
+    remaining, deadline, metric, limit = limits
+    if label[0] >= deadline:
+        return False
+    if label[metric] > limit:
+        return method == "time" and _time_bound(label, remaining, tables) < best
+    if method == "time":
+        length = best
+    elif tie < float("inf"):
+        # no route beats the best total, so a longer trip can not win the tie
+        length = tie
+    else:
+        return True
+    return (
+        label[0] - label[1] + 1 + len(remaining) <= length
+        and _time_bound(label, remaining, tables) <= length
+    )
+
+
+def _team_labels(previous, team, tables, bound, limits):
+    """
+    Function that builds the labels of the state of a set of teams that ends at one team,
+        keeping the labels that can still beat the bound and are not dominated.
+    :param previous: dictionary - labels of the set without the team, with the last team as
+        the key
+    :param team: int - last team of the state
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :param bound: tuple - bound of the search, see subset_states
+    :param limits: tuple - limits of the labels of the state, see _can_win
+    :return: list - labels of the state
+    """
+    labels = [
+        label
+        for label in _extend_labels(previous, team, tables)
+        if _can_win(label, tables, bound, limits)
+    ]
+    return _keep_labels(labels) if labels else []
+
+
+def subset_states(table, subset, tables, bound, remaining=None):
+    """
+    Function that builds the states of a set of teams from the states of its subsets with one
+        team less, dropping labels that can not be completed or can not beat the bound.
+    :param table: dictionary - states of the smaller sets, with the bit mask of the set as key
+    :param subset: tuple - set of teams
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :param bound: tuple - (method, best total of a known route, numpy array of the distance
+        or fare from the row team to the column team, tie) where tie is the cost of a known
+        route with the best trip length for time, the trip length of a known route with the
+        best total for distance and cost, or infinity, and the output of _completion_bounds
+        for the legs or None)
+    :param remaining: list - teams still to visit after the set. Every team not in the set if
+        not given.
+    :return: states: dictionary - labels of the set of teams, with the last team as the key
+    """
+    mask = sum(1 << team for team in subset)
+    if remaining is None:
+        remaining = [team for team in range(len(tables[0])) if not mask >> team & 1]
+    deadline = min((tables[0][team][-1] for team in remaining), default=float("inf"))
+    metric, limit = _bound_metric(bound)
+    rest = _rest_totals(subset, mask, remaining, bound)
+    states = {}
+    for position, team in enumerate(subset):
+        labels = _team_labels(
+            table.get(mask ^ (1 << team), {}),
+            team,
+            tables,
+            bound,
+            (remaining, deadline, metric, limit - rest[position]),
+        )
+        if labels:
+            states[team] = labels
+    return states
+
+
+@timed_stage("expand_layer")
+def _expand_layer(table, size, tables, bound, progress):
+    """
+    Function that builds the states of every set of teams of one size from the states of
+        the sets one team smaller, and adds them to the table.
+    :param table: dictionary - states of the smaller sets, with the bit mask of the set as key
+    :param size: int - number of teams in the sets of the layer
+    :param tables: tuple - game days, game rows, distances, fares and next games of the teams
+    :param bound: tuple - bound of the search, see subset_states
+    :param progress: list - [sets searched, total sets], updated as the layer is searched
+    """
+    for subset in combinations(range(len(tables[0])), size):
+        mask = sum(1 << team for team in subset)
+        if any(mask ^ (1 << team) in table for team in subset):
+            states = subset_states(table, subset, tables, bound)
+            if states:
+                table[mask] = states
+        progress[0] += 1
+        report_progress(*progress)
+
+
+def _start_states(game_days, game_rows, all_starts):
+    """
+    Function that builds the states of the sets of one team, one label for each game the
+        route can start at.
+    :param game_days: list - for each team, a sorted list of game days as integers.
+    :param game_rows: list - for each team, the schedule rows of its games.
+    :param all_starts: boolean - true to start routes at any game of the first team.
+    :return: table: dictionary - states of the sets, with the bit mask of the set as key
+    """
+    table = {}
+    for team, (days, rows) in enumerate(zip(game_days, game_rows)):
+        starts = len(days) if all_starts else 1
+        table[1 << team] = {
+            team: [
+                (day, day, 0, 0, (team,), (row,))
+                for day, row in zip(days[:starts], rows[:starts])
+            ]
+        }
+    return table
+
+
+def _search_bound(teams, game_tables, tables, method, all_starts):
+    """
+    Function that builds the bound of the search from quick routes of the teams.
+    :param teams: list - list of teams
+    :param game_tables: tuple - game days, game rows, league matrix and fare matrix, see
+        _finished_labels
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+        None keeps every route that is not dominated, without a bound for one method.
+    :param all_starts: boolean - true to start routes at any game of the first team.
+    :return: tuple - bound of the search, see subset_states. None if no route is valid.
+    """
+    game_days, _, distances, fares, _ = tables
+    if method is None:
+        # the time bound with no best route only drops labels that can not be completed
+        return ("time", float("inf"), None, float("inf"), None)
+    if method == "time":
+        best, best_cost = _greedy_bound(game_days, fares, method), float("inf")
+        if all_starts:
+            best, best_cost = min((best, best_cost), _start_bound(game_days, fares))
+        legs = np.array(fares, dtype=float)
+        return (method, best, legs, best_cost, _completion_bounds(legs) if all_starts else None)
+    legs = fares if method == "cost" else distances
+    if all_starts:
+        # the order alone sets the distance and cost, and a later start can only get
+        # stuck sooner, so the best total is the same as from the earliest games
+        best = best_label(teams, game_tables, method)
+        if best is None:
+            return None
+        best, tie = route_key(best, method)[0], best[0] - best[1] + 1
+    else:
+        best, tie = _greedy_bound(game_days, legs, method), float("inf")
+    legs = np.array(legs, dtype=float)
+    return (method, best, legs, tie, _completion_bounds(legs) if all_starts else None)
+
+
+def _finished_labels(teams, game_tables, method, all_starts=False):
+    """
+    Function that runs the dynamic programming search and collects the labels of the complete
+        routes that are left.
+    :param teams: list - list of teams
+    :param game_tables: tuple - (game_days, game_rows) from team_games, every team with at
+        least one game, and the output of build_league_matrix and build_fare_matrix.
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+        None keeps every route that is not dominated, without a bound for one method.
+    :param all_starts: boolean - true to start routes at any game of the first team, false
+        to start at its earliest game like check_valid_route.
+    :return: list - (day, start, cost, distance, route, games) of the complete routes, where
+        route holds team indexes and games holds schedule rows.
+    """
+    game_days, game_rows, league_matrix, fare_matrix = game_tables
+    codes = [league_matrix[0][team] for team in teams]
+    tables = (
+        game_days,
+        game_rows,
+        league_matrix[1][np.ix_(codes, codes)].tolist(),
+        fare_legs(teams, fare_matrix),
+        next_games(game_days),
+    )
+    bound = _search_bound(teams, game_tables, tables, method, all_starts)
+    if bound is None:
+        return []
+
+    table = _start_states(game_days, game_rows, all_starts)
+    progress = [0, (1 << len(teams)) - 1 - len(teams)]
+    for size in range(2, len(teams) + 1):
+        _expand_layer(table, size, tables, bound, progress)
+
+    finished = table.get((1 << len(teams)) - 1, {})
+    finished = [label for labels in finished.values() for label in labels]
+    count_routes("routes_valid", len(finished))
+    return finished
+
+
+@timed_stage("route_frame")
+def label_frame(label, teams, schedule):
+    """
+    Function that turns the label of a complete route back into team names and games.
+    :param label: tuple - (day, start, cost, distance, route, games) of the route
+    :param teams: list - list of teams, in the order of the team indexes of the label
+    :param schedule: pandas data frame - the schedule the label was found with.
+    :return: best_route: data frame - one row with the route, the games on the schedule,
+        the total trip length, distance, and cost.
+    """
+    return pd.DataFrame(
+        {
+            "route": [[teams[team] for team in label[4]]],
+            "games": [schedule.iloc[list(label[5])][GAME_COLUMNS].reset_index(drop=True)],
+            "time": [label[0] - label[1] + 1],
+            "distance": [round(label[3])],
+            "cost": [round(label[2], 2)],
+        }
+    )
+
+
+def best_label(teams, game_tables, method, all_starts=False):
+    """
+    Function that runs the dynamic programming search and finds the label of the best
+        complete route.
+    :param teams: list - list of teams
+    :param game_tables: tuple - (game_days, game_rows) from team_games, every team with at
+        least one game, and the output of build_league_matrix and build_fare_matrix.
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :param all_starts: boolean - true to start routes at any game of the first team.
+    :return: tuple - (day, start, cost, distance, route, games) of the best route, where
+        route holds team indexes and games holds schedule rows. None if no route is valid.
+    """
+    finished = _finished_labels(teams, game_tables, method, all_starts)
+    if not finished:
+        return None
+    return min(finished, key=lambda label: route_key(label, method))
+
+
+@timed_stage("find_best_route")
+def find_best_route(  # pylint: disable=too-many-arguments
+    teams,
+    schedule,
+    cost_df,
+    method="distance",
+    *,
+    league_matrix=None,
+    fare_matrix=None,
+    all_starts=False,
+):
+    """
+    Function that finds the best route of games for the teams using dynamic programming over
+        the set of visited teams and the last team visited. Like check_valid_route, each route
+        starts at the first team's earliest game and takes the soonest game of the next team
+        at least one day later. Gives the same result as the first row of sort_order on the
+        output of reduce_routes, but is not limited to 6 teams. With all_starts, a route can
+        start at any game of its first team, which finds the truly shortest trip in the dates.
+    :param teams: list - list of teams
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc. Usually the output of reduce_schedule.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :param league_matrix: tuple - output of build_league_matrix. Built from the schedule if
+        not given.
+    :param fare_matrix: tuple - output of build_fare_matrix. Built from cost_df if not given.
+    :param all_starts: boolean - true to start routes at any game of the first team, false
+        to start at its earliest game like check_valid_route.
+    :return: best_route: data frame - one row with the route, the games on the schedule,
+        the total trip length, distance, and cost. Empty if no route is valid.
+    """
+    method = str(method).lower()
+    if method not in ("time", "distance", "cost"):
+        raise ValueError("Invalid Sort")
+    game_days, game_rows = team_games(teams, build_schedule_index(schedule))
+    if not all(game_days):
+        return pd.DataFrame(columns=ROUTE_COLUMNS)
+    if league_matrix is None:
+        league_matrix = build_league_matrix(schedule)
+    if fare_matrix is None:
+        fare_matrix = build_fare_matrix(cost_df)
+    best = best_label(
+        teams, (game_days, game_rows, league_matrix, fare_matrix), method, all_starts
+    )
+    if best is None:
+        return pd.DataFrame(columns=ROUTE_COLUMNS)
+    return label_frame(best, teams, schedule)
+
+
+@timed_stage("find_pareto_front")
+def find_pareto_front(teams, schedule, cost_df, *, league_matrix=None, fare_matrix=None):
+    """
+    Function that finds every route that is not dominated in time, distance and cost, with
+        one dynamic programming search. The labels kept by the search include every such
+        route, so the best route for any sort method or weighting can be picked from the
+        front with pick_route, without searching again.
+    :param teams: list - list of teams
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc. Usually the output of reduce_schedule.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param league_matrix: tuple - output of build_league_matrix. Built from the schedule if
+        not given.
+    :param fare_matrix: tuple - output of build_fare_matrix. Built from cost_df if not given.
+    :return: front: list of tuples - (route, total days, distance, cost) of the routes that are
+        not dominated, in the order of find_all_routes. Same as pareto_routes on the output of
+        stream_routes.
+    """
+    game_days, game_rows = team_games(teams, build_schedule_index(schedule))
+    if not all(game_days):
+        return []
+    if league_matrix is None:
+        league_matrix = build_league_matrix(schedule)
+    if fare_matrix is None:
+        fare_matrix = build_fare_matrix(cost_df)
+    finished = _finished_labels(
+        teams, (game_days, game_rows, league_matrix, fare_matrix), None
+    )
+    finished.sort(key=lambda label: label[4])
+    return pareto_routes(
+        (
+            [teams[team] for team in label[4]],
+            label[0] - label[1] + 1,
+            round(label[3]),
+            round(label[2], 2),
+        )
+        for label in finished
+    )
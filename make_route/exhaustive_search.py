@@ -9,22 +9,80 @@ reduce_schedule(schedule, teams, start_date, end_date): function that creates a
 find_all_routes(teams): Function that provides all route combinations for teams.
 build_dist_matrix(teams, schedule):  Function that builds the distance matrix for the
     given teams and schedule
+build_league_matrix(schedule): Function that builds the distance matrix between every team
+    in the schedule, indexed by team code.
 game_finder(schedule, route): Function that creates a dictionary with team as the key and
     the list of home games as the value.
-check_valid_route(route, schedule): Function that checks if the route is valid and creates
-    schedule of games based on route if so.
-reduce_routes(routes, schedule, cost_df):Function that iterates through all possible routes,
-    checks the validity, creates a schedule, calculates the distance, cost, and trip length.
-calculate_distance(route, schedule): Function that calculates total distance of the route.
-calculate_cost(route, cost_df): Function that calculates the cost of the route.
+build_schedule_index(schedule): Function that indexes the sorted game days of every team.
+find_route_games(route, schedule_index): Function that finds the schedule rows of the
+    games of a route.
+build_transition_table(schedule): Function that finds the next home game of every team after
+    every game of the schedule.
+save_transition_table(transition_table, table_path): Function that saves a transition table
+    to a folder of .npy files.
+load_transition_table(table_path): Function that loads a transition table saved by
+    save_transition_table.
+find_transition_games(route, transition_table): Function that finds the schedule rows of the
+    games of a route with one lookup for each team.
+check_valid_route(route, schedule, schedule_index=None, *, transition_table=None): Function
+    that checks if the route is valid and creates schedule of games based on route if so.
+reduce_routes(routes, schedule, cost_df, workers=1, fare_matrix=None): Function that iterates
+    through all possible routes, checks the validity, creates a schedule, calculates the
+    distance, cost, and trip length, optionally split by first team across worker processes.
+walk_routes(teams, schedule, cost_df, *, league_matrix=None, fare_matrix=None,
+    transition_table=None, schedule_index=None): Function that walks the tree of route
+    permutations depth first, as team codes, and yields the games, trip length, distance and
+    cost of every valid route.
+reduce_team_routes(teams, schedule, cost_df): Function that gives the same data frame as
+    reduce_routes for every route of the teams, sharing the work of common prefixes.
+stream_routes(routes, schedule, cost_df, *, league_matrix=None, fare_matrix=None,
+    transition_table=None): Function that yields the trip length, distance and cost of every
+    valid route, one at a time.
+top_routes(route_stream, schedule, k=1, method='distance'): Function that keeps the best k
+    routes of a stream and builds their schedules of games.
+pareto_routes(route_stream): Function that keeps the routes of a stream that are not
+    dominated in time, distance and cost.
+pick_route(front, schedule, method='distance', weights=None): Function that picks the best
+    route of a Pareto front for a sort method or a weighting.
+calculate_distance(route, schedule, league_matrix=None): Function that calculates total
+    distance of the route.
+build_fare_matrix(cost_df): Function that builds the fare matrix between every team in the
+    cost data frame, indexed by team code.
+fare_periods(dates): Function that gives the fare period, the quarter of the year, of each
+    date.
+fare_lookup(fare_matrix, team1, team2, period=None): Function that looks up the fare between
+    two teams.
+calculate_cost(route, cost_df, fare_matrix=None, periods=None): Function that calculates the
+    cost of the route.
 sort_order(route_df, method='distance'): Function that sorts the routes by the desired method
 
-It requires the packages itertools, distance, and pandas to run.
+It requires the packages concurrent.futures, heapq, itertools, os, warnings, distance, itinerary,
+numpy, and pandas to run.
 """
 
-from itertools import permutations
+from concurrent.futures import ProcessPoolExecutor
+import heapq
+from itertools import groupby, permutations
+import os
+import warnings
+import numpy as np
 import pandas as pd
 from .distance import dist_matrix
+from .itinerary import TeamCodes
+from .timing import count_routes, timed_stage
+
+# order of the metrics used by sort_order for each sort method
+SORT_KEYS = {
+    "time": ["time", "cost", "distance"],
+    "cost": ["cost", "time", "distance"],
+    "distance": ["distance", "time", "cost"],
+}
+# number of fare periods of a fare store, one for each quarter of the year
+FARE_PERIODS = 4
+# fewer routes than this are checked in one process, since starting workers costs more
+PARALLEL_MIN_ROUTES = 120
+# schedule, cost data and lookup tables of a worker process, set once by _init_worker
+_worker_state = {}
 
 
 def home_game_exists(schedule, team):
@@ -42,6 +100,7 @@ def home_game_exists(schedule, team):
     return False
 
 
+@timed_stage("reduce_schedule")
 def reduce_schedule(schedule, teams, start_date, end_date):
     """
     Function that takes in teams and a date range to create a subset of the MLB schedule
@@ -65,6 +124,7 @@ def reduce_schedule(schedule, teams, start_date, end_date):
     return sched_subset
 
 
+@timed_stage("find_all_routes")
 def find_all_routes(teams):
     """
     Function that provides all route combinations for teams. Raises an error if there are more
@@ -108,6 +168,25 @@ def build_dist_matrix(teams, schedule):
     return team_dict, dist_matrix(team_coords)
 
 
+def build_league_matrix(schedule):
+    """
+    Function that builds the distance matrix between every team in the schedule once, so that
+        the distance of any route can be looked up instead of building a matrix per route.
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :return:
+        team_index - dictionary of team codes with teams as the key. Teams are coded in
+            alphabetical order.
+        distance matrix - (n,n) numpy array of distances between rows and columns, where
+            n is the number of teams in the schedule. Ordered by team code.
+    """
+    team_coords = schedule[["home team", "Latitude", "Longitude"]]
+    team_coords = team_coords.drop_duplicates(subset=["home team"])
+    team_coords = team_coords.sort_values(by=["home team"]).reset_index(drop=True)
+    team_index = {team: code for code, team in enumerate(team_coords["home team"])}
+    return team_index, dist_matrix(team_coords)
+
+
 def game_finder(schedule, route):
     """
     Function that creates a dictionary with team as the key and
@@ -123,7 +202,154 @@ def game_finder(schedule, route):
     return team_games
 
 
-def check_valid_route(route, schedule):
+def build_schedule_index(schedule):
+    """
+    Function that indexes the home games of every team once, so that the next home game of a
+        team after a given day can be found with a binary search.
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :return: schedule_index: dictionary of teams with a tuple as the value. The tuple is a
+        sorted numpy array of the team's game days, as days since 1970-01-01, and a numpy
+        array of the matching row positions in the schedule.
+    """
+    days = schedule["date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    home = schedule["home team"].to_numpy()
+    schedule_index = {}
+    for team in pd.unique(home):
+        rows = np.flatnonzero(home == team)
+        rows = rows[np.argsort(days[rows], kind="stable")]
+        schedule_index[team] = (days[rows], rows)
+    return schedule_index
+
+
+def find_route_games(route, schedule_index):
+    """
+    Function that finds the games of a route, using the soonest game of the next team at
+        least one day after the last game, without building any data frames.
+    :param route: list - list of teams in desired order.
+    :param schedule_index: dictionary - output of build_schedule_index.
+    :return:
+        game_rows: list - row positions in the schedule of the route's games, in route
+            order. Empty if the route is not valid.
+        total_days: int - number of days route takes, 0 if the route is not valid.
+    """
+    no_games = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+    days, rows = schedule_index.get(route[0], no_games)
+    if len(days) == 0:
+        return [], 0
+    first_day = day = days[0]
+    game_rows = [rows[0]]
+    for team in route[1:]:
+        days, rows = schedule_index.get(team, no_games)
+        game = np.searchsorted(days, day, side="right")
+        if game == len(days):
+            return [], 0
+        day = days[game]
+        game_rows.append(rows[game])
+    return game_rows, int(day - first_day) + 1
+
+
+def build_transition_table(schedule):
+    """
+    Function that finds, for every game of the schedule and every team, the next home game of
+        the team at least one day after the game, once per schedule. Each team is one
+        vectorized binary search over the game days of the whole schedule.
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :return: transition_table: tuple -
+        team_codes: dictionary - column of each team in the arrays, with teams as the key.
+        first_games: numpy array - row position of each team's earliest game, -1 if the
+            team has no home game.
+        next_games: numpy array - one row for each game and one column for each team, with
+            the row position of the team's next game, -1 if there is none.
+        days: numpy array - day of each game, as days since 1970-01-01.
+    """
+    days = schedule["date"].to_numpy().astype("datetime64[D]").astype(np.int64)
+    schedule_index = build_schedule_index(schedule)
+    team_codes = {team: code for code, team in enumerate(schedule_index)}
+    first_games = np.full(len(team_codes), -1, dtype=np.int64)
+    next_games = np.full((len(days), len(team_codes)), -1, dtype=np.int64)
+    for team, code in team_codes.items():
+        team_days, rows = schedule_index[team]
+        first_games[code] = rows[0]
+        games = np.searchsorted(team_days, days, side="right")
+        found = games < len(team_days)
+        next_games[found, code] = rows[games[found]]
+    return team_codes, first_games, next_games, days
+
+
+def save_transition_table(transition_table, table_path):
+    """
+    Function that saves a transition table as a folder of .npy files, so that it can be
+        loaded again for the same schedule without building it.
+    :param transition_table: tuple - output of build_transition_table
+    :param table_path: string - path of the folder, created if it does not exist
+    """
+    team_codes, first_games, next_games, days = transition_table
+    os.makedirs(table_path, exist_ok=True)
+    np.save(os.path.join(table_path, "teams.npy"), np.array(list(team_codes)))
+    np.save(os.path.join(table_path, "first_games.npy"), first_games)
+    np.save(os.path.join(table_path, "next_games.npy"), next_games)
+    np.save(os.path.join(table_path, "days.npy"), days)
+
+
+def load_transition_table(table_path):
+    """
+    Function that loads a transition table saved by save_transition_table. The table of next
+        games is memory mapped, so only the rows that are used get read.
+    :param table_path: string - path of the folder
+    :return: transition_table: tuple - same as build_transition_table
+    """
+    teams = np.load(os.path.join(table_path, "teams.npy"))
+    team_codes = {str(team): code for code, team in enumerate(teams)}
+    first_games = np.load(os.path.join(table_path, "first_games.npy"))
+    next_games = np.load(os.path.join(table_path, "next_games.npy"), mmap_mode="r")
+    days = np.load(os.path.join(table_path, "days.npy"))
+    return team_codes, first_games, next_games, days
+
+
+def find_transition_games(route, transition_table):
+    """
+    Function that finds the games of a route like find_route_games, with one lookup in the
+        transition table for each team.
+    :param route: list - list of teams in desired order.
+    :param transition_table: tuple - output of build_transition_table.
+    :return:
+        game_rows: list - row positions in the schedule of the route's games, in route
+            order. Empty if the route is not valid.
+        total_days: int - number of days route takes, 0 if the route is not valid.
+    """
+    team_codes, first_games, next_games, days = transition_table
+    if route[0] not in team_codes:
+        return [], 0
+    game = int(first_games[team_codes[route[0]]])
+    game_rows = [game]
+    for team in route[1:]:
+        if team not in team_codes:
+            return [], 0
+        game = int(next_games[game, team_codes[team]])
+        if game < 0:
+            return [], 0
+        game_rows.append(game)
+    return game_rows, int(days[game] - days[game_rows[0]]) + 1
+
+
+def _route_games(schedule, game_rows):
+    """
+    Function that builds the schedule of games of a valid route from the rows of its games.
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :param game_rows: list - row positions in the schedule of the route's games, in route
+        order.
+    :return: final_sched: pandas data frame - each row is a game, same order as route.
+    """
+    return schedule.iloc[game_rows][
+        ["date", "time", "away team", "home team", "Latitude", "Longitude"]
+    ].reset_index(drop=True)
+
+
+@timed_stage("check_valid_route")
+def check_valid_route(route, schedule, schedule_index=None, *, transition_table=None):
     """
     Function that checks if the route is valid, i.e. games can be found between the dates in the
         given order. If valid, function creates schedule of games based on route, using the
@@ -131,71 +357,306 @@ def check_valid_route(route, schedule):
     :param route: list - list of teams in desired order.
     :param schedule: pandas data frame - contains every game for the MLB season
         with teams, location, etc.
+    :param schedule_index: dictionary - output of build_schedule_index for the schedule.
+        Built from the schedule if neither it nor the transition table is given.
+    :param transition_table: tuple - output of build_transition_table for the schedule.
+        Used in place of the schedule index when given, pass it in when checking many
+        routes.
     :return:
         validity: boolean - false if route is not valid, true if it is.
         final_sched: pandas data frame - empty if route not valid. each row is a game,
             same order as route.
         total_days: int - number of days route takes.
     """
-    team_games = game_finder(schedule, route)
-    first_team = team_games[route[0]].reset_index()
-    col_names = first_team.columns
-    sched = []
-    team1_earliest = first_team.head(1)
-    min_date = team1_earliest["date"][0]
-    sched.append(team1_earliest.values.tolist())
-    for team in route[1:]:
-        games = team_games[team].reset_index()
-        game_options = games.loc[games["date"] > min_date].sort_values(by=["date"])
-        min_game = game_options.head(1)
-        sched.append(min_game.values.tolist())
-        if len(min_game["date"]) == 0:
-            return False, pd.DataFrame, 0
-        min_date = list(min_game["date"])[0]
-    final_sched = []
-    for game in sched:
-        final_sched.append(game[0])
-    final_sched = pd.DataFrame(final_sched, columns=col_names)
-    total_days = (list(final_sched["date"])[-1] - final_sched["date"][0]).days + 1
-    if len(final_sched) == 0:
-        raise ValueError("No Possible Games")
-    return (
-        True,
-        final_sched[
-            ["date", "time", "away team", "home team", "Latitude", "Longitude"]
-        ],
-        total_days,
+    if transition_table is not None:
+        game_rows, total_days = find_transition_games(route, transition_table)
+    else:
+        if schedule_index is None:
+            schedule_index = build_schedule_index(schedule)
+        game_rows, total_days = find_route_games(route, schedule_index)
+    if not game_rows:
+        return False, pd.DataFrame, 0
+    return True, _route_games(schedule, game_rows), total_days
+
+
+@timed_stage("team_codes")
+def _team_codes(  # pylint: disable=too-many-arguments
+    schedule, cost_df, league_matrix=None, fare_matrix=None, transition_table=None
+):
+    """
+    Function that codes the teams of the schedule with the tables of their legs and games,
+        building the tables that are not given.
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param league_matrix: tuple - output of build_league_matrix
+    :param fare_matrix: tuple - output of build_fare_matrix or of a fare store
+    :param transition_table: tuple - output of build_transition_table
+    :return: TeamCodes of the teams of the league matrix
+    """
+    if league_matrix is None:
+        league_matrix = build_league_matrix(schedule)
+    if fare_matrix is None:
+        fare_matrix = build_fare_matrix(cost_df)
+    if transition_table is None:
+        transition_table = build_transition_table(schedule)
+    periods = fare_periods(schedule["date"]) if fare_matrix[1].ndim == 3 else None
+    return TeamCodes(league_matrix, fare_matrix, transition_table, periods)
+
+
+@timed_stage("route_frame")
+def _route_frame(itineraries, team_codes, schedule):
+    """
+    Function that turns the itineraries of valid routes back into team names and games.
+    :param itineraries: list - Itinerary of every valid route
+    :param team_codes: TeamCodes - codes of the teams of the itineraries
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :return: all_route_options: data frame - of the route, the games on the schedule,
+        the total trip length, distance, and cost.
+    """
+    return pd.DataFrame(
+        {
+            "route": [team_codes.decode(itinerary.route) for itinerary in itineraries],
+            "games": [_route_games(schedule, itinerary.games) for itinerary in itineraries],
+            "time": [itinerary.time for itinerary in itineraries],
+            "distance": [itinerary.distance for itinerary in itineraries],
+            "cost": [itinerary.cost for itinerary in itineraries],
+        }
     )
 
 
-def reduce_routes(routes, schedule, cost_df):
+def _init_worker(schedule, cost_df, fare_matrix):
+    """
+    Function that runs once in each worker process, and codes the teams of the schedule with
+        the tables of their legs and games for every task the worker gets.
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param fare_matrix: tuple - output of build_fare_matrix or of a fare store
+    """
+    _worker_state["team_codes"] = _team_codes(schedule, cost_df, fare_matrix=fare_matrix)
+
+
+def _walk_chunk(routes):
+    """
+    Function that walks a chunk of coded routes in a worker process, with the team codes from
+        _init_worker.
+    :param routes: numpy array - int8 team codes with one row for each route
+    :return: list - Itinerary of every valid route, in the order of the routes
+    """
+    team_codes = _worker_state["team_codes"]
+    itineraries = (team_codes.walk(tuple(route)) for route in routes.tolist())
+    return [itinerary for itinerary in itineraries if itinerary is not None]
+
+
+@timed_stage("walk_itineraries")
+def _walk_itineraries(routes, team_codes):
+    """
+    Function that walks the routes one at a time in this process.
+    :param routes: list - list of routes, route is a list of teams in desired order.
+    :param team_codes: TeamCodes - codes of the teams of the schedule
+    :return: list - Itinerary of every valid route, in the order of the routes.
+    """
+    itineraries = (team_codes.walk(team_codes.encode(route)) for route in routes)
+    return [itinerary for itinerary in itineraries if itinerary is not None]
+
+
+@timed_stage("walk_itineraries")
+def _parallel_walk(  # pylint: disable=too-many-arguments
+    routes, team_codes, schedule, cost_df, workers, fare_matrix
+):
+    """
+    Function that splits the routes by first team and walks the chunks across worker
+        processes. The schedule and cost data are sent once to each worker, and each chunk is
+        sent as an array of team codes.
+    :param routes: list - list of routes, route is a list of teams in desired order.
+    :param team_codes: TeamCodes - codes of the teams of the schedule
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param workers: int - number of worker processes
+    :param fare_matrix: tuple - output of build_fare_matrix or of a fare store
+    :return: list - Itinerary of every valid route, in the order of the routes.
+    """
+    chunks = [
+        team_codes.encode_routes(list(chunk))
+        for _, chunk in groupby(routes, key=lambda route: route[0])
+    ]
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(schedule, cost_df, fare_matrix)
+    ) as executor:
+        results = executor.map(_walk_chunk, chunks)
+        return [itinerary for chunk in results for itinerary in chunk]
+
+
+@timed_stage("reduce_routes")
+def reduce_routes(routes, schedule, cost_df, workers=1, fare_matrix=None):
     """
     Function that iterates through all possible routes, checks the validity, creates a schedule,
         calculates the distance, cost, and trip length. Results in a data frame of the route,
-        the games on the schedule, the total trip length, distance, and cost.
+        the games on the schedule, the total trip length, distance, and cost. The routes are
+        checked as team codes, and only the valid ones get their team names and games back.
     :param routes: list - list of routes, route is a list of teams in desired order.
     :param schedule: pandas data frame - contains every game for the MLB season
         with teams, location, etc.
     :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
         the coordinates, and the cost of the path.
+    :param workers: int - number of worker processes. With more than 1, the routes are split
+        by first team across a process pool, unless there are fewer than
+        PARALLEL_MIN_ROUTES routes. The result is the same, in the same order.
+    :param fare_matrix: tuple - output of build_fare_matrix, or a fare store with the fares
+        of each period from make_route.cost_matrix. Built from cost_df if not given.
     :return: all_route_options: data frame - of the route, the games on the schedule,
         the total trip length, distance, and cost.
     """
+    count_routes("routes_evaluated", len(routes))
+    if fare_matrix is None:
+        fare_matrix = build_fare_matrix(cost_df)
+    team_codes = _team_codes(schedule, cost_df, fare_matrix=fare_matrix)
+    if workers > 1 and len(routes) >= PARALLEL_MIN_ROUTES:
+        itineraries = _parallel_walk(
+            routes, team_codes, schedule, cost_df, workers, fare_matrix
+        )
+    else:
+        itineraries = _walk_itineraries(routes, team_codes)
+    count_routes("routes_valid", len(itineraries))
+    return _route_frame(itineraries, team_codes, schedule)
+
+
+def _walk_prefix(prefix, remaining, team_codes):
+    """
+    Function that extends a valid route prefix with every remaining team, in the order of
+        the teams, and yields the complete routes below it.
+    :param prefix: tuple - (route, game rows, distance, cost), with the route as team codes
+    :param remaining: list - codes of the teams not yet visited, in the order of the teams
+    :param team_codes: TeamCodes - codes of the teams with the tables of their legs and games
+    :return: generator of tuples - (route, game rows, distance, cost) of every valid route
+        below the prefix
+    """
+    route, rows, distance, cost = prefix
+    if not remaining:
+        yield prefix
+        return
+    last = route[-1]
+    for position, team in enumerate(remaining):
+        row = team_codes.next_game(rows[-1], team)
+        if row < 0:
+            continue
+        child = (
+            route + (team,),
+            rows + [row],
+            distance + team_codes.distances[last][team],
+            cost + team_codes.fare(last, team, row),
+        )
+        yield from _walk_prefix(
+            child, remaining[:position] + remaining[position + 1 :], team_codes
+        )
+
+
+def _walk_codes(codes, team_codes):
+    """
+    Function that walks the tree of route permutations of the codes from each first team in
+        turn, starting at its earliest game.
+    :param codes: list - codes of the teams, in the order of the teams
+    :param team_codes: TeamCodes - codes of the teams with the tables of their legs and games
+    :return: generator of tuples - (route, game rows, distance, cost) of every valid route,
+        in the order of find_all_routes. Nothing if a team has no home game.
+    """
+    if not team_codes.scheduled(codes):
+        return
+    for position, team in enumerate(codes):
+        game = team_codes.first_game(team)
+        remaining = codes[:position] + codes[position + 1 :]
+        yield from _walk_prefix(((team,), [game], 0, 0), remaining, team_codes)
+
+
+def walk_routes(  # pylint: disable=too-many-arguments
+    teams,
+    schedule,
+    cost_df,
+    *,
+    league_matrix=None,
+    fare_matrix=None,
+    transition_table=None,
+    schedule_index=None,
+):
+    """
+    Function that walks the tree of route permutations depth first, as team codes. The last
+        game, distance and cost of each prefix are computed once and shared by every route
+        that starts with it, and a prefix without a next game cuts off all routes below it.
+        Routes come in the same order as find_all_routes, with the same games, trip length,
+        distance and cost as check_valid_route, calculate_distance and calculate_cost.
+    :param teams: list - list of teams
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param league_matrix: tuple - output of build_league_matrix. Built from the schedule if
+        not given.
+    :param fare_matrix: tuple - output of build_fare_matrix, or a fare store with the fares
+        of each period. Built from cost_df if not given.
+    :param transition_table: tuple - output of build_transition_table. Built from the
+        schedule if not given.
+    :param schedule_index: dictionary - deprecated and not used, the next games come from
+        the transition table. Pass transition_table instead.
+    :return: generator of tuples - (route, game rows, total days, distance, cost) of every
+        valid route, where game rows are the row positions of the games in the schedule.
+    """
+    if schedule_index is not None:
+        warnings.warn(
+            "schedule_index is deprecated and not used, pass transition_table instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+    team_codes = _team_codes(
+        schedule, cost_df, league_matrix, fare_matrix, transition_table
+    )
+    codes = list(team_codes.encode(teams))
+    for route, rows, distance, cost in _walk_codes(codes, team_codes):
+        count_routes("routes_valid")
+        yield (
+            team_codes.decode(route),
+            rows,
+            team_codes.trip_days(rows),
+            round(np.float64(distance)),
+            round(np.float64(cost), 2),
+        )
+
+
+@timed_stage("reduce_team_routes")
+def reduce_team_routes(teams, schedule, cost_df):
+    """
+    Function that gives the same data frame as reduce_routes on the output of
+        find_all_routes, using walk_routes so that routes with a common prefix share its
+        games, distance and cost. Raises an error if there are more than 6 teams, to reduce
+        runtime.
+    :param teams: list - list of teams
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :return: all_route_options: data frame - of the route, the games on the schedule,
+        the total trip length, distance, and cost.
+    """
+    if len(teams) > 6:
+        raise ValueError("Too many selections")
     reduced_routes = []
     game_order = []
     trip_length = []
     distances = []
     costs = []
-    for route in routes:
-        validity, valid_route, total_days = check_valid_route(route, schedule)
-        distance = calculate_distance(route, schedule)
-        cost = calculate_cost(route, cost_df)
-        if validity is not False:
-            reduced_routes.append(route)
-            game_order.append(valid_route)
-            trip_length.append(total_days)
-            distances.append(distance)
-            costs.append(cost)
+    for route, game_rows, total_days, distance, cost in walk_routes(
+        list(teams), schedule, cost_df
+    ):
+        reduced_routes.append(route)
+        game_order.append(_route_games(schedule, game_rows))
+        trip_length.append(total_days)
+        distances.append(distance)
+        costs.append(cost)
     all_route_options = pd.DataFrame(
         {
             "route": reduced_routes,
@@ -208,43 +669,251 @@ def reduce_routes(routes, schedule, cost_df):
     return all_route_options
 
 
-def calculate_distance(route, schedule):
+def stream_routes(  # pylint: disable=too-many-arguments
+    routes, schedule, cost_df, *, league_matrix=None, fare_matrix=None, transition_table=None
+):
     """
-    Function that calculates total distance of the route using the
-        build_dist_matrix function and resulting distance matrix. Assumes distance matrix is in
-        order of travel, such the needed distance is one entry to the right of the diagonal.
+    Function that checks the routes one at a time, like reduce_routes, but yields the metrics
+        of each valid route instead of collecting every route and its games in a data frame.
+    :param routes: iterable - routes, route is a list of teams in desired order.
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param league_matrix: tuple - output of build_league_matrix. Built from the schedule if
+        not given.
+    :param fare_matrix: tuple - output of build_fare_matrix, or a fare store with the fares
+        of each period. Built from cost_df if not given.
+    :param transition_table: tuple - output of build_transition_table. Built from the
+        schedule if not given.
+    :return: generator of tuples - (route, total days, distance, cost) of every valid route,
+        in the order of the routes.
+    """
+    team_codes = _team_codes(
+        schedule, cost_df, league_matrix, fare_matrix, transition_table
+    )
+    for route in routes:
+        itinerary = team_codes.walk(team_codes.encode(route))
+        count_routes("routes_evaluated")
+        if itinerary is not None:
+            count_routes("routes_valid")
+            yield route, itinerary.time, itinerary.distance, itinerary.cost
+
+
+@timed_stage("top_routes")
+def top_routes(route_stream, schedule, k=1, method="distance"):
+    """
+    Function that keeps the best k routes of a stream in a bounded heap, ordered like
+        sort_order, including its tie breaks by the order of the stream. Only the kept routes
+        get their schedule of games built.
+    :param route_stream: iterable - tuples of (route, total days, distance, cost), like the
+        output of stream_routes.
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc.
+    :param k: int - number of routes to keep
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :return: sorted_route_df: data frame - the best k routes, sorted, with the route, the
+        games on the schedule, the total trip length, distance, and cost.
+    """
+    method = str(method).lower()
+    if method not in SORT_KEYS:
+        raise ValueError("Invalid Sort")
+    if k < 1:
+        raise ValueError("Need at least 1 route")
+    heap = []
+    for order, (route, total_days, distance, cost) in enumerate(route_stream):
+        metrics = {"time": total_days, "distance": distance, "cost": cost}
+        # the heap keeps the worst kept route on top, so every key is negated
+        key = tuple(-metrics[column] for column in SORT_KEYS[method]) + (-order,)
+        if len(heap) < k:
+            heapq.heappush(heap, (key, route, metrics))
+        elif key > heap[0][0]:
+            heapq.heapreplace(heap, (key, route, metrics))
+    best = sorted(heap, reverse=True)
+    schedule_index = build_schedule_index(schedule)
+    return pd.DataFrame(
+        {
+            "route": [route for _, route, _ in best],
+            "games": [
+                check_valid_route(route, schedule, schedule_index)[1]
+                for _, route, _ in best
+            ],
+            "time": [metrics["time"] for _, _, metrics in best],
+            "distance": [metrics["distance"] for _, _, metrics in best],
+            "cost": [metrics["cost"] for _, _, metrics in best],
+        }
+    )
+
+
+def _dominates(metrics, other):
+    """
+    Function that checks if a route is at least as good as another in time, distance and cost.
+    :param metrics: tuple - (total days, distance, cost) of the route
+    :param other: tuple - (total days, distance, cost) of the other route
+    :return: boolean - true if the route is no worse than the other in every metric
+    """
+    return all(value <= other_value for value, other_value in zip(metrics, other))
+
+
+@timed_stage("pareto_routes")
+def pareto_routes(route_stream):
+    """
+    Function that keeps the routes of a stream that are not dominated in time, distance and
+        cost, checking each route as it comes. Of routes with the same metrics only the first
+        is kept, so the best route of the front for any sort method is the same route that
+        sort_order would put first, and so is the best route for any weighting.
+    :param route_stream: iterable - tuples of (route, total days, distance, cost), like the
+        output of stream_routes.
+    :return: front: list of tuples - (route, total days, distance, cost) of the routes that are
+        not dominated, in the order of the stream.
+    """
+    front = []
+    for route, total_days, distance, cost in route_stream:
+        metrics = (total_days, distance, cost)
+        if any(_dominates(kept[0], metrics) for kept in front):
+            continue
+        front = [kept for kept in front if not _dominates(metrics, kept[0])]
+        front.append((metrics, route))
+    return [(route, *metrics) for metrics, route in front]
+
+
+def pick_route(front, schedule, method="distance", weights=None):
+    """
+    Function that picks the best route of a Pareto front, either by a sort method like
+        sort_order, or by the smallest weighted sum of the metrics, without another search.
+    :param front: list of tuples - (route, total days, distance, cost), the output of
+        pareto_routes or find_pareto_front.
+    :param schedule: pandas data frame - the schedule the front was found with.
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+        Not used when weights are given.
+    :param weights: dictionary - weight of each metric, with time, distance and cost as the
+        keys. Ties go to the route that comes first in the front.
+    :return: best_route: data frame - one row with the route, the games on the schedule,
+        the total trip length, distance, and cost. Empty if the front is empty.
+    """
+    if weights is None:
+        return top_routes(front, schedule, 1, method)
+    if any(weight < 0 for weight in weights.values()):
+        raise ValueError("Weights can not be negative")
+    scores = [
+        weights.get("time", 0) * total_days
+        + weights.get("distance", 0) * distance
+        + weights.get("cost", 0) * cost
+        for _, total_days, distance, cost in front
+    ]
+    best = [front[scores.index(min(scores))]] if front else []
+    return top_routes(best, schedule, 1, method)
+
+
+@timed_stage("calculate_distance")
+def calculate_distance(route, schedule, league_matrix=None):
+    """
+    Function that calculates total distance of the route by looking up each leg in the
+        distance matrix from build_league_matrix.
     :param route: list - list of teams in desired order.
     :param schedule: pandas data frame - contains every game for the MLB season
         with teams, location, etc.
+    :param league_matrix: tuple - output of build_league_matrix. Built from the schedule if
+        not given, pass it in when calculating many routes.
     :return: total_dist: float - distance in miles of the route.
     """
-    distance_matrix = build_dist_matrix(route, schedule)[1]
+    if league_matrix is None:
+        league_matrix = build_league_matrix(
+            schedule.loc[schedule["home team"].isin(route)]
+        )
+    team_index, distance_matrix = league_matrix
+    for team in route:
+        if team not in team_index:
+            raise ValueError(team + " do not have a location in the schedule")
     total_dist = 0
-    for i in range(len(route)):
-        if i + 1 < len(route):
-            total_dist += distance_matrix[i][i + 1]
+    for i in range(len(route) - 1):
+        total_dist += distance_matrix[team_index[route[i]]][team_index[route[i + 1]]]
     return round(total_dist)
 
 
-def calculate_cost(route, cost_df):
+def build_fare_matrix(cost_df):
+    """
+    Function that builds the fare matrix between every team in the cost data frame once, so
+        that the cost of any route can be looked up instead of filtering the data frame.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :return:
+        team_index - dictionary of team codes with teams as the key. Teams are coded in
+            alphabetical order.
+        fare matrix - (n,n) numpy array of fares from the row team to the column team, where
+            n is the number of teams in cost_df. Missing pairs are nan.
+    """
+    teams = sorted(set(cost_df["Team1"]) | set(cost_df["Team2"]))
+    team_index = {team: code for code, team in enumerate(teams)}
+    fares = np.full((len(teams), len(teams)), np.nan)
+    edges = cost_df.drop_duplicates(subset=["Team1", "Team2"])
+    fares[
+        edges["Team1"].map(team_index).to_numpy(),
+        edges["Team2"].map(team_index).to_numpy(),
+    ] = edges["fare"].to_numpy()
+    return team_index, fares
+
+
+def fare_periods(dates):
     """
-    Function that calculates the cost of the route using the cost data frame.
+    Function that gives the fare period of each date, the quarter of the year, which indexes
+        the first axis of the fares of a fare store.
+    :param dates: pandas series or list - dates of the games
+    :return: numpy array - period of each date, from 0 for January to March, to 3
+    """
+    return (pd.to_datetime(pd.Series(dates)).dt.month.to_numpy() - 1) // 3
+
+
+def fare_lookup(fare_matrix, team1, team2, period=None):
+    """
+    Function that looks up the fare from one team to another in the fare matrix.
+    :param fare_matrix: tuple - output of build_fare_matrix, or a fare store with the fares
+        of each period, e.g. the output of build_fare_store in make_route.cost_matrix.
+    :param team1: string - team traveled from
+    :param team2: string - team traveled to
+    :param period: int - fare period of the game traveled to, from fare_periods. Needed for
+        a fare store, not used for a fare matrix.
+    :return: fare: float - cost in USD of the leg.
+    """
+    team_index, fares = fare_matrix
+    if team1 not in team_index or team2 not in team_index:
+        raise ValueError("No fare from " + team1 + " to " + team2)
+    if fares.ndim == 3:
+        if period is None:
+            raise ValueError("No travel date for the fare from " + team1 + " to " + team2)
+        fares = fares[period]
+    fare = fares[team_index[team1]][team_index[team2]]
+    if np.isnan(fare):
+        raise ValueError("No fare from " + team1 + " to " + team2)
+    return fare
+
+
+@timed_stage("calculate_cost")
+def calculate_cost(route, cost_df, fare_matrix=None, periods=None):
+    """
+    Function that calculates the cost of the route by looking up each leg in the fare matrix
+        from build_fare_matrix. With a fare store, each leg uses the fares of the period of
+        the game traveled to.
     :param route: list - list of teams in desired order.
     :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
         the coordinates, and the cost of the path.
+    :param fare_matrix: tuple - output of build_fare_matrix, or a fare store with the fares
+        of each period. Built from cost_df if not given, pass it in when calculating many
+        routes.
+    :param periods: list - fare period of each game of the route, in route order, from
+        fare_periods on the dates of the games. Needed for a fare store.
     :return: total_cost: float - cost in USD of the route.
     """
+    if fare_matrix is None:
+        fare_matrix = build_fare_matrix(cost_df)
     total_cost = 0
-    num_teams = len(route)
-    for i in range(num_teams):
-        if i + 1 < len(route):
-            cost = cost_df.loc[
-                (cost_df["Team1"] == route[i]) & (cost_df["Team2"] == route[i + 1])
-            ].reset_index()["fare"][0]
-            total_cost += cost
+    for i in range(len(route) - 1):
+        period = None if periods is None else periods[i + 1]
+        total_cost += fare_lookup(fare_matrix, route[i], route[i + 1], period)
     return round(total_cost, 2)
 
 
+@timed_stage("sort_order")
 def sort_order(route_df, method="distance"):
     """
     Function that sorts the routes by the desired method, either distance, cost or time.
@@ -253,25 +922,9 @@ def sort_order(route_df, method="distance"):
     :return: sorted_route_df: data frame - sorted version of route_df
     """
     method = str(method).lower()
-    if method == "time":
-        sorted_route_df = route_df.sort_values(
-            by=[method, "cost", "distance"], ascending=True
-        )
-        sorted_route_df = sorted_route_df.reset_index()
-        sorted_route_df = sorted_route_df.drop(columns=["index"])
-        return sorted_route_df
-    if method == "cost":
-        sorted_route_df = route_df.sort_values(
-            by=[method, "time", "distance"], ascending=True
-        )
-        sorted_route_df = sorted_route_df.reset_index()
-        sorted_route_df = sorted_route_df.drop(columns=["index"])
-        return sorted_route_df
-    if method == "distance":
-        sorted_route_df = route_df.sort_values(
-            by=[method, "time", "cost"], ascending=True
-        )
-        sorted_route_df = sorted_route_df.reset_index()
-        sorted_route_df = sorted_route_df.drop(columns=["index"])
-        return sorted_route_df
-    raise ValueError("Invalid Sort")
+    if method not in SORT_KEYS:
+        raise ValueError("Invalid Sort")
+    sorted_route_df = route_df.sort_values(by=SORT_KEYS[method], ascending=True)
+    sorted_route_df = sorted_route_df.reset_index()
+    sorted_route_df = sorted_route_df.drop(columns=["index"])
+    return sorted_route_df
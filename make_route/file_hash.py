@@ -0,0 +1,34 @@
+"""
+This module hashes the contents of data files, so that a result built from one version of
+the files, e.g. a cached route or the cost csv, is never used for another.
+
+Functions:
+hash_data_files(data_files): Function that hashes the contents of a list of files.
+
+It requires the packages functools, hashlib and os to run.
+"""
+
+from functools import partial
+import hashlib
+import os
+
+# bytes read from a file at a time, so a large file is never held in memory whole
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def hash_data_files(data_files):
+    """
+    Function that hashes the contents of a list of files, read in blocks. The size of each
+        file is hashed before its contents, so moving bytes from one file to the next
+        changes the hash.
+    :param data_files: list - paths of the files, e.g. the schedule and cost csv files
+    :return: string - hex digest of the sha256 of the size and contents of every file,
+        in order
+    """
+    digest = hashlib.sha256()
+    for data_file in data_files:
+        with open(data_file, "rb") as file:
+            digest.update(os.fstat(file.fileno()).st_size.to_bytes(8, "little"))
+            for block in iter(partial(file.read, HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+    return digest.hexdigest()
@@ -0,0 +1,352 @@
+"""
+This module implements an anytime heuristic search for routes with too many teams for the
+exact searches, up to a tour of all 30 stadiums in one season.
+
+The search starts from the best of the quick greedy routes, then improves it with simulated
+annealing over 2-opt moves, which reverse a part of the route, and or-opt moves, which move
+one to three teams to another place in the route. Every route is checked against the game
+dates like check_valid_route, starting at the first team's earliest game and taking the
+soonest game of the next team at least one day later. Routes that get stuck are only kept
+with a penalty for each team that can not be reached, so the best route returned is always
+valid. The search stops when its number of moves runs out, and returns the best route found.
+
+With a seed, the moves come from a random generator with that seed and the clock is never
+read: the time budget is turned into a number of moves at MOVES_PER_SECOND, so the same seed
+and budget give the same route on any machine and under any load. Without a seed, the moves
+are random and the search stops when the time budget runs out.
+
+Functions:
+find_tour(teams, schedule, cost_df, method='distance', *, time_budget=5.0, seed=0,
+    max_moves=None, league_matrix=None, fare_matrix=None): Function that finds a good route
+    of games for the teams within a budget of moves or time, ordered by the desired method.
+
+It requires the packages math, random, time, pandas, dynamic_search, labels and timing to
+run.
+"""
+
+import math
+import random
+from time import perf_counter
+import pandas as pd
+from .dynamic_search import GAME_COLUMNS, ROUTE_COLUMNS
+from .labels import greedy_route, next_games, search_tables
+from .timing import timed_stage
+
+# moves of one annealing cycle, after which the search starts again from the best route
+CYCLE_MOVES = 20000
+# temperature at the start and end of a cycle, as a share of the best total
+START_TEMPERATURE = 0.02
+END_TEMPERATURE = 0.0002
+# number of moves between two checks of the time budget
+CHECK_MOVES = 256
+# moves a seeded search makes for each second of its time budget, about the rate of a tour
+# of all 30 teams on a laptop
+MOVES_PER_SECOND = 50000
+
+
+def _walk_route(route, tables):
+    """
+    Function that follows a route of team indexes through the game dates, and adds up its
+        distance and cost.
+    :param route: list - team indexes in order of visit
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :return: tuple - (days, distance, cost, missed, games) where days is the trip length,
+        missed is the number of teams with no game left when the route reached them, and
+        games holds the schedule rows of the games visited.
+    """
+    game_days, game_rows = tables[:2]
+    first_day, next_game = tables[4]
+    day = start = game_days[route[0]][0]
+    games = [game_rows[route[0]][0]]
+    distance = cost = 0.0
+    missed = 0
+    for last, team in zip(route, route[1:]):
+        distance += tables[2][last][team]
+        cost += tables[3][last][team]
+        game = next_game[team][day - first_day]
+        if game == len(game_days[team]):
+            missed += 1
+            continue
+        day = game_days[team][game]
+        games.append(game_rows[team][game])
+    return day - start + 1, distance, cost, missed, games
+
+
+def _energy(walk, method, penalty):
+    """
+    Function that gives the total of the desired method of a route, with a penalty for each
+        team that the route could not reach.
+    :param walk: tuple - output of _walk_route
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :param penalty: float - added for each team missed
+    :return: float - energy of the route for the annealing
+    """
+    total = walk[0] if method == "time" else (walk[2] if method == "cost" else walk[1])
+    return total + penalty * walk[3]
+
+
+def _walk_key(walk, route, method):
+    """
+    Function that creates the sorting key of a valid route, matching the order used by
+        sort_order, with the route itself last so ties are settled the same way every time.
+    :param walk: tuple - output of _walk_route
+    :param route: list - team indexes in order of visit
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :return: tuple - sorting key of the route
+    """
+    time = walk[0]
+    distance = round(walk[1])
+    cost = round(walk[2], 2)
+    if method == "time":
+        return time, cost, distance, tuple(route)
+    if method == "cost":
+        return cost, time, distance, tuple(route)
+    return distance, time, cost, tuple(route)
+
+
+def _random_move(route, rng):
+    """
+    Function that makes a new route from a route with a random 2-opt or or-opt move.
+    :param route: list - team indexes in order of visit
+    :param rng: random.Random - random generator of the search
+    :return: list - the new route
+    """
+    size = len(route)
+    if rng.random() < 0.5:
+        # 2-opt: reverse the teams between two positions
+        first, last = sorted(rng.sample(range(size), 2))
+        return route[:first] + route[first : last + 1][::-1] + route[last + 1 :]
+    # or-opt: move one to three teams to another position
+    length = rng.randint(1, min(3, size - 1))
+    first = rng.randrange(size - length + 1)
+    segment = route[first : first + length]
+    rest = route[:first] + route[first + length :]
+    position = rng.randrange(len(rest) + 1)
+    return rest[:position] + segment + rest[position:]
+
+
+def _start_route(tables, method):
+    """
+    Function that builds quick routes from every first team, taking either the next team with
+        the soonest game or the cheapest leg, and keeps the best one.
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :return: list - team indexes of the best quick route, in order of visit
+    """
+    game_days, _, distances, fares, _ = tables
+    legs = fares if method == "cost" else distances
+    best, best_route = None, None
+    for first in range(len(game_days)):
+        for soonest in (True, False):
+            route = greedy_route(first, game_days, legs, soonest)
+            if route is None:
+                continue
+            walk = _walk_route(route, tables)
+            if best is None or _walk_key(walk, route, method) < best:
+                best, best_route = _walk_key(walk, route, method), route
+    if best_route is None:
+        # every quick route got stuck, so start from the teams by their earliest game
+        best_route = sorted(range(len(game_days)), key=lambda team: game_days[team][0])
+    return best_route
+
+
+def _penalty(tables, method):
+    """
+    Function that gives the penalty for each team a route can not reach, so that missing a
+        team always costs more than any valid route.
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :return: float - added to the energy for each team missed
+    """
+    if method == "time":
+        return float(len(tables[4][1][0]) + 1)
+    legs = tables[3] if method == "cost" else tables[2]
+    return float(len(legs) * max(max(row) for row in legs)) + 1.0
+
+
+def _scored(route, tables, scoring):
+    """
+    Function that walks a route and gives its energy.
+    :param route: list - team indexes in order of visit
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :param scoring: tuple - (method, penalty) of _energy
+    :return: tuple - (route, output of _walk_route, energy)
+    """
+    walk = _walk_route(route, tables)
+    return route, walk, _energy(walk, *scoring)
+
+
+def _best_of(best, current, method):
+    """
+    Function that keeps the better of the best valid route and the current route.
+    :param best: tuple - (sorting key, route, walk) of the best valid route, or None
+    :param current: tuple - (route, walk, energy) of the current route
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :return: tuple - (sorting key, route, walk) of the better route, best itself if the
+        current route is not valid or not better
+    """
+    route, walk, _ = current
+    if walk[3]:
+        return best
+    key = _walk_key(walk, route, method)
+    if best is None or key < best[0]:
+        return key, route, walk
+    return best
+
+
+def _temperature(scale, moves):
+    """
+    Function that gives the temperature of the annealing, which falls from START_TEMPERATURE
+        to END_TEMPERATURE of the scale over each cycle of moves.
+    :param scale: float - energy of the first route, at least 1
+    :param moves: int - number of moves tried before this one
+    :return: float - temperature of the move
+    """
+    cycle_move = moves % CYCLE_MOVES
+    return scale * START_TEMPERATURE * (END_TEMPERATURE / START_TEMPERATURE) ** (
+        cycle_move / CYCLE_MOVES
+    )
+
+
+def _anneal_move(current, tables, scoring, rng, temperature):
+    """
+    Function that tries one random move from the current route, and accepts it if it is
+        better, or by chance if it is worse.
+    :param current: tuple - (route, walk, energy) of the current route
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :param scoring: tuple - (method, penalty) of _energy
+    :param rng: random.Random - random generator of the search
+    :param temperature: float - temperature of the annealing at this move
+    :return: tuple - (route, walk, energy) of the new route, current itself if the move is
+        not accepted
+    """
+    moved = _scored(_random_move(current[0], rng), tables, scoring)
+    change = moved[2] - current[2]
+    if change > 0 and rng.random() >= math.exp(-change / temperature):
+        return current
+    return moved
+
+
+def _anneal(route, tables, method, search, stats):
+    """
+    Function that improves a route with simulated annealing, starting each cycle of moves
+        again from the best valid route, until the moves or the time budget run out.
+    :param route: list - team indexes of the first route, in order of visit
+    :param tables: tuple - (game_days, game_rows, distances, fares, output of next_games)
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :param search: tuple - (random generator, number of moves or None, deadline as a
+        perf_counter time or None)
+    :param stats: dictionary - 'moves' and 'improvements' are updated as the search runs
+    :return: tuple - (sorting key, route, walk) of the best valid route, None if none was found
+    """
+    rng, max_moves, deadline = search
+    scoring = (method, _penalty(tables, method))
+    current = _scored(route, tables, scoring)
+    best = _best_of(None, current, method)
+    scale = max(current[2], 1.0)
+    moves = 0
+    while len(route) > 1 and (max_moves is None or moves < max_moves):
+        if deadline is not None and moves % CHECK_MOVES == 0 and perf_counter() >= deadline:
+            break
+        if moves % CYCLE_MOVES == 0 and best is not None:
+            current = _scored(best[1], tables, scoring)
+        moved = _anneal_move(current, tables, scoring, rng, _temperature(scale, moves))
+        moves += 1
+        if moved is not current:
+            current = moved
+            if _best_of(best, current, method) is not best:
+                best = _best_of(best, current, method)
+                stats["improvements"] += 1
+    stats["moves"] = moves
+    return best
+
+
+def _budget(seed, time_budget, max_moves):
+    """
+    Function that sets up the random moves of a search and when it stops. A seeded search
+        stops on its number of moves only, so it never depends on the speed of the machine.
+    :param seed: int - seed of the random moves, None for random moves
+    :param time_budget: float - seconds to search for
+    :param max_moves: int - number of moves to try, None if not given
+    :return: tuple - (random generator, number of moves or None, deadline as a perf_counter
+        time or None) for _anneal
+    """
+    if seed is None:
+        return random.Random(), max_moves, perf_counter() + time_budget
+    if max_moves is None:
+        max_moves = round(time_budget * MOVES_PER_SECOND)
+    return random.Random(seed), max_moves, None
+
+
+@timed_stage("find_tour")
+def find_tour(  # pylint: disable=too-many-arguments
+    teams,
+    schedule,
+    cost_df,
+    method="distance",
+    *,
+    time_budget=5.0,
+    seed=0,
+    max_moves=None,
+    league_matrix=None,
+    fare_matrix=None,
+):
+    """
+    Function that finds a good route of games for the teams with simulated annealing,
+        starting from the best quick greedy route. Each route starts at the first team's
+        earliest game and takes the soonest game of the next team at least one day later,
+        like check_valid_route. The route is not always the best one, but it has no limit
+        on the number of teams.
+    :param teams: list - list of teams
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc. Usually the output of reduce_schedule.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :param time_budget: float - seconds to search for, after building the quick routes.
+        With a seed and no max_moves, it gives time_budget * MOVES_PER_SECOND moves.
+    :param seed: int - seed of the random moves. With a seed, the search stops on its
+        number of moves only, so the same seed, time budget and max_moves always give the
+        same route. None for random moves that stop when the time budget runs out.
+    :param max_moves: int - number of moves to try. Without a seed, the time budget may
+        stop the search first.
+    :param league_matrix: tuple - output of build_league_matrix. Built from the schedule if
+        not given.
+    :param fare_matrix: tuple - output of build_fare_matrix. Built from cost_df if not given.
+    :return:
+        best_route: data frame - one row with the route, the games on the schedule,
+            the total trip length, distance, and cost. Empty if no valid route was found.
+        stats: dictionary - 'moves' is the number of moves tried, 'improvements' is the
+            number of times a better valid route was found, 'seconds' is the search time.
+    """
+    method = str(method).lower()
+    if method not in ("time", "distance", "cost"):
+        raise ValueError("Invalid Sort")
+    if time_budget < 0:
+        raise ValueError("Time budget can not be negative")
+    start_time = perf_counter()
+    stats = {"moves": 0, "improvements": 0, "seconds": 0.0}
+    tables = search_tables(teams, schedule, cost_df, league_matrix, fare_matrix)
+    if tables is None:
+        return pd.DataFrame(columns=ROUTE_COLUMNS), stats
+    tables += (next_games(tables[0]),)
+
+    route = _start_route(tables, method)
+    best = _anneal(route, tables, method, _budget(seed, time_budget, max_moves), stats)
+    stats["seconds"] = perf_counter() - start_time
+
+    if best is None:
+        return pd.DataFrame(columns=ROUTE_COLUMNS), stats
+    _, route, walk = best
+    return (
+        pd.DataFrame(
+            {
+                "route": [[teams[team] for team in route]],
+                "games": [schedule.iloc[walk[4]][GAME_COLUMNS].reset_index(drop=True)],
+                "time": [walk[0]],
+                "distance": [round(walk[1])],
+                "cost": [round(walk[2], 2)],
+            }
+        ),
+        stats,
+    )
@@ -0,0 +1,222 @@
+"""
+This module keeps the state of the dynamic programming search for one date window, so that
+the routes of a new set of teams can be found from the work done for the sets before it.
+
+The search holds the game days of every team in the window, indexed by team name in sorted
+order, and a table of the labels of every set of teams it has searched. The labels of a set
+only depend on the teams in it, so they stay valid for any later set of teams. Adding a team
+to a set that was searched only searches the sets that contain the new team, and removing a
+team searches nothing. A set with no searched subsets is searched in full.
+
+Only dominated labels are dropped, like find_pareto_front, so one search gives the best route
+for every sort method.
+
+The table holds only tuples of numbers, so it can be saved on its own and passed to a new
+search of the same window. With max_sets, the sets used least recently are dropped from the
+table once it holds more, except the subsets of the set just searched. The sets of a table
+saved by another search of the window can be merged in.
+
+Class:
+IncrementalSearch(schedule, cost_df, start_date, end_date, *, league_matrix=None,
+    fare_matrix=None, table=None, max_sets=None): Search state of a date window that is
+    reused across sets of teams.
+
+It requires the packages itertools, numpy, exhaustive_search, dynamic_search, labels and
+timing to run.
+"""
+
+from itertools import combinations
+import numpy as np
+from .exhaustive_search import (
+    build_league_matrix,
+    build_fare_matrix,
+    build_schedule_index,
+    pareto_routes,
+    pick_route,
+)
+from .dynamic_search import subset_states
+from .labels import fare_legs, next_games, team_games
+from .timing import count_routes, report_progress, timed_stage
+
+# the search keeps every label that is not dominated, with no bound for one sort method
+NO_BOUND = ("time", float("inf"), None, float("inf"), None)
+
+
+class IncrementalSearch:
+    """
+    Search state of a date window that is reused across sets of teams. The routes start at
+        the first team's earliest game in the window, like check_valid_route.
+    Attributes:
+        teams: list - every team with a home game in the schedule, in sorted order. Team
+            indexes in the table are positions in this list.
+        schedule: pandas data frame - the games of the schedule in the date window.
+        table: dictionary - labels of every set of teams searched, with the bit mask of the
+            set as the key, and the labels of each last team as the value, in the order the
+            sets were last used.
+        max_sets: int - most sets of teams kept in the table, None for no limit.
+        stats: dictionary - 'searched' is the number of sets of teams searched, 'reused' is
+            the number of sets found in the table, over every call.
+    Functions:
+        pareto_front(teams) - returns every route of the teams that is not dominated
+        best_route(teams, method='distance', weights=None) - returns the best route of the
+            teams for a sort method
+        merge(table) - adds the sets of another table of the same window
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        schedule,
+        cost_df,
+        start_date,
+        end_date,
+        *,
+        league_matrix=None,
+        fare_matrix=None,
+        table=None,
+        max_sets=None,
+    ):
+        """
+        :param schedule: pandas data frame - contains every game for the MLB season
+            with teams, location, etc.
+        :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums
+            with the coordinates, and the cost of the path.
+        :param start_date: datetime - earliest date of the trip
+        :param end_date: datetime - latest date of the trip
+        :param league_matrix: tuple - output of build_league_matrix. Built from the schedule
+            if not given.
+        :param fare_matrix: tuple - output of build_fare_matrix. Built from cost_df if not
+            given.
+        :param table: dictionary - table of an earlier search of the same schedule, cost data
+            and dates, to start from. Empty if not given.
+        :param max_sets: int - most sets of teams kept in the table, None for no limit.
+        """
+        if league_matrix is None:
+            league_matrix = build_league_matrix(schedule)
+        if fare_matrix is None:
+            fare_matrix = build_fare_matrix(cost_df)
+        self.teams = sorted(schedule["home team"].unique())
+        self.schedule = schedule.loc[
+            (schedule["date"] >= start_date) & (schedule["date"] <= end_date)
+        ]
+        game_days, game_rows = team_games(self.teams, build_schedule_index(self.schedule))
+        codes = [league_matrix[0][team] for team in self.teams]
+        self._tables = (
+            game_days,
+            game_rows,
+            league_matrix[1][np.ix_(codes, codes)].tolist(),
+            fare_legs(self.teams, fare_matrix),
+            next_games(game_days) if any(game_days) else None,
+        )
+        self.table = {} if table is None else dict(table)
+        self.max_sets = max_sets
+        self.stats = {"searched": 0, "reused": 0}
+
+    def _search(self, members):
+        """
+        Searches every subset of the teams that is not in the table yet, smallest first.
+        :param members: list - team indexes of the set, in sorted order
+        """
+        game_days, game_rows = self._tables[0], self._tables[1]
+        for team in members:
+            if 1 << team not in self.table:
+                day, row = game_days[team][0], game_rows[team][0]
+                self.table[1 << team] = {team: [(day, day, 0, 0, (team,), (row,))]}
+        progress = [0, (1 << len(members)) - 1 - len(members)]
+        for size in range(2, len(members) + 1):
+            self._expand_layer(members, size, progress)
+        if self.max_sets is not None:
+            self._trim(sum(1 << team for team in members))
+
+    def _trim(self, mask):
+        """
+        Drops the sets of teams used least recently until the table holds at most max_sets,
+            keeping every subset of the set of teams just searched.
+        :param mask: int - bit mask of the set of teams just searched
+        """
+        extra = len(self.table) - self.max_sets
+        if extra <= 0:
+            return
+        for old in [old for old in self.table if old | mask != mask][:extra]:
+            del self.table[old]
+
+    @timed_stage("expand_layer")
+    def _expand_layer(self, members, size, progress):
+        """
+        Searches every subset of the teams of one size that is not in the table yet.
+        :param members: list - team indexes of the set, in sorted order
+        :param size: int - number of teams in the subsets of the layer
+        :param progress: list - [subsets done, total subsets], updated as the layer is searched
+        """
+        for subset in combinations(members, size):
+            mask = sum(1 << team for team in subset)
+            progress[0] += 1
+            if mask in self.table:
+                # moved to the end, so the table stays in the order the sets were last used
+                self.table[mask] = self.table.pop(mask)
+                self.stats["reused"] += 1
+            else:
+                # no remaining teams, so the labels stay valid for every larger set
+                self.table[mask] = subset_states(
+                    self.table, subset, self._tables, NO_BOUND, remaining=[]
+                )
+                self.stats["searched"] += 1
+            report_progress(*progress)
+
+    @timed_stage("incremental_search")
+    def pareto_front(self, teams):
+        """
+        Finds every route of the teams that is not dominated in time, distance and cost,
+            searching only the sets of teams that are not in the table yet.
+        :param teams: list - list of teams
+        :return: front: list of tuples - (route, total days, distance, cost) of the routes
+            that are not dominated, in the order of find_all_routes on the sorted teams.
+            Empty if a team has no home game in the window.
+        """
+        index = {team: position for position, team in enumerate(self.teams)}
+        if any(team not in index or not self._tables[0][index[team]] for team in teams):
+            return []
+        members = sorted(index[team] for team in set(teams))
+        self._search(members)
+        finished = self.table[sum(1 << team for team in members)]
+        finished = sorted(
+            (label for labels in finished.values() for label in labels),
+            key=lambda label: label[4],
+        )
+        count_routes("routes_valid", len(finished))
+        return pareto_routes(
+            (
+                [self.teams[team] for team in label[4]],
+                label[0] - label[1] + 1,
+                round(label[3]),
+                round(label[2], 2),
+            )
+            for label in finished
+        )
+
+    def merge(self, table):
+        """
+        Adds the sets of teams of another table of the same window that are not in this one,
+            e.g. the sets another process saved while this search ran. They count as used
+            before every set of this table, so they are dropped first past max_sets.
+        :param table: dictionary - table of another search of the same schedule, cost data
+            and dates
+        """
+        merged = {mask: labels for mask, labels in table.items() if mask not in self.table}
+        merged.update(self.table)
+        self.table = merged
+        if self.max_sets is not None:
+            self._trim(0)
+
+    def best_route(self, teams, method="distance", weights=None):
+        """
+        Finds the best route of the teams for a sort method, from the Pareto front.
+        :param teams: list - list of teams
+        :param method: string - method of sorting. Should be either time, distance, or cost.
+        :param weights: dictionary - weight of each metric, see pick_route
+        :return: best_route: data frame - one row with the route, the games on the schedule,
+            the total trip length, distance, and cost. Empty if no route is valid.
+        """
+        front = self.pareto_front(teams)
+        return pick_route(
+            front, self.schedule.loc[self.schedule["home team"].isin(teams)], method, weights
+        )
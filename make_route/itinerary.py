@@ -0,0 +1,241 @@
+"""
+This module holds the integer coded form of routes used inside the exhaustive searches.
+
+Teams are coded by their position in the league matrix, in alphabetical order, so a code fits
+in an int8 and a route is a small tuple of codes. The distances and fares of the teams are
+kept as lists indexed by code, so a leg is a couple of integer lookups with no string
+hashing. The next games are read from single cells of the transition table as it is given,
+so a memory mapped table is not copied. A valid route becomes an Itinerary, with the schedule
+rows of its games as an array. Team names and data frames are only built again at the public
+functions of exhaustive_search.
+
+Classes:
+TeamCodes(league_matrix, fare_matrix, transition_table, periods=None): Codes of every team of
+    the league matrix, with the tables of their legs and next games.
+Itinerary(route, games, time, distance, cost): One valid route as team codes and the schedule
+    rows of its games.
+
+It requires the packages math, typing and numpy to run.
+"""
+
+import math
+from typing import NamedTuple
+import numpy as np
+
+# team codes are stored as int8, so a league can have at most this many teams
+MAX_TEAM_CODES = 127
+
+
+class Itinerary(NamedTuple):
+    """
+    One valid route as team codes and the schedule rows of its games. A named tuple has
+        empty __slots__, so an itinerary holds only its five fields and no dictionary.
+    Attributes:
+        route: tuple - team codes in order of visit
+        games: numpy array - int32 row positions in the schedule of the games, in route order
+        time: int - number of days of the trip
+        distance: int - distance in miles of the route
+        cost: float - cost in USD of the route
+    """
+
+    route: tuple
+    games: np.ndarray
+    time: int
+    distance: int
+    cost: float
+
+
+def _team_fares(teams, fare_matrix):
+    """
+    Function that takes the fares between the teams out of a fare matrix or fare store.
+    :param teams: list - team names, indexed by code
+    :param fare_matrix: tuple - output of build_fare_matrix, or a fare store with the fares
+        of each period
+    :return: list of lists - fare from the row team to the column team, nan if missing. One
+        list of lists for each period with a fare store.
+    """
+    fare_index, fares = fare_matrix
+    known = [code for code, team in enumerate(teams) if team in fare_index]
+    fare_codes = np.array([fare_index[teams[code]] for code in known], dtype=int)
+    known = np.array(known, dtype=int)
+    team_fares = np.full(fares.shape[:-2] + (len(teams),) * 2, np.nan)
+    team_fares[..., known[:, np.newaxis], known] = fares[
+        ..., fare_codes[:, np.newaxis], fare_codes
+    ]
+    return team_fares.tolist()
+
+
+class TeamCodes:
+    """
+    Codes of every team of the league matrix, with the tables of their legs and next games.
+        Teams without a fare or without a home game in the transition table keep a code, and
+        only fail when a route uses the missing fare or game. The arrays of the transition
+        table are used as they are given, so a memory mapped table is only read at the rows
+        that a route goes through.
+    Attributes:
+        teams: list - team names, indexed by code
+        codes: dictionary - code of each team, with teams as the key
+        distances: list of lists - distance from the row team to the column team
+        fares: list of lists - fare from the row team to the column team, nan if missing. One
+            list of lists for each period with a fare store.
+        columns: list - column of each team in the transition table, -1 if the team has no
+            home game
+        transition: tuple - (first_games, next_games, days) of the transition table
+        periods: numpy array - fare period of each row of the schedule, None with a fare matrix
+    Functions:
+        encode(route) - returns the codes of a route of team names
+        encode_routes(routes) - returns the codes of routes of the same length as an array
+        decode(route) - returns the team names of a route of codes
+        first_game(team) - returns the row of a team's earliest game
+        scheduled(route) - returns whether every team of a route has a home game
+        next_game(game, team) - returns the row of a team's next game after a game
+        trip_days(games) - returns the number of days of a route of games
+        fare(last, team, game) - returns the fare of one leg
+        walk(route) - returns the Itinerary of a route of codes, None if it is not valid
+    """
+
+    __slots__ = ("teams", "codes", "distances", "fares", "columns", "transition", "periods")
+
+    def __init__(self, league_matrix, fare_matrix, transition_table, periods=None):
+        """
+        :param league_matrix: tuple - output of build_league_matrix
+        :param fare_matrix: tuple - output of build_fare_matrix, or a fare store with the
+            fares of each period
+        :param transition_table: tuple - output of build_transition_table
+        :param periods: numpy array - fare period of each row of the schedule, from
+            fare_periods. Needed with a fare store.
+        """
+        team_index, distance_matrix = league_matrix
+        if len(team_index) > MAX_TEAM_CODES:
+            raise ValueError("Too many teams to code")
+        dated = fare_matrix[1].ndim == 3
+        if dated and periods is None:
+            raise ValueError("No travel dates for the fare store")
+        self.teams = sorted(team_index, key=team_index.get)
+        self.codes = {team: code for code, team in enumerate(self.teams)}
+        order = [team_index[team] for team in self.teams]
+        self.distances = distance_matrix[np.ix_(order, order)].tolist()
+        self.fares = _team_fares(self.teams, fare_matrix)
+        table_codes = transition_table[0]
+        self.columns = [int(table_codes.get(team, -1)) for team in self.teams]
+        self.transition = transition_table[1:]
+        self.periods = np.asarray(periods) if dated else None
+
+    def encode(self, route):
+        """
+        Function that codes a route of team names.
+        :param route: list - list of teams in desired order.
+        :return: tuple - team codes in order of visit
+        """
+        codes = self.codes
+        for team in route:
+            if team not in codes:
+                raise ValueError(team + " do not have a location in the schedule")
+        return tuple(codes[team] for team in route)
+
+    def encode_routes(self, routes):
+        """
+        Function that codes routes of the same length into one compact array.
+        :param routes: list - routes, route is a list of teams in desired order.
+        :return: numpy array - int8 team codes with one row for each route
+        """
+        coded = np.array([self.encode(route) for route in routes], dtype=np.int8)
+        return coded.reshape(len(routes), -1)
+
+    def decode(self, route):
+        """
+        Function that gives the team names of a route of codes.
+        :param route: tuple - team codes in order of visit
+        :return: list - list of teams in order of visit
+        """
+        return [self.teams[code] for code in route]
+
+    def first_game(self, team):
+        """
+        Function that looks up the earliest game of a team.
+        :param team: int - code of the team
+        :return: int - row of the team's earliest game, -1 if it has no home game
+        """
+        column = self.columns[team]
+        return -1 if column < 0 else int(self.transition[0][column])
+
+    def scheduled(self, route):
+        """
+        Function that checks every team of a route has a home game in the transition table,
+            once for the route, so that next_game needs no check for each leg.
+        :param route: tuple - team codes
+        :return: bool - true if every team has a column in the transition table
+        """
+        columns = self.columns
+        return all(columns[team] >= 0 for team in route)
+
+    def next_game(self, game, team):
+        """
+        Function that reads the next game of a team after a game from one cell of the
+            transition table.
+        :param game: int - row of the game
+        :param team: int - code of a team with a home game, see scheduled
+        :return: int - row of the team's next game at least one day later, -1 if there is
+            none
+        """
+        return int(self.transition[1][game, self.columns[team]])
+
+    def trip_days(self, games):
+        """
+        Function that counts the days of a route from its first to its last game.
+        :param games: list - rows of the games of the route, in route order
+        :return: int - number of days of the trip
+        """
+        days = self.transition[2]
+        return int(days[games[-1]] - days[games[0]]) + 1
+
+    def fare(self, last, team, game):
+        """
+        Function that looks up the fare of one leg.
+        :param last: int - code of the team traveled from
+        :param team: int - code of the team traveled to
+        :param game: int - row of the game traveled to, used with a fare store
+        :return: float - cost in USD of the leg
+        """
+        if self.periods is None:
+            fare = self.fares[last][team]
+        else:
+            fare = self.fares[self.periods[game]][last][team]
+        if math.isnan(fare):
+            raise ValueError("No fare from " + self.teams[last] + " to " + self.teams[team])
+        return fare
+
+    def walk(self, route):
+        """
+        Function that follows a route of codes through the games, using the soonest game of
+            the next team at least one day after the last game, and adds up its distance and
+            cost, like check_valid_route, calculate_distance and calculate_cost.
+        :param route: tuple - team codes in order of visit
+        :return: Itinerary of the route, None if the route is not valid
+        """
+        distance = 0.0
+        for last, team in zip(route, route[1:]):
+            distance += self.distances[last][team]
+        cost = 0.0
+        if self.periods is None:
+            # every leg is priced, as calculate_cost does for routes that are not valid
+            for last, team in zip(route, route[1:]):
+                cost += self.fare(last, team, None)
+        if not self.scheduled(route):
+            return None
+        game = self.first_game(route[0])
+        games = [game]
+        for last, team in zip(route, route[1:]):
+            game = self.next_game(game, team)
+            if game < 0:
+                return None
+            games.append(game)
+            if self.periods is not None:
+                cost += self.fare(last, team, game)
+        return Itinerary(
+            route,
+            np.array(games, dtype=np.int32),
+            self.trip_days(games),
+            round(np.float64(distance)),
+            round(np.float64(cost), 2),
+        )
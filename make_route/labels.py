@@ -0,0 +1,168 @@
+"""
+This module holds the tables and labels shared by the searches that build routes one team at
+a time: the dynamic programming, branch and bound, heuristic, incremental and batch searches.
+
+Teams are indexed by their position in the list of teams of the search. A label is a partial
+or complete route as a tuple of (last game day, first game day, cost, distance, route,
+games), where route holds team indexes in order of visit and games holds the schedule rows
+of their games.
+
+Functions:
+team_games(teams, schedule_index): Function that collects the game days and schedule rows
+    of every team's home games.
+fare_legs(teams, fare_matrix): Function that takes the fares between the given teams out of
+    the fare matrix.
+route_key(label, method): Function that creates the sorting key of a complete route.
+greedy_route(first, game_days, legs, soonest, day=None): Function that builds a quick route
+    from the first team, taking the soonest game or the cheapest leg each time.
+next_games(game_days): Function that creates a table of the next home game of every team
+    after every day.
+search_tables(teams, schedule, cost_df, league_matrix=None, fare_matrix=None): Function that
+    builds the game days, game rows, distances and fares of the teams of a search.
+
+It requires the packages bisect, itertools, numpy and exhaustive_search to run.
+"""
+
+from bisect import bisect_right
+from itertools import permutations
+import numpy as np
+from .exhaustive_search import (
+    build_fare_matrix,
+    build_league_matrix,
+    build_schedule_index,
+    fare_lookup,
+)
+
+
+def team_games(teams, schedule_index):
+    """
+    Function that collects the game days and schedule rows of every team's home games,
+        sorted by date, from the schedule index.
+    :param teams: list - list of teams
+    :param schedule_index: dictionary - output of build_schedule_index, or the same for a
+        date window of it.
+    :return:
+        game_days: list - for each team, a sorted list of game days as integers.
+        game_rows: list - for each team, the schedule rows matching game_days.
+    """
+    game_days = []
+    game_rows = []
+    for team in teams:
+        days, rows = schedule_index.get(team, (np.empty(0), np.empty(0)))
+        game_days.append(days.tolist())
+        game_rows.append(rows.tolist())
+    return game_days, game_rows
+
+
+def fare_legs(teams, fare_matrix):
+    """
+    Function that takes the fares between the given teams out of the fare matrix. The
+        searches that build routes one team at a time bound their costs with fares that do
+        not depend on the date, so a fare store with the fares of each period is refused.
+    :param teams: list - list of teams
+    :param fare_matrix: tuple - output of build_fare_matrix.
+    :return: fares - list of lists - fare from the row team to the column team.
+    """
+    if fare_matrix[1].ndim == 3:
+        raise ValueError("The label searches need one fare per pair of teams, not a fare store")
+    fares = [[0.0] * len(teams) for _ in teams]
+    for (row, team1), (column, team2) in permutations(enumerate(teams), 2):
+        fares[row][column] = fare_lookup(fare_matrix, team1, team2)
+    return fares
+
+
+def route_key(label, method):
+    """
+    Function that creates the sorting key of a complete route, matching the order used by
+        sort_order and the permutation order of find_all_routes for ties. Routes that only
+        differ in their start day go to the earliest start.
+    :param label: tuple - (day, start, cost, distance, route, games)
+    :param method: string - method of sorting. Should be either time, distance, or cost.
+    :return: tuple - sorting key of the route
+    """
+    time = label[0] - label[1] + 1
+    distance = round(label[3])
+    cost = round(label[2], 2)
+    if method == "time":
+        return time, cost, distance, label[4], label[1]
+    if method == "cost":
+        return cost, time, distance, label[4], label[1]
+    return distance, time, cost, label[4], label[1]
+
+
+def greedy_route(first, game_days, legs, soonest, day=None):
+    """
+    Function that builds a quick route from the first team by always taking the next team
+        with the soonest game, or with the cheapest leg.
+    :param first: int - index of the first team
+    :param game_days: list - for each team, a sorted list of game days as integers.
+    :param legs: list of lists - distance or fare from the row team to the column team.
+    :param soonest: boolean - true to take the soonest game, false for the cheapest leg
+    :param day: int - game day of the first team to start on, its earliest game if not given
+    :return: route: list - team indexes in order of visit, None if the route got stuck.
+    """
+    route = [first]
+    day = game_days[first][0] if day is None else day
+    remaining = set(range(len(game_days))) - {first}
+    while remaining:
+        options = []
+        for team in remaining:
+            game = bisect_right(game_days[team], day)
+            if game < len(game_days[team]):
+                next_day = game_days[team][game]
+                options.append((next_day if soonest else 0, legs[route[-1]][team], team))
+        if not options:
+            return None
+        team = min(options)[2]
+        day = game_days[team][bisect_right(game_days[team], day)]
+        route.append(team)
+        remaining.discard(team)
+    return route
+
+
+def next_games(game_days):
+    """
+    Function that creates a table of the next home game of every team after every day, so
+        the search looks up the next game instead of searching the game days.
+    :param game_days: list - for each team, a sorted list of game days as integers. At least
+        one team has to have a game.
+    :return: tuple - (first day, next game), where next game holds a list for each team, with
+        the position in game_days of the first game after the first day plus the list
+        position, or the number of games if there is none.
+    """
+    first_day = min(days[0] for days in game_days if days)
+    last_day = max(days[-1] for days in game_days if days)
+    next_game = [
+        np.searchsorted(days, np.arange(first_day, last_day + 1), side="right").tolist()
+        for days in game_days
+    ]
+    return first_day, next_game
+
+
+def search_tables(teams, schedule, cost_df, league_matrix=None, fare_matrix=None):
+    """
+    Function that builds the tables a search over the teams starts from: the game days and
+        schedule rows of every team's home games, and the distances and fares between the
+        teams.
+    :param teams: list - list of teams
+    :param schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc. Usually the output of reduce_schedule.
+    :param cost_df: pandas data frame - 900 rows - all edges between two team stadiums with
+        the coordinates, and the cost of the path.
+    :param league_matrix: tuple - output of build_league_matrix. Built from the schedule if
+        not given.
+    :param fare_matrix: tuple - output of build_fare_matrix. Built from cost_df if not given.
+    :return: tables: tuple - (game_days, game_rows, distances, fares), where distances and
+        fares are lists of lists from the row team to the column team. None if a team has
+        no home game in the schedule.
+    """
+    game_days, game_rows = team_games(teams, build_schedule_index(schedule))
+    if not all(game_days):
+        return None
+    if league_matrix is None:
+        league_matrix = build_league_matrix(schedule)
+    if fare_matrix is None:
+        fare_matrix = build_fare_matrix(cost_df)
+    codes = [league_matrix[0][team] for team in teams]
+    distances = league_matrix[1][np.ix_(codes, codes)].tolist()
+    return game_days, game_rows, distances, fare_legs(teams, fare_matrix)
@@ -0,0 +1,270 @@
+"""
+This module converts the MLB schedule csv into a compact bundle of numpy arrays, and loads
+the schedule from that bundle, so that the app does not parse the date strings of the csv
+every time it starts.
+
+The bundle is a folder of .npy files that are memory mapped when loaded:
+    day.npy - int16, day of the game, counted from season_start
+    season_start.npy - datetime64[D], date of the first game of the season
+    home.npy, away.npy - int8, codes of the home and away teams
+    minutes.npy - int16, start time of the game in minutes after midnight, -1 if TBD
+    teams.npy - team names, indexed by team code
+    latitude.npy, longitude.npy - float64, stadium coordinates, indexed by team code
+    source.npy - sha256 of the csv the bundle was built from
+
+The bundle is not kept in git. load_schedule builds it from the csv the first time, and
+builds it again when the sha256 of the csv no longer matches, so an edited csv is never
+shadowed by an old bundle. The arrays are written to a temporary folder that is then
+swapped in with os.replace, so a worker starting at the same time never maps a half written
+bundle, and a bundle that can not be read is treated as stale. Loading the full season
+from the bundle, hash check included, takes about half the time of parsing the csv.
+
+Functions:
+read_schedule_csv(csv_path=SCHEDULE_CSV): Function that reads the schedule csv and parses
+    the dates with their known format.
+build_schedule_store(csv_path=SCHEDULE_CSV, store_path=SCHEDULE_STORE): Function that
+    converts the schedule csv into the bundle of arrays.
+load_schedule(csv_path=SCHEDULE_CSV, store_path=SCHEDULE_STORE, start_date=None,
+    end_date=None): Function that loads the schedule from the bundle, building it first if
+    it is missing or older than the csv.
+schedule_files(csv_path=SCHEDULE_CSV, store_path=SCHEDULE_STORE): Function that lists the
+    files load_schedule reads.
+
+Run using 'python -m make_route.schedule_store' from the root repo to rebuild the bundle.
+
+It requires the packages os, shutil, tempfile, numpy, pandas, and file_hash to run.
+"""
+
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from .file_hash import hash_data_files
+
+SCHEDULE_CSV = "data/final_mlb_schedule.csv"
+SCHEDULE_STORE = "data/schedule_store"
+DATE_FORMAT = " %B %d,  %Y"
+STORE_FILES = [
+    "day",
+    "season_start",
+    "home",
+    "away",
+    "minutes",
+    "teams",
+    "latitude",
+    "longitude",
+    "source",
+]
+NO_TIME = -1
+
+
+def read_schedule_csv(csv_path=SCHEDULE_CSV):
+    """
+    Function that reads the schedule csv and parses the dates with their known format,
+        which is much faster than letting pandas infer the format.
+    :param csv_path: string - path of the schedule csv
+    :return: schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc. The date column is a datetime.
+    """
+    schedule = pd.read_csv(csv_path)
+    schedule["date"] = pd.to_datetime(schedule["date"], format=DATE_FORMAT)
+    return schedule
+
+
+def _time_to_minutes(game_time):
+    """
+    Function that converts a game time like '7:10 pm' to minutes after midnight.
+    :param game_time: string - time of the game, or 'TBD'
+    :return: int - minutes after midnight, NO_TIME if the time is not known
+    """
+    if game_time == "TBD":
+        return NO_TIME
+    clock, half = game_time.split()
+    hour, minute = clock.split(":")
+    hour = int(hour) % 12 + (12 if half == "pm" else 0)
+    return hour * 60 + int(minute)
+
+
+def _csv_hash(csv_path):
+    """
+    Function that hashes the schedule csv, to tell if a bundle was built from it.
+    :param csv_path: string - path of the schedule csv
+    :return: string - sha256 of the csv as hex
+    """
+    return hash_data_files([csv_path])
+
+
+def _minutes_to_time(minutes):
+    """
+    Function that converts minutes after midnight back to a game time like '7:10 pm'.
+    :param minutes: int - minutes after midnight, NO_TIME if the time is not known
+    :return: string - time of the game, or 'TBD'
+    """
+    if minutes == NO_TIME:
+        return "TBD"
+    hour, minute = divmod(int(minutes), 60)
+    half = "pm" if hour >= 12 else "am"
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {half}"
+
+
+def _season_day(game_date, season_start):
+    """
+    Function that converts a date to the day of the season used in the bundle.
+    :param game_date: datetime or string - date to convert
+    :param season_start: numpy datetime64 - date of the first game of the season
+    :return: int - days since season_start
+    """
+    return int((np.datetime64(pd.Timestamp(game_date), "D") - season_start).astype(int))
+
+
+def _swap_folder(building, store_path):
+    """
+    Function that moves a finished bundle to store_path. A folder can only be renamed over
+        a missing one, so the old bundle is renamed aside first and removed after. Workers
+        that mapped the old arrays keep reading them until they close.
+    :param building: string - folder holding the finished bundle
+    :param store_path: string - folder the bundle is loaded from
+    """
+    old = f"{store_path}.{os.getpid()}.old"
+    try:
+        os.replace(store_path, old)
+    except FileNotFoundError:
+        old = None
+    os.replace(building, store_path)
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def build_schedule_store(csv_path=SCHEDULE_CSV, store_path=SCHEDULE_STORE):
+    """
+    Function that converts the schedule csv into a folder of compact numpy arrays. The
+        arrays are written to a temporary folder next to store_path, which then replaces it.
+    :param csv_path: string - path of the schedule csv
+    :param store_path: string - folder to write the arrays to, created if missing
+    """
+    schedule = read_schedule_csv(csv_path)
+    stadiums = schedule.drop_duplicates(subset=["home team"]).set_index("home team")
+    if len(schedule.drop_duplicates(subset=["home team", "Latitude", "Longitude"])) != len(
+        stadiums
+    ):
+        raise ValueError("Every home team needs one stadium location")
+    teams = np.array(sorted(set(schedule["home team"]) | set(schedule["away team"])))
+    team_index = {team: code for code, team in enumerate(teams)}
+    dates = schedule["date"].to_numpy().astype("datetime64[D]")
+    season_start = dates.min()
+    arrays = {
+        "day": (dates - season_start).astype(np.int16),
+        "season_start": np.array(season_start),
+        "home": schedule["home team"].map(team_index).to_numpy().astype(np.int8),
+        "away": schedule["away team"].map(team_index).to_numpy().astype(np.int8),
+        "minutes": np.array(
+            [_time_to_minutes(game_time) for game_time in schedule["time"]],
+            dtype=np.int16,
+        ),
+        "teams": teams,
+        "latitude": stadiums["Latitude"].reindex(teams).to_numpy(),
+        "longitude": stadiums["Longitude"].reindex(teams).to_numpy(),
+        "source": np.array(_csv_hash(csv_path)),
+    }
+    parent = os.path.dirname(os.path.abspath(store_path))
+    os.makedirs(parent, exist_ok=True)
+    building = tempfile.mkdtemp(prefix=".schedule_store-", dir=parent)
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(building, name + ".npy"), array)
+        _swap_folder(building, store_path)
+    finally:
+        # only left behind if the swap failed
+        shutil.rmtree(building, ignore_errors=True)
+
+
+def _load_store(csv_path, store_path):
+    """
+    Function that memory maps the arrays of the bundle if it was built from the csv.
+    :param csv_path: string - path of the schedule csv
+    :param store_path: string - folder of the bundle from build_schedule_store
+    :return: dictionary - array of each file in STORE_FILES, None if the bundle is
+        missing, was built from another csv or can not be read
+    """
+    paths = {name: os.path.join(store_path, name + ".npy") for name in STORE_FILES}
+    try:
+        if str(np.load(paths["source"])) != _csv_hash(csv_path):
+            return None
+        return {name: np.load(path, mmap_mode="r") for name, path in paths.items()}
+    except (OSError, ValueError, EOFError):
+        # a missing file, or a truncated one left by a build that was cut off
+        return None
+
+
+def load_schedule(
+    csv_path=SCHEDULE_CSV, store_path=SCHEDULE_STORE, start_date=None, end_date=None
+):
+    """
+    Function that loads the schedule from the bundle of arrays, memory mapped. The bundle
+        is built from the csv first if it is missing, can not be read or was built from
+        another csv, and the csv is read instead if the bundle can not be written. The dates
+        can be filtered on the day codes before the data frame is built.
+    :param csv_path: string - path of the schedule csv
+    :param store_path: string - folder of the bundle from build_schedule_store
+    :param start_date: datetime - earliest date to keep, keeps every game if not given
+    :param end_date: datetime - latest date to keep, keeps every game if not given
+    :return: schedule: pandas data frame - contains every game for the MLB season
+        with teams, location, etc. Same columns as the csv, the date column is a datetime.
+    """
+    arrays = _load_store(csv_path, store_path)
+    if arrays is None:
+        try:
+            build_schedule_store(csv_path, store_path)
+        except OSError:
+            # the folder can not be written, or another worker swapped in its bundle first
+            pass
+        arrays = _load_store(csv_path, store_path)
+    if arrays is None:
+        schedule = read_schedule_csv(csv_path)
+        if start_date is not None:
+            schedule = schedule.loc[schedule["date"] >= start_date]
+        if end_date is not None:
+            schedule = schedule.loc[schedule["date"] <= end_date]
+        return schedule.reset_index(drop=True)
+    season_start = arrays["season_start"][()]
+    day = arrays["day"]
+    keep = np.ones(len(day), dtype=bool)
+    if start_date is not None:
+        keep &= day >= _season_day(start_date, season_start)
+    if end_date is not None:
+        keep &= day <= _season_day(end_date, season_start)
+    home = arrays["home"][keep]
+    teams = arrays["teams"]
+    # a season has few distinct start times, so each one is formatted once
+    times, time_codes = np.unique(arrays["minutes"][keep], return_inverse=True)
+    times = np.array([_minutes_to_time(minutes) for minutes in times], dtype=object)
+    return pd.DataFrame(
+        {
+            "date": (season_start + day[keep].astype("timedelta64[D]")).astype(
+                "datetime64[ns]"
+            ),
+            "time": times[time_codes],
+            "away team": teams[arrays["away"][keep]],
+            "home team": teams[home],
+            "Latitude": arrays["latitude"][home],
+            "Longitude": arrays["longitude"][home],
+        }
+    )
+
+
+def schedule_files(csv_path=SCHEDULE_CSV, store_path=SCHEDULE_STORE):
+    """
+    Function that lists the files load_schedule reads, so that a cache of routes can be
+        keyed by them. The csv is always read for its hash, and the bundle files are read
+        when they exist.
+    :param csv_path: string - path of the schedule csv
+    :param store_path: string - folder of the bundle from build_schedule_store
+    :return: list - paths of the csv and of every bundle file that exists
+    """
+    paths = [os.path.join(store_path, name + ".npy") for name in STORE_FILES]
+    return [csv_path] + [path for path in paths if os.path.exists(path)]
+
+
+if __name__ == "__main__":
+    build_schedule_store()
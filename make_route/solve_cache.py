@@ -0,0 +1,259 @@
+"""
+This module implements a cache of solved routes, so that every caller asking for the same
+query, e.g. each worker and background process of the app, shares one solve.
+
+The cache keeps the best routes in a SQLite file, so that every worker of the app and every
+restart shares them. A query is normalized to the sorted set of teams, the start and end
+dates and the sort method, and keyed together with a hash of the schedule and cost data files
+and the version of the solvers, so routes of old data or old code are never returned. Routes
+are stored as JSON, with the games as lists of columns. The hits and misses of every process
+are counted in the file as well, so they can be seen for the whole app.
+
+Class:
+DiskRouteCache(solve, cache_path, data_files=(), maxsize=10000): Bounded least recently used
+    cache of best routes in a SQLite file, shared by several processes.
+
+Functions:
+encode_route(best_route): Function that converts a data frame of routes to compact JSON.
+decode_route(encoded): Function that converts the JSON of encode_route back to a data frame.
+
+It requires the packages contextlib, json, os, sqlite3, threading, pandas, dynamic_search and
+file_hash to run.
+"""
+
+from contextlib import closing
+import json
+import os
+import sqlite3
+import threading
+import pandas as pd
+from .dynamic_search import GAME_COLUMNS, ROUTE_COLUMNS
+from .file_hash import hash_data_files
+
+# seconds a process waits for another process to finish writing to the disk cache
+DISK_TIMEOUT = 30.0
+# version of the routes the solvers return, part of every key of the disk cache. Raise it
+# whenever a change to the searches changes their routes, e.g. starting at any home game
+CACHE_VERSION = 2
+# the order of use of the routes is a counter kept in the cache file, shared by every process
+NEXT_USE = "SELECT COALESCE(MAX(last_used), 0) + 1 FROM routes"
+
+
+def encode_route(best_route):
+    """
+    Function that converts a data frame of routes to compact JSON, with the games of each
+        route as lists of columns and the dates as ISO strings.
+    :param best_route: data frame - routes with the route, the games on the schedule, the
+        total trip length, distance, and cost, like the output of find_best_route.
+    :return: string - JSON of a list with one object for each route
+    """
+    rows = []
+    for route, games, total_days, distance, cost in zip(
+        best_route["route"],
+        best_route["games"],
+        best_route["time"],
+        best_route["distance"],
+        best_route["cost"],
+    ):
+        games = games[GAME_COLUMNS].copy()
+        games["date"] = games["date"].dt.strftime("%Y-%m-%d")
+        rows.append(
+            {
+                "route": list(route),
+                "games": {column: games[column].tolist() for column in GAME_COLUMNS},
+                "time": int(total_days),
+                "distance": int(distance),
+                "cost": float(cost),
+            }
+        )
+    return json.dumps(rows, separators=(",", ":"))
+
+
+def decode_route(encoded):
+    """
+    Function that converts the JSON of encode_route back to a data frame of routes.
+    :param encoded: string - output of encode_route
+    :return: best_route: data frame - routes with the route, the games on the schedule, the
+        total trip length, distance, and cost. Empty if no route was stored.
+    """
+    rows = json.loads(encoded)
+    if not rows:
+        return pd.DataFrame(columns=ROUTE_COLUMNS)
+    games = []
+    for row in rows:
+        route_games = pd.DataFrame(row["games"], columns=GAME_COLUMNS)
+        route_games["date"] = pd.to_datetime(route_games["date"])
+        games.append(route_games)
+    return pd.DataFrame(
+        {
+            "route": [row["route"] for row in rows],
+            "games": games,
+            "time": [row["time"] for row in rows],
+            "distance": [row["distance"] for row in rows],
+            "cost": [row["cost"] for row in rows],
+        }
+    )
+
+
+class DiskRouteCache:
+    """
+    Bounded least recently used cache of best routes in a SQLite file. Several threads and
+        processes can read and write the same file at once: the file uses write ahead logging,
+        so readers never wait for a writer, and writers wait up to DISK_TIMEOUT seconds for
+        each other. Errors raised by solve are not cached. When two processes miss the same
+        query at once, both solve it and the last one is kept.
+    Attributes:
+        data_hash: string - output of hash_data_files for the data files, part of every key
+            with CACHE_VERSION
+    Functions:
+        query_key(teams, start_date, end_date, sort_method) - returns the normalized key
+        get(teams, start_date, end_date, sort_method) - returns the best route of the query,
+            solving it on a miss
+        cache_info() - returns the hits and misses of this process and of every process, and
+            the current and maximum size of the cache
+        clear() - removes every route and resets the counts
+    """
+
+    def __init__(self, solve, cache_path, data_files=(), maxsize=10000):
+        """
+        :param solve: function - called with (teams, start date, end date, sort method) to
+            solve a query, returns a data frame like find_best_route
+        :param cache_path: string - path of the SQLite file, created if it does not exist
+        :param data_files: list - paths of the files the routes are solved from
+        :param maxsize: int - maximum number of routes kept
+        """
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1")
+        self.solve = solve
+        self.cache_path = cache_path
+        self.maxsize = maxsize
+        self.data_hash = hash_data_files(data_files)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        folder = os.path.dirname(cache_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS routes "
+                    "(query TEXT PRIMARY KEY, result TEXT NOT NULL, last_used INTEGER NOT NULL)"
+                )
+                connection.execute(
+                    "CREATE INDEX IF NOT EXISTS routes_last_used ON routes (last_used)"
+                )
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS counts "
+                    "(name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+                )
+                connection.execute(
+                    "INSERT OR IGNORE INTO counts VALUES ('hits', 0), ('misses', 0)"
+                )
+
+    def _connect(self):
+        """
+        Function that opens a new connection to the cache file, one for each call so that
+            connections are never shared between threads or processes.
+        :return: sqlite3.Connection - connection to the cache file
+        """
+        return sqlite3.connect(self.cache_path, timeout=DISK_TIMEOUT)
+
+    def query_key(self, teams, start_date, end_date, sort_method):
+        """
+        Function that normalizes a query, so that the same set of teams, dates and sort
+            method is one key in any order or date format.
+        :param teams: list - list of teams
+        :param start_date: datetime or string - earliest date of the trip
+        :param end_date: datetime or string - latest date of the trip
+        :param sort_method: string - method of sorting
+        :return: string - key of the query in the cache file
+        """
+        return json.dumps(
+            [
+                CACHE_VERSION,
+                self.data_hash,
+                sorted(teams),
+                pd.Timestamp(start_date).date().isoformat(),
+                pd.Timestamp(end_date).date().isoformat(),
+                str(sort_method).lower(),
+            ],
+            separators=(",", ":"),
+        )
+
+    def get(self, teams, start_date, end_date, sort_method):
+        """
+        Function that returns the best route of the query, from the cache file if it was
+            solved before by any process.
+        :param teams: list - list of teams
+        :param start_date: datetime or string - earliest date of the trip
+        :param end_date: datetime or string - latest date of the trip
+        :param sort_method: string - method of sorting
+        :return: best_route: data frame - output of solve for the query
+        """
+        key = self.query_key(teams, start_date, end_date, sort_method)
+        with closing(self._connect()) as connection:
+            with connection:
+                found = connection.execute(
+                    "SELECT result FROM routes WHERE query = ?", (key,)
+                ).fetchone()
+                if found is not None:
+                    connection.execute(
+                        f"UPDATE routes SET last_used = ({NEXT_USE}) WHERE query = ?", (key,)
+                    )
+                connection.execute(
+                    "UPDATE counts SET value = value + 1 WHERE name = ?",
+                    ("misses" if found is None else "hits",),
+                )
+        if found is not None:
+            with self._lock:
+                self.hits += 1
+            return decode_route(found[0])
+        with self._lock:
+            self.misses += 1
+        best_route = self.solve(teams, start_date, end_date, sort_method)
+        result = encode_route(best_route)
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute(
+                    f"INSERT OR REPLACE INTO routes VALUES (?, ?, ({NEXT_USE}))", (key, result)
+                )
+                connection.execute(
+                    "DELETE FROM routes WHERE query NOT IN "
+                    "(SELECT query FROM routes ORDER BY last_used DESC LIMIT ?)",
+                    (self.maxsize,),
+                )
+        return best_route
+
+    def cache_info(self):
+        """
+        Function that returns the statistics of the cache.
+        :return: dictionary - hits and misses of this process, hits and misses of every
+            process since the cache file was cleared, current size of the cache file and
+            maximum size of the cache
+        """
+        with closing(self._connect()) as connection:
+            size = connection.execute("SELECT COUNT(*) FROM routes").fetchone()[0]
+            totals = dict(connection.execute("SELECT name, value FROM counts").fetchall())
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "total_hits": totals["hits"],
+                "total_misses": totals["misses"],
+                "size": size,
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        """
+        Function that removes every route from the cache file and resets the counts.
+        """
+        with closing(self._connect()) as connection:
+            with connection:
+                connection.execute("DELETE FROM routes")
+                connection.execute("UPDATE counts SET value = 0")
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
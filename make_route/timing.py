@@ -0,0 +1,178 @@
+"""
+This module records where the time of a route solve goes. Inside a SolveTimer block, every
+stage of the pipeline marked with timed_stage adds its wall time and number of calls, and
+the searches add the number of routes they evaluated and found valid. Outside of a block a
+stage only checks that no timer is active, so the timing costs almost nothing when it is
+not used.
+
+The active timer is kept in a context variable, so solves running at the same time in
+different threads each record to their own timer. A SolveProgress block works the same way
+for the progress of a long search, such as the sets of teams searched out of the total.
+
+Classes:
+SolveTimer: Context manager that records the time and calls of each stage and the route
+    counts of the solve run inside it.
+SolveProgress: Context manager that passes the progress of the solve run inside it to a
+    function, at most once per interval.
+
+Functions:
+timed_stage(stage): Decorator that records the time of a function as a stage of the active
+    timer.
+count_routes(name, number=1): Function that adds to a route count of the active timer.
+report_progress(done, total): Function that reports the progress of the search to the
+    active progress block.
+
+It requires the packages contextvars, functools, and time to run.
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+_active_timer = ContextVar("active_timer", default=None)
+_active_progress = ContextVar("active_progress", default=None)
+
+
+class SolveTimer:
+    """
+    Context manager that records the wall time and number of calls of each stage, and the
+        route counts, of the solve run inside it.
+    Attributes:
+        stages: dictionary - (calls, seconds) of each stage, with the stage as the key.
+            Stages called by other stages are counted in both.
+        counts: dictionary - route counts, such as routes_evaluated and routes_valid.
+        total: float - wall time of the whole block in seconds.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.counts = {}
+        self.total = 0.0
+        self._start = None
+        self._token = None
+
+    def __enter__(self):
+        self._token = _active_timer.set(self)
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.total = perf_counter() - self._start
+        _active_timer.reset(self._token)
+        return False
+
+    def add_time(self, stage, seconds):
+        """
+        Adds one call of a stage and its wall time.
+        :param stage: string - name of the stage
+        :param seconds: float - wall time of the call
+        """
+        calls, total = self.stages.get(stage, (0, 0.0))
+        self.stages[stage] = (calls + 1, total + seconds)
+
+    def add_count(self, name, number=1):
+        """
+        Adds to a route count.
+        :param name: string - name of the count
+        :param number: int - amount to add
+        """
+        self.counts[name] = self.counts.get(name, 0) + number
+
+    def summary(self):
+        """
+        Creates a one line summary of the solve, with the total time, the time and calls of
+            each stage, and the route counts.
+        :return: string - the summary
+        """
+        parts = [f"total {self.total * 1000:.1f} ms"]
+        for stage, (calls, seconds) in self.stages.items():
+            parts.append(f"{stage} {seconds * 1000:.1f} ms x{calls}")
+        for name, number in self.counts.items():
+            parts.append(f"{name} {number}")
+        return " | ".join(parts)
+
+
+class SolveProgress:
+    """
+    Context manager that passes the progress of the solve run inside it to a function. The
+        function is called at most once per interval, and always when the search is done.
+    Attributes:
+        report: function - takes the amount done and the total, such as the sets of teams
+            searched and the number of sets of teams.
+        interval: float - least number of seconds between two calls of report.
+    """
+
+    def __init__(self, report, interval=0.25):
+        self.report = report
+        self.interval = interval
+        self._last = None
+        self._token = None
+
+    def __enter__(self):
+        self._token = _active_progress.set(self)
+        self._last = perf_counter() - self.interval
+        return self
+
+    def __exit__(self, *exc_info):
+        _active_progress.reset(self._token)
+        return False
+
+    def update(self, done, total):
+        """
+        Calls report with the progress, unless it was called less than an interval ago and
+            the search is not done.
+        :param done: int - amount of the search done
+        :param total: int - amount of the whole search
+        """
+        now = perf_counter()
+        if done >= total or now - self._last >= self.interval:
+            self._last = now
+            self.report(done, total)
+
+
+def timed_stage(stage):
+    """
+    Decorator that records the wall time of each call of a function as a stage of the active
+        SolveTimer. The function runs unchanged when no timer is active.
+    :param stage: string - name of the stage
+    :return: decorator for the function
+    """
+
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            timer = _active_timer.get()
+            if timer is None:
+                return function(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timer.add_time(stage, perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def count_routes(name, number=1):
+    """
+    Function that adds to a route count of the active SolveTimer, if there is one.
+    :param name: string - name of the count, such as routes_evaluated or routes_valid
+    :param number: int - amount to add
+    """
+    timer = _active_timer.get()
+    if timer is not None:
+        timer.add_count(name, number)
+
+
+def report_progress(done, total):
+    """
+    Function that reports the progress of the search to the active SolveProgress, if there
+        is one.
+    :param done: int - amount of the search done, such as the sets of teams searched
+    :param total: int - amount of the whole search
+    """
+    progress = _active_progress.get()
+    if progress is not None:
+        progress.update(done, total)
@@ -2,12 +2,19 @@ import sys
 
 sys.path.append("..")
 
+import os
+import tempfile
 import unittest
+from unittest import mock
 
+import diskcache
 import numpy as np
 import plotly.graph_objects as go
 
 import app
+from make_route.dynamic_search import find_best_route
+from make_route.exhaustive_search import reduce_schedule
+from make_route.solve_cache import DiskRouteCache
 
 
 class TestAppUI(unittest.TestCase):
@@ -16,6 +23,37 @@ class TestAppUI(unittest.TestCase):
 
     """
 
+    def setUp(self):
+        """
+        Points the route cache and the background cache of the app at a temporary folder, so
+
+        the tests never read or clear the caches in cache/
+
+        """
+        self.folder = tempfile.TemporaryDirectory()
+        route_cache = DiskRouteCache(
+            app.solve_query,
+            os.path.join(self.folder.name, "routes.sqlite3"),
+            data_files=app.schedule_files() + [app.COST_CSV],
+        )
+        self.background_cache = diskcache.Cache(os.path.join(self.folder.name, "background"))
+        self.patches = [
+            mock.patch.object(app, "disk_route_cache", route_cache),
+            mock.patch.object(app, "background_cache", self.background_cache),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        """
+        Puts the caches of the app back and removes the temporary folder
+
+        """
+        for patch in self.patches:
+            patch.stop()
+        self.background_cache.close()
+        self.folder.cleanup()
+
     def create_data(self):
         """
         Constructor that creates all of the data needed for the tests
@@ -24,7 +62,7 @@ class TestAppUI(unittest.TestCase):
 
         # data for dropdown tests
         self.dropdown_selected_teams = ["A", "B", "C"]
-        self.six_teams = ["A", "B", "C", "D", "E", "F"]
+        self.max_teams = [chr(ord("A") + i) for i in range(app.MAX_TEAMS)]
         self.remaining_teams = ["A", "B", "C", "D", "E", "F", "G"]
 
         # data for graph tests
@@ -65,7 +103,7 @@ class TestAppUI(unittest.TestCase):
 
     def test_dropdown_normal(self):
         """
-        Test example where there less than 6 selected teams for the dropdown
+        Test example where there less than MAX_TEAMS selected teams for the dropdown
 
         """
         self.create_data()
@@ -75,27 +113,51 @@ class TestAppUI(unittest.TestCase):
             app.update_dropdown(self.dropdown_selected_teams, self.remaining_teams),
         )
 
-    def test_dropdown_6_teams(self):
+    def test_dropdown_max_teams(self):
         """
-        Test example where there 6 selected teams for the dropdown so no options should show
+        Test example where there MAX_TEAMS selected teams for the dropdown so no options should show
 
         """
         self.create_data()
 
         self.assertEqual(
-            (self.six_teams, self.remaining_teams),
-            app.update_dropdown(self.six_teams, self.remaining_teams),
+            (self.max_teams, self.remaining_teams),
+            app.update_dropdown(self.max_teams, self.remaining_teams),
         )
 
     def test_update_graph_no_home_games(self):
         """
-        Test example that tests the graph update code fails and raises value error when no games exist
+        Test example that tests the graph update code fails and raises value error when a team
+
+        does not exist, so it has no home games
 
         """
         self.create_data()
 
         with self.assertRaises(ValueError):
-            app.update_graph(self.bad_graph, "May 30,  2024", "June 30,  2024", "cost")
+            app.update_graph(
+                app.route_data(self.bad_graph, "May 30,  2024", "June 30,  2024", "cost")
+            )
+
+    def test_no_valid_route(self):
+        """
+        Test example where every team has a home game but no route is valid in the dates, so
+
+        the map is empty, the schedule table is empty and the metrics say there is no route
+
+        """
+        self.create_data()
+        route = app.route_data(self.good_teams, "June 3,  2024", "June 4,  2024", "cost")
+
+        self.assertEqual(
+            {"games": [], "time": None, "distance": None, "cost": None}, route
+        )
+        self.assertEqual([], list(app.update_graph(route).data[0].lon))
+        self.assertEqual([], app.update_game_schedule_table(route))
+        self.assertEqual(
+            [{"Metric": "Route", "Total": "No valid route in the dates"}],
+            app.update_sidebar_metrics_table(route),
+        )
 
     def test_update_graph_yankees_red(self):
         """
@@ -107,6 +169,105 @@ class TestAppUI(unittest.TestCase):
         self.assertEqual(
             self.graph_result_expected,
             app.update_graph(
-                self.good_teams, "May 30,  2024", "June 30,  2024", "cost"
+                app.route_data(
+                    self.good_teams, "May 30,  2024", "June 30,  2024", "cost"
+                )
             ),
         )
+
+    def test_time_all_starts(self):
+        """
+        Test example that tests a route sorted by time may start at any home game of its first
+
+        team, which is shorter than starting at the earliest game for these teams
+
+        """
+        self.create_data()
+        teams = self.good_teams + ["Seattle Mariners"]
+        short_sched = reduce_schedule(app.schedule, teams, "May 30,  2024", "June 30,  2024")
+        expected = find_best_route(teams, short_sched, app.cost_dfx, "time", all_starts=True)
+        earliest = find_best_route(teams, short_sched, app.cost_dfx, "time")
+        route = app.route_data(teams, "May 30,  2024", "June 30,  2024", "time")
+
+        self.assertLess(expected["time"][0], earliest["time"][0])
+        self.assertEqual(int(expected["time"][0]), route["time"])
+        self.assertEqual(
+            expected["games"][0]["home team"].tolist(),
+            [game["home team"] for game in route["games"]],
+        )
+
+    def test_solve_route_progress(self):
+        """
+        Test example that tests the background solve reports its progress and gives the
+
+        same route data as route_data
+
+        """
+        self.create_data()
+        progress = []
+
+        result = app.solve_route(
+            progress.append, self.good_teams, "May 30,  2024", "June 30,  2024", "cost"
+        )
+        self.assertEqual(
+            app.route_data(self.good_teams, "May 30,  2024", "June 30,  2024", "cost"),
+            result,
+        )
+        self.assertEqual(["Searched 1 of 1 sets of teams"], progress)
+        self.assertIsNone(app.solve_route(progress.append, None, None, None, "cost"))
+
+    def test_route_cache_logged(self):
+        """
+        Test example that tests the hits and misses of the route cache are logged at debug
+
+        level, so repeated queries can be seen to skip the solve
+
+        """
+        self.create_data()
+        with self.assertLogs(app.logger, level="DEBUG") as logs:
+            for _ in range(2):
+                app.get_best_route(self.good_teams, "May 30,  2024", "June 30,  2024", "cost")
+
+        cache_logs = [line for line in logs.output if "route cache" in line]
+        self.assertEqual(2, len(cache_logs))
+        self.assertIn("'total_hits': 1, 'total_misses': 1", cache_logs[-1])
+
+    def test_disk_cache_off(self):
+        """
+        Test example that tests routes are solved without the disk route cache when it is
+
+        turned off, and give the same route data
+
+        """
+        self.create_data()
+        expected = app.route_data(self.good_teams, "May 30,  2024", "June 30,  2024", "cost")
+        with mock.patch.object(app, "disk_route_cache", None):
+            route = app.route_data(self.good_teams, "May 30,  2024", "June 30,  2024", "cost")
+
+        self.assertEqual(expected, route)
+
+    def test_front_tables_merged(self):
+        """
+        Test example that tests a solve of the same dates can save its sets while another
+
+        one searches, and the table saved at the end keeps the sets of both
+
+        """
+        self.create_data()
+        dates = ("May 30,  2024", "June 30,  2024")
+        other_teams = ["Seattle Mariners", "Houston Astros"]
+        pareto_front = app.IncrementalSearch.pareto_front
+
+        def search_during(search, teams):
+            if teams != other_teams:
+                app.solve_front(other_teams, *dates)
+            return pareto_front(search, teams)
+
+        with mock.patch.object(app.IncrementalSearch, "pareto_front", search_during):
+            app.solve_front(self.good_teams, *dates)
+
+        table = self.background_cache.get(("search", app.LAUNCH_UID) + dates)
+        teams = sorted(app.schedule["home team"].unique())
+        index = {team: position for position, team in enumerate(teams)}
+        for teams in [self.good_teams, other_teams]:
+            self.assertIn(sum(1 << index[team] for team in teams), table)
@@ -0,0 +1,113 @@
+"""
+This module performs tests on the make_route.batch_solve package.
+
+Class: TestBatchSolve - Class where tests are defined and run
+
+Functions:
+    test_solve_many - smoke test testing solve_many function
+
+    test_same_as_search - one shot test that solve_many gives the same routes as
+        reduce_schedule and find_best_route for every query
+    test_parallel - one shot test that solve_many gives the same table with worker processes
+
+    test_rejected_query - edge test that a query reduce_schedule rejects gets its error
+    test_wrong_sort - edge test that a bad sort order gets an error
+"""
+
+import unittest
+from itertools import combinations
+import pandas as pd
+from make_route.exhaustive_search import reduce_schedule
+from make_route.dynamic_search import find_best_route, GAME_COLUMNS
+from make_route.batch_solve import solve_many
+
+class TestBatchSolve(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_solve_many - smoke test testing solve_many function
+
+        test_same_as_search - one shot test that solve_many gives the same routes as
+            reduce_schedule and find_best_route for every query
+        test_parallel - one shot test that solve_many gives the same table with worker
+            processes
+
+        test_rejected_query - edge test that a query reduce_schedule rejects gets its error
+        test_wrong_sort - edge test that a bad sort order gets an error
+    """
+
+    def setUp(self):
+        """
+        Reads the schedule and cost data used by the tests
+        """
+        self.mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        self.mlb_schedule['date'] = pd.to_datetime(self.mlb_schedule['date'])
+        self.cost_dfx = pd.read_csv('data/cost_df.csv')
+        teams = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                 'Boston Red Sox', 'Chicago Cubs']
+        self.queries = [(list(teamlist), '2024-05-06', '2024-06-02', method)
+                        for teamlist in combinations(teams, 3)
+                        for method in ['time', 'distance', 'cost']]
+
+    # Smoke tests
+    def test_solve_many(self):
+        """
+        Smoke test that tests if solve_many runs
+        """
+        solve_many(self.queries[:3], self.mlb_schedule, self.cost_dfx)
+
+    # One Shot Tests
+
+    def test_same_as_search(self):
+        """
+        One shot test that every row of solve_many matches find_best_route on the reduced
+            schedule of its query
+        """
+        results = solve_many(self.queries, self.mlb_schedule, self.cost_dfx)
+        self.assertEqual(len(self.queries), len(results))
+        for row in results.itertuples():
+            short_sched = reduce_schedule(self.mlb_schedule, row.teams,
+                                          row.start_date, row.end_date)
+            expected = find_best_route(row.teams, short_sched, self.cost_dfx, row.method)
+            self.assertEqual(expected['route'][0], row.route)
+            self.assertEqual(expected['time'][0], row.time)
+            self.assertEqual(expected['distance'][0], row.distance)
+            self.assertAlmostEqual(expected['cost'][0], row.cost)
+            games = self.mlb_schedule.iloc[list(row.game_rows)][GAME_COLUMNS]
+            self.assertTrue(expected['games'][0].equals(games.reset_index(drop=True)))
+
+    def test_parallel(self):
+        """
+        One shot test that solve_many gives the same table when the queries are split
+            across worker processes
+        """
+        queries = self.queries * 3
+        expected = solve_many(queries, self.mlb_schedule, self.cost_dfx)
+        result = solve_many(queries, self.mlb_schedule, self.cost_dfx, workers=2)
+        for column in ['route', 'time', 'distance', 'cost']:
+            self.assertEqual(expected[column].tolist(), result[column].tolist())
+
+    # Edge tests
+
+    def test_rejected_query(self):
+        """
+        Edge test that a query with a team that has no home game gets the error of
+            reduce_schedule and no route
+        """
+        query = (['Seattle Mariners', 'New York Yankees'], '2024-05-19', '2024-05-25', 'time')
+        results = solve_many([query], self.mlb_schedule, self.cost_dfx)
+        with self.assertRaises(ValueError) as expected:
+            reduce_schedule(self.mlb_schedule, *query[:3])
+        self.assertEqual(str(expected.exception), results['error'][0])
+        self.assertIsNone(results['route'][0])
+
+    def test_wrong_sort(self):
+        """
+        Edge test that a query with a bad sort order gets an error
+        """
+        query = (['Seattle Mariners', 'Boston Red Sox'], '2024-05-06', '2024-06-02', 'nothing')
+        results = solve_many([query], self.mlb_schedule, self.cost_dfx)
+        self.assertEqual('Invalid Sort', results['error'][0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+This module performs tests on the make_route.branch_bound package.
+
+Class: TestBranchBound - Class where tests are defined and run
+
+Functions:
+    test_branch_and_bound - smoke test testing branch_and_bound function
+
+    test_same_as_search - one shot test that branch_and_bound gives the same route as
+        reduce_routes and sort_order for every sort method
+    test_prunes_routes - one shot test that branch_and_bound expands fewer partial routes
+        than there are in the full search tree
+
+    test_no_valid_route - edge test that branch_and_bound is empty when no route is valid
+    test_wrong_sort - edge test that tests if error is raised with bad sort order
+"""
+
+import unittest
+from math import perm
+import pandas as pd
+from make_route.exhaustive_search import reduce_routes, reduce_schedule, sort_order, find_all_routes
+from make_route.branch_bound import branch_and_bound
+
+class TestBranchBound(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_branch_and_bound - smoke test testing branch_and_bound function
+
+        test_same_as_search - one shot test that branch_and_bound gives the same route as
+            reduce_routes and sort_order for every sort method
+        test_prunes_routes - one shot test that branch_and_bound expands fewer partial routes
+            than there are in the full search tree
+
+        test_no_valid_route - edge test that branch_and_bound is empty when no route is valid
+        test_wrong_sort - edge test that tests if error is raised with bad sort order
+    """
+
+    def setUp(self):
+        """
+        Reads the schedule and cost data used by the tests
+        """
+        self.mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        self.mlb_schedule['date'] = pd.to_datetime(self.mlb_schedule['date'])
+        self.cost_dfx = pd.read_csv('data/cost_df.csv')
+
+    # Smoke tests
+    def test_branch_and_bound(self):
+        """
+        Smoke test that tests if branch_and_bound runs
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-08-02')
+        branch_and_bound(teamlist, short_sched, self.cost_dfx, 'distance')
+
+    # One Shot Tests
+
+    def test_same_as_search(self):
+        """
+        One shot test that branch_and_bound gives the same route and metrics as the first row
+            of sort_order after reduce_routes
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                    'Boston Red Sox', 'Chicago Cubs', 'New York Yankees']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-06-02')
+        game_log = reduce_routes(find_all_routes(teamlist), short_sched, self.cost_dfx)
+        for method in ['time', 'distance', 'cost']:
+            expected = sort_order(game_log, method)
+            result, _ = branch_and_bound(teamlist, short_sched, self.cost_dfx, method)
+            self.assertEqual(expected['route'][0], result['route'][0])
+            for column in ['time', 'distance', 'cost']:
+                self.assertAlmostEqual(expected[column][0], result[column][0])
+            self.assertTrue(expected['games'][0].equals(result['games'][0]))
+
+    def test_prunes_routes(self):
+        """
+        One shot test that branch_and_bound prunes partial routes and expands fewer of them
+            than the full search tree has
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                    'Boston Red Sox', 'Chicago Cubs', 'New York Yankees']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-06-02')
+        partial_routes = sum(perm(len(teamlist), size) for size in range(1, len(teamlist)))
+        for method in ['time', 'distance', 'cost']:
+            _, stats = branch_and_bound(teamlist, short_sched, self.cost_dfx, method)
+            self.assertGreater(stats['pruned'], 0)
+            self.assertLess(stats['expanded'], partial_routes)
+
+    # Edge tests
+
+    def test_no_valid_route(self):
+        """
+        Edge test that tests branch_and_bound returns an empty data frame when the teams
+            can not all be visited on different days
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-05-10')
+        short_sched = short_sched.loc[short_sched['date'] == short_sched['date'].min()]
+        result, _ = branch_and_bound(teamlist, short_sched, self.cost_dfx, 'time')
+        self.assertEqual(0, len(result))
+
+    def test_wrong_sort(self):
+        """
+        Edge test that tests if error is raised with bad sort order
+        """
+        with self.assertRaises(ValueError):
+            teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+            short_sched = reduce_schedule(self.mlb_schedule, teamlist,
+                                          '2024-05-06', '2024-08-02')
+            branch_and_bound(teamlist, short_sched, self.cost_dfx, 'nothing at all')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,298 @@
+"""
+This module performs tests on the make_route.cost_matrix package.
+
+Class: TestCostMatrix - Class where tests are defined and run
+
+Functions:
+    test_build_cost_matrix - smoke test testing build_cost_matrix function
+
+    test_same_as_cost_df - one shot test that the build gives the bundled cost csv
+    test_skip_unchanged - one shot test that the build is skipped when the inputs have not
+        changed, and runs again when a parameter changes
+    test_command_line - one shot test that the command line passes the parameters
+    test_one_pass - one shot test that the cost csv and the fare store are built from one
+        pass over the airfare report
+    test_fare_matrices - one shot test that the fare matrix of each quarter has the
+        airfares of the cost csv
+    test_chunk_memory - one shot test that the peak memory of reading the report does not
+        grow with the size of the report
+    test_fare_store - one shot test that each quarter of the fare store has the fares of
+        its airfares, or of the cost csv
+
+    test_no_flights - edge test that pairs with no flight get the cost of driving
+    test_other_cities - edge test that markets of other cities and columns are dropped
+    test_duplicate_fares - edge test that a market listed more than once gets the average of
+        its fares in both directions, like the fare store
+    test_bad_mpg - edge test that tests if error is raised with miles per gallon of 0
+    test_missing_stadium - edge test that tests if error is raised when a team has no stadium
+"""
+
+import os
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from make_route.cost_matrix import build_cost_df, build_cost_matrix, main, read_stadiums
+from make_route.cost_matrix import build_fare_matrices, read_airfares, read_fare_tables
+from make_route.cost_matrix import iter_airfares
+from make_route.cost_matrix import build_fare_store, save_fare_store, load_fare_store
+from make_route.exhaustive_search import build_fare_matrix
+
+class TestCostMatrix(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_build_cost_matrix - smoke test testing build_cost_matrix function
+
+        test_same_as_cost_df - one shot test that the build gives the bundled cost csv
+        test_skip_unchanged - one shot test that the build is skipped when the inputs have
+            not changed, and runs again when a parameter changes
+        test_command_line - one shot test that the command line passes the parameters
+        test_one_pass - one shot test that the cost csv and the fare store are built from one
+            pass over the airfare report
+        test_fare_matrices - one shot test that the fare matrix of each quarter has the
+            airfares of the cost csv
+        test_chunk_memory - one shot test that the peak memory of reading the report does not
+            grow with the size of the report
+        test_fare_store - one shot test that each quarter of the fare store has the fares of
+            its airfares, or of the cost csv
+
+        test_no_flights - edge test that pairs with no flight get the cost of driving
+        test_other_cities - edge test that markets of other cities and columns are dropped
+        test_duplicate_fares - edge test that a market listed more than once gets the
+            average of its fares in both directions, like the fare store
+        test_bad_mpg - edge test that tests if error is raised with miles per gallon of 0
+        test_missing_stadium - edge test that tests if error is raised when a team has no
+            stadium
+    """
+
+    def setUp(self):
+        """
+        Writes an airfare report in a temporary folder with the fares of the bundled cost
+            csv in 2023 quarter 3, each market listed once, and other fares in 2022
+        """
+        self.folder = tempfile.TemporaryDirectory()
+        cost_df = pd.read_csv('data/cost_df.csv', index_col=0)
+        fares = cost_df.dropna(subset=['airfare'])
+        fares = fares.loc[fares['city1'] < fares['city2'], ['city1', 'city2', 'airfare']]
+        fares = fares.drop_duplicates().rename(columns={'airfare': 'fare'})
+        old_fares = fares.assign(Year=2022, quarter=3, fare=1.0)
+        fares = pd.concat([fares.assign(Year=2023, quarter=3), old_fares])
+        self.airfare_csv = os.path.join(self.folder.name, 'airfares.csv')
+        fares.to_csv(self.airfare_csv, index=False)
+        self.cost_csv = os.path.join(self.folder.name, 'cost_df.csv')
+
+    def tearDown(self):
+        """
+        Removes the temporary folder
+        """
+        self.folder.cleanup()
+
+    # Smoke tests
+    def test_build_cost_matrix(self):
+        """
+        Smoke test that tests if build_cost_matrix runs
+        """
+        build_cost_matrix(self.airfare_csv, cost_csv=self.cost_csv)
+
+    # One Shot Tests
+
+    def test_same_as_cost_df(self):
+        """
+        One shot test that the build from the fares of 2023 quarter 3 writes the same csv as
+            the bundled cost csv
+        """
+        build_cost_matrix(self.airfare_csv, cost_csv=self.cost_csv)
+        with open(self.cost_csv, encoding='utf-8') as built, \
+                open('data/cost_df.csv', encoding='utf-8') as bundled:
+            self.assertEqual(bundled.read(), built.read())
+
+    def test_skip_unchanged(self):
+        """
+        One shot test that the build is skipped when the files and parameters have not
+            changed, and runs again when a parameter changes or when forced
+        """
+        self.assertTrue(build_cost_matrix(self.airfare_csv, cost_csv=self.cost_csv))
+        self.assertFalse(build_cost_matrix(self.airfare_csv, cost_csv=self.cost_csv))
+        self.assertTrue(build_cost_matrix(self.airfare_csv, cost_csv=self.cost_csv, mpg=30))
+        self.assertTrue(build_cost_matrix(self.airfare_csv, cost_csv=self.cost_csv, mpg=30,
+                                          force=True))
+        cost_df = pd.read_csv(self.cost_csv, index_col=0)
+        self.assertAlmostEqual(cost_df['dist'][1] * 3.29 / 30, cost_df['car_fare'][1])
+
+    def test_command_line(self):
+        """
+        One shot test that the command line builds the csv with the fares of the given year,
+            and the fare store
+        """
+        store_path = os.path.join(self.folder.name, 'fare_store')
+        main(['--airfare-csv', self.airfare_csv, '--output', self.cost_csv, '--year', '2022',
+              '--fare-store', store_path])
+        cost_df = pd.read_csv(self.cost_csv, index_col=0)
+        self.assertEqual({1.0}, set(cost_df['airfare'].dropna()))
+        self.assertEqual((4, 30, 30), load_fare_store(store_path)[1].shape)
+
+    def test_one_pass(self):
+        """
+        One shot test that the cost csv and the fare store are built from one pass over the
+            airfare report, with the same fares as building each on its own, and that the
+            build is skipped again when neither would change
+        """
+        store_path = os.path.join(self.folder.name, 'fare_store')
+        with mock.patch('make_route.cost_matrix.iter_airfares', wraps=iter_airfares) as reads:
+            self.assertTrue(build_cost_matrix(self.airfare_csv, cost_csv=self.cost_csv,
+                                              fare_store=store_path))
+            self.assertEqual(1, reads.call_count)
+            self.assertFalse(build_cost_matrix(self.airfare_csv, cost_csv=self.cost_csv,
+                                               fare_store=store_path))
+            self.assertEqual(1, reads.call_count)
+        airfares, teams, fare_matrices = read_fare_tables(self.airfare_csv)
+        self.assertTrue(read_airfares(self.airfare_csv).equals(airfares))
+        self.assertEqual(list(build_fare_matrices(self.airfare_csv)[1]), list(fare_matrices))
+        cost_df = pd.read_csv(self.cost_csv, index_col=0)
+        expected = build_fare_store(cost_df, teams, fare_matrices, 2023)
+        np.testing.assert_array_equal(expected[1], load_fare_store(store_path)[1])
+
+    def test_fare_matrices(self):
+        """
+        One shot test that build_fare_matrices gives the airfares of the cost csv for 2023
+            quarter 3, and the fares of 2022 in their own matrix, for any chunk size
+        """
+        cost_df = pd.read_csv('data/cost_df.csv', index_col=0)
+        for chunk_rows in [7, 1000]:
+            teams, fare_matrices = build_fare_matrices(self.airfare_csv, chunk_rows=chunk_rows)
+            self.assertEqual([(2022, 3), (2023, 3)], list(fare_matrices))
+            self.assertEqual(cost_df['Team1'].unique().tolist(), teams)
+            np.testing.assert_allclose(cost_df['airfare'].to_numpy().reshape(30, 30),
+                                       fare_matrices[(2023, 3)])
+            self.assertEqual({1.0}, set(fare_matrices[(2022, 3)][
+                ~np.isnan(fare_matrices[(2022, 3)])]))
+
+    def test_chunk_memory(self):
+        """
+        One shot test that the peak memory of reading the airfare report in chunks stays about
+            the same when the report is 4 times longer, and is less than reading all of it
+        """
+        fares = pd.read_csv(self.airfare_csv)
+        peaks = []
+        for copies in [32, 128]:
+            report = pd.concat([fares] * copies)
+            report = report.assign(Year=np.repeat(np.arange(copies) % 4 + 1990, len(fares)))
+            report.to_csv(self.airfare_csv, index=False)
+            tracemalloc.start()
+            _, fare_matrices = build_fare_matrices(self.airfare_csv, chunk_rows=2000)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            self.assertEqual(4, len(fare_matrices))
+        tracemalloc.start()
+        pd.read_csv(self.airfare_csv)
+        full_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        self.assertLess(peaks[1], 1.5 * peaks[0])
+        self.assertLess(peaks[1], full_peak / 2)
+
+    def test_fare_store(self):
+        """
+        One shot test that the fare store has the fares of the cost csv for quarter 3 of 2023,
+            twice the airfares for quarter 1, and the fares of the cost csv for the quarters
+            with no airfares. Also tests that a saved store loads the same.
+        """
+        fares = pd.read_csv(self.airfare_csv)
+        first_quarter = fares.loc[fares['Year'] == 2023].assign(quarter=1)
+        first_quarter['fare'] = first_quarter['fare'] * 2
+        pd.concat([fares, first_quarter]).to_csv(self.airfare_csv, index=False)
+        cost_df = pd.read_csv('data/cost_df.csv', index_col=0)
+        team_index, base_fares = build_fare_matrix(cost_df)
+        teams, fare_matrices = build_fare_matrices(self.airfare_csv)
+        fare_store = build_fare_store(cost_df, teams, fare_matrices)
+        self.assertEqual(team_index, fare_store[0])
+        self.assertEqual((4, 30, 30), fare_store[1].shape)
+        for period in [1, 2, 3]:
+            np.testing.assert_allclose(base_fares, fare_store[1][period])
+        flights = cost_df.loc[cost_df['airfare'].notna() & (cost_df['dist'] >= 125)]
+        rows = flights['Team1'].map(team_index).to_numpy()
+        columns = flights['Team2'].map(team_index).to_numpy()
+        np.testing.assert_allclose(flights['airfare'].to_numpy() * 2,
+                                   fare_store[1][0][rows, columns])
+        old_store = build_fare_store(cost_df, teams, fare_matrices, year=2022)
+        np.testing.assert_allclose(1.0, old_store[1][2][rows, columns])
+        np.testing.assert_allclose(base_fares, old_store[1][0])
+        save_fare_store(fare_store, os.path.join(self.folder.name, 'fare_store'))
+        loaded_store = load_fare_store(os.path.join(self.folder.name, 'fare_store'))
+        self.assertEqual(team_index, loaded_store[0])
+        np.testing.assert_array_equal(fare_store[1], loaded_store[1])
+
+    # Edge tests
+
+    def test_no_flights(self):
+        """
+        Edge test that every pair gets the cost of driving, or the cheaper of flying and
+            driving for close pairs, when there are no fares for the quarter
+        """
+        build_cost_matrix(self.airfare_csv, cost_csv=self.cost_csv, quarter=1)
+        cost_df = pd.read_csv(self.cost_csv, index_col=0)
+        self.assertEqual(900, len(cost_df))
+        self.assertTrue(cost_df['airfare'].isna().all())
+        self.assertTrue((cost_df['fare'] == cost_df['car_fare']).all())
+
+    def test_other_cities(self):
+        """
+        Edge test that markets with a city that is not a team airport city are dropped, and
+            that columns that are not used are not read
+        """
+        report = pd.DataFrame({'tbl': ['Table6'] * 3,
+                               'Year': [2023] * 3,
+                               'quarter': [3] * 3,
+                               'city1': ['Phoenix, AZ', 'Albany, NY', 'Denver, CO'],
+                               'city2': ['Denver, CO', 'Denver, CO', 'Phoenix, AZ'],
+                               'passengers': [100, 200, 300],
+                               'fare': [100.0, 200.0, 300.0]})
+        report.to_csv(self.airfare_csv, index=False)
+        airfares = read_airfares(self.airfare_csv, 2023, 3, chunk_rows=1)
+        self.assertEqual(['city1', 'city2', 'fare'], airfares.columns.tolist())
+        self.assertEqual([100.0, 300.0], airfares['fare'].tolist())
+
+    def test_duplicate_fares(self):
+        """
+        Edge test that a market listed more than once, in either direction, gets one row per
+            pair of teams with the average of its fares, the same as the fare store, instead
+            of a row per listing
+        """
+        report = pd.DataFrame({'Year': [2023] * 3,
+                               'quarter': [3] * 3,
+                               'city1': ['Phoenix, AZ', 'Phoenix, AZ', 'Denver, CO'],
+                               'city2': ['Denver, CO', 'Denver, CO', 'Phoenix, AZ'],
+                               'fare': [100.0, 200.0, 300.0]})
+        report.to_csv(self.airfare_csv, index=False)
+        build_cost_matrix(self.airfare_csv, cost_csv=self.cost_csv)
+        cost_df = pd.read_csv(self.cost_csv, index_col=0)
+        self.assertEqual(900, len(cost_df))
+        self.assertEqual([200.0, 200.0], cost_df['airfare'].dropna().tolist())
+        teams, fare_matrices = build_fare_matrices(self.airfare_csv)
+        fare_store = build_fare_store(cost_df, teams, fare_matrices)
+        team_index, fares = build_fare_matrix(cost_df)
+        pair = team_index["Arizona D'Backs"], team_index['Colorado Rockies']
+        self.assertEqual(fares[pair], fare_store[1][2][pair])
+
+    def test_bad_mpg(self):
+        """
+        Edge test that tests if error is raised with miles per gallon that is not positive
+        """
+        with self.assertRaises(ValueError):
+            build_cost_matrix(self.airfare_csv, cost_csv=self.cost_csv, mpg=0)
+
+    def test_missing_stadium(self):
+        """
+        Edge test that tests if error is raised when a team in the airport key has no stadium
+            in the schedule
+        """
+        team_airport_key = pd.DataFrame({'Team': ['Montreal Expos'],
+                                         'AirportCity': ['Montreal, QC']})
+        with self.assertRaises(ValueError):
+            build_cost_df(pd.DataFrame(columns=['city1', 'city2', 'fare']), team_airport_key,
+                          read_stadiums())
+
+if __name__ == '__main__':
+    unittest.main()
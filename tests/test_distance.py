@@ -11,6 +11,9 @@ Functions:
     test_dist_shape - edge test - check shape of coordinate tuples
     test_dist_mat_col - edge test - check input has lat/long columns
     test_dist_mat_col2 - edge test - check input has home team column
+    test_haversine_matches_dist - one shot test - haversine matches dist element by element
+    test_pairwise_dist - one shot test - pairwise_dist matches dist for every pair
+    test_pairwise_dist_shape - edge test - check coordinate array has two columns
 
 """
 
@@ -18,7 +21,7 @@ import unittest
 import pandas as pd
 import numpy as np
 import numpy.testing as npt
-from make_route.distance import dist, dist_matrix
+from make_route.distance import dist, dist_matrix, haversine, pairwise_dist
 
 class TestDistance(unittest.TestCase):
     """
@@ -31,6 +34,9 @@ class TestDistance(unittest.TestCase):
         test_dist_shape - edge test - check shape of coordinate tuples
         test_dist_mat_col - edge test - check input has lat/long columns
         test_dist_mat_col2 - edge test - check input has home team column
+        test_haversine_matches_dist - one shot test - haversine matches dist element by element
+        test_pairwise_dist - one shot test - pairwise_dist matches dist for every pair
+        test_pairwise_dist_shape - edge test - check coordinate array has two columns
     """
 
     # Smoke tests
@@ -70,6 +76,25 @@ class TestDistance(unittest.TestCase):
         exp_mat = np.array([[0, expected],[expected, 0]])
         npt.assert_array_almost_equal(exp_mat, dist_matrix(df))
 
+    def test_haversine_matches_dist(self):
+        """
+        One shot test that tests haversine gives the same rounded distances as dist
+        """
+        points1 = np.array([[77, 35], [47.59, -122.33], [40.83, -73.93]])
+        points2 = np.array([[100, 12], [34.07, -118.24], [40.83, -73.93]])
+        expected = [dist(x, y) for x, y in zip(points1, points2)]
+        result = haversine(points1[:, 0], points1[:, 1], points2[:, 0], points2[:, 1])
+        npt.assert_array_almost_equal(expected, result, decimal=4)
+
+    def test_pairwise_dist(self):
+        """
+        One shot test that tests pairwise_dist gives dist for every pair of points
+        """
+        points = np.array([[47.59, -122.33], [34.07, -118.24], [40.83, -73.93],
+                           [25.78, -80.22]])
+        expected = np.array([[dist(x, y) for y in points] for x in points])
+        npt.assert_array_almost_equal(expected, pairwise_dist(points), decimal=4)
+
     # Edge tests
 
     def test_dist_shape(self):
@@ -97,5 +122,12 @@ class TestDistance(unittest.TestCase):
             df = pd.DataFrame({'Latitude': [77, 100], 'Longitude': [35, 12]})
             dist_matrix(df)
 
+    def test_pairwise_dist_shape(self):
+        """
+        Edge test that tests if the coordinate array has latitude and longitude columns
+        """
+        with self.assertRaises(TypeError):
+            pairwise_dist(np.array([[77, 71, 3], [100, 12, 5]]))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,174 @@
+"""
+This module performs tests on the make_route.dynamic_search package.
+
+Class: TestDynamicSearch - Class where tests are defined and run
+
+Functions:
+    test_best_route - smoke test testing find_best_route function
+
+    test_same_as_search - one shot test that find_best_route gives the same route as
+        reduce_routes and sort_order for every sort method
+    test_more_than_six - one shot test that find_best_route runs with more than 6 teams
+    test_pareto_front - one shot test that find_pareto_front gives the same front as
+        pareto_routes on every route
+    test_all_starts - one shot test that find_best_route with all_starts finds the shortest
+        trip over every start day
+
+    test_no_valid_route - edge test that find_best_route is empty when no route is valid
+    test_wrong_sort - edge test that tests if error is raised with bad sort order
+    test_fare_store - edge test that tests if error is raised with a fare store
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+from make_route.exhaustive_search import reduce_routes, reduce_schedule, sort_order, find_all_routes
+from make_route.exhaustive_search import pareto_routes, stream_routes, build_fare_matrix
+from make_route.dynamic_search import find_best_route, find_pareto_front
+
+class TestDynamicSearch(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_best_route - smoke test testing find_best_route function
+
+        test_same_as_search - one shot test that find_best_route gives the same route as
+            reduce_routes and sort_order for every sort method
+        test_more_than_six - one shot test that find_best_route runs with more than 6 teams
+        test_pareto_front - one shot test that find_pareto_front gives the same front as
+            pareto_routes on every route
+        test_all_starts - one shot test that find_best_route with all_starts finds the
+            shortest trip over every start day
+
+        test_no_valid_route - edge test that find_best_route is empty when no route is valid
+        test_wrong_sort - edge test that tests if error is raised with bad sort order
+        test_fare_store - edge test that tests if error is raised with a fare store
+    """
+
+    def setUp(self):
+        """
+        Reads the schedule and cost data used by the tests
+        """
+        self.mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        self.mlb_schedule['date'] = pd.to_datetime(self.mlb_schedule['date'])
+        self.cost_dfx = pd.read_csv('data/cost_df.csv')
+
+    # Smoke tests
+    def test_best_route(self):
+        """
+        Smoke test that tests if find_best_route runs
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-08-02')
+        find_best_route(teamlist, short_sched, self.cost_dfx, 'distance')
+
+    # One Shot Tests
+
+    def test_same_as_search(self):
+        """
+        One shot test that find_best_route gives the same route and metrics as the first row
+            of sort_order after reduce_routes
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                    'Boston Red Sox', 'Chicago Cubs']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-06-02')
+        game_log = reduce_routes(find_all_routes(teamlist), short_sched, self.cost_dfx)
+        for method in ['time', 'distance', 'cost']:
+            expected = sort_order(game_log, method)
+            result = find_best_route(teamlist, short_sched, self.cost_dfx, method)
+            self.assertEqual(expected['route'][0], result['route'][0])
+            for column in ['time', 'distance', 'cost']:
+                self.assertAlmostEqual(expected[column][0], result[column][0])
+            self.assertTrue(expected['games'][0].equals(result['games'][0]))
+
+    def test_more_than_six(self):
+        """
+        One shot test that find_best_route finds a route for more than 6 teams
+        """
+        teamlist = ['Seattle Mariners', 'New York Yankees', 'Boston Red Sox',
+                    'Baltimore Orioles', 'Texas Rangers', 'New York Mets',
+                    'Atlanta Braves', 'Chicago Cubs']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-01', '2024-06-15')
+        result = find_best_route(teamlist, short_sched, self.cost_dfx, 'time')
+        self.assertEqual(1, len(result))
+        self.assertEqual(sorted(teamlist), sorted(result['route'][0]))
+        self.assertEqual(8, len(result['games'][0]))
+
+    def test_pareto_front(self):
+        """
+        One shot test that find_pareto_front gives the same routes, in the same order, as
+            pareto_routes on the stream of every route
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                    'Boston Red Sox', 'Chicago Cubs', 'New York Yankees']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-06-02')
+        expected = pareto_routes(stream_routes(find_all_routes(teamlist), short_sched,
+                                               self.cost_dfx))
+        self.assertEqual(expected, find_pareto_front(teamlist, short_sched, self.cost_dfx))
+
+    def test_all_starts(self):
+        """
+        One shot test that find_best_route with all_starts gives the shortest trip of
+            reduce_routes over every start date of the window, and never a longer trip than
+            starting at the earliest games
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                    'Boston Red Sox']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-05-26')
+        shortest = min(
+            sort_order(reduce_routes(find_all_routes(teamlist),
+                                     short_sched.loc[short_sched['date'] >= start],
+                                     self.cost_dfx), 'time')['time'][0]
+            for start in pd.date_range('2024-05-06', '2024-05-14')
+        )
+        result = find_best_route(teamlist, short_sched, self.cost_dfx, 'time',
+                                 all_starts=True)
+        earliest = find_best_route(teamlist, short_sched, self.cost_dfx, 'time')
+        self.assertEqual(shortest, result['time'][0])
+        self.assertLess(result['time'][0], earliest['time'][0])
+        self.assertEqual(result['time'][0],
+                         (result['games'][0]['date'].iloc[-1]
+                          - result['games'][0]['date'].iloc[0]).days + 1)
+        for method in ['distance', 'cost']:
+            self.assertEqual(
+                find_best_route(teamlist, short_sched, self.cost_dfx, method)[method][0],
+                find_best_route(teamlist, short_sched, self.cost_dfx, method,
+                                all_starts=True)[method][0])
+
+    # Edge tests
+
+    def test_no_valid_route(self):
+        """
+        Edge test that tests find_best_route returns an empty data frame when the teams
+            can not all be visited on different days
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-05-10')
+        short_sched = short_sched.loc[short_sched['date'] == short_sched['date'].min()]
+        result = find_best_route(teamlist, short_sched, self.cost_dfx, 'time')
+        self.assertEqual(0, len(result))
+
+    def test_wrong_sort(self):
+        """
+        Edge test that tests if error is raised with bad sort order
+        """
+        with self.assertRaises(ValueError):
+            teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+            short_sched = reduce_schedule(self.mlb_schedule, teamlist,
+                                          '2024-05-06', '2024-08-02')
+            find_best_route(teamlist, short_sched, self.cost_dfx, 'nothing at all')
+
+    def test_fare_store(self):
+        """
+        Edge test that tests if error is raised when find_best_route is given the fares of
+            each quarter, which its cost bounds do not support
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-06-02')
+        team_index, fares = build_fare_matrix(self.cost_dfx)
+        with self.assertRaises(ValueError):
+            find_best_route(teamlist, short_sched, self.cost_dfx, 'cost',
+                            fare_matrix=(team_index, np.stack([fares] * 4)))
+
+if __name__ == '__main__':
+    unittest.main()
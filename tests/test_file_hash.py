@@ -0,0 +1,111 @@
+"""
+This module performs tests on the make_route.file_hash package.
+
+Class: TestFileHash - Class where tests are defined and run
+
+Functions:
+    test_hash_files - smoke test testing hash_data_files function
+
+    test_same_as_sha256 - one shot test that the hash of one file is the sha256 of its size
+        and contents
+    test_file_order - one shot test that the hash depends on the order of the files
+
+    test_large_file - edge test that a file larger than one block hashes like one block
+    test_moved_bytes - edge test that moving bytes from one file to the next changes the hash
+    test_no_files - edge test that an empty list hashes like empty data
+"""
+
+import hashlib
+import os
+import tempfile
+import unittest
+from make_route.file_hash import HASH_BLOCK_SIZE, hash_data_files
+
+class TestFileHash(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_hash_files - smoke test testing hash_data_files function
+
+        test_same_as_sha256 - one shot test that the hash of one file is the sha256 of its size
+        and contents
+        test_file_order - one shot test that the hash depends on the order of the files
+
+        test_large_file - edge test that a file larger than one block hashes like one block
+    test_moved_bytes - edge test that moving bytes from one file to the next changes the hash
+        test_no_files - edge test that an empty list hashes like empty data
+    """
+
+    def setUp(self):
+        """
+        Writes two small files in a temporary folder used by the tests
+        """
+        self.folder = tempfile.TemporaryDirectory()
+        self.first = os.path.join(self.folder.name, 'first.csv')
+        self.second = os.path.join(self.folder.name, 'second.csv')
+        with open(self.first, 'wb') as file:
+            file.write(b'team,date\n')
+        with open(self.second, 'wb') as file:
+            file.write(b'Boston Red Sox,2024-05-06\n')
+
+    def tearDown(self):
+        """
+        Removes the temporary folder
+        """
+        self.folder.cleanup()
+
+    # Smoke tests
+    def test_hash_files(self):
+        """
+        Smoke test that tests if hash_data_files gives a hex digest
+        """
+        self.assertEqual(64, len(hash_data_files([self.first, self.second])))
+
+    # One Shot Tests
+
+    def test_same_as_sha256(self):
+        """
+        One shot test that the hash of one file is the sha256 of its size and contents
+        """
+        self.assertEqual(hashlib.sha256((10).to_bytes(8, 'little') + b'team,date\n').hexdigest(),
+                         hash_data_files([self.first]))
+
+    def test_file_order(self):
+        """
+        One shot test that the hash changes when the order of the files changes
+        """
+        self.assertNotEqual(hash_data_files([self.first, self.second]),
+                            hash_data_files([self.second, self.first]))
+
+    # Edge tests
+
+    def test_large_file(self):
+        """
+        Edge test that tests a file read in several blocks hashes like its whole contents
+        """
+        data = os.urandom(2 * HASH_BLOCK_SIZE + 10)
+        with open(self.first, 'wb') as file:
+            file.write(data)
+        self.assertEqual(hashlib.sha256(len(data).to_bytes(8, 'little') + data).hexdigest(),
+                         hash_data_files([self.first]))
+
+    def test_moved_bytes(self):
+        """
+        Edge test that tests moving the last line of one file to the start of the next gives
+            another hash, though the bytes of the files in order are the same
+        """
+        before = hash_data_files([self.first, self.second])
+        with open(self.first, 'wb') as file:
+            file.write(b'team,')
+        with open(self.second, 'wb') as file:
+            file.write(b'date\nBoston Red Sox,2024-05-06\n')
+        self.assertNotEqual(before, hash_data_files([self.first, self.second]))
+
+    def test_no_files(self):
+        """
+        Edge test that tests an empty list of files hashes like empty data
+        """
+        self.assertEqual(hashlib.sha256().hexdigest(), hash_data_files([]))
+
+if __name__ == '__main__':
+    unittest.main()
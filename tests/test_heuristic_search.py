@@ -0,0 +1,165 @@
+"""
+This module performs tests on the make_route.heuristic_search package.
+
+Class: TestHeuristicSearch - Class where tests are defined and run
+
+Functions:
+    test_find_tour - smoke test testing find_tour function
+
+    test_same_as_exact - one shot test that find_tour finds the best route of find_best_route
+        for a few teams
+    test_all_teams - one shot test that find_tour finds a valid route of all 30 teams
+    test_same_seed - one shot test that the same seed and moves give the same route
+    test_seed_ignores_clock - one shot test that a seeded search stops on a number of moves
+        from its time budget, however slow the clock says it is
+
+    test_no_valid_route - edge test that find_tour is empty when no route is valid
+    test_wrong_sort - edge test that tests if error is raised with bad sort order
+    test_negative_budget - edge test that tests if error is raised with a negative budget
+"""
+
+import itertools
+import unittest
+from unittest import mock
+import pandas as pd
+from make_route.exhaustive_search import reduce_schedule
+from make_route.dynamic_search import find_best_route
+from make_route.heuristic_search import MOVES_PER_SECOND, find_tour
+
+class TestHeuristicSearch(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_find_tour - smoke test testing find_tour function
+
+        test_same_as_exact - one shot test that find_tour finds the best route of
+            find_best_route for a few teams
+        test_all_teams - one shot test that find_tour finds a valid route of all 30 teams
+        test_same_seed - one shot test that the same seed and moves give the same route
+        test_seed_ignores_clock - one shot test that a seeded search stops on a number of
+            moves from its time budget, however slow the clock says it is
+    test_seed_ignores_clock - one shot test that a seeded search stops on a number of moves
+        from its time budget, however slow the clock says it is
+
+        test_no_valid_route - edge test that find_tour is empty when no route is valid
+        test_wrong_sort - edge test that tests if error is raised with bad sort order
+        test_negative_budget - edge test that tests if error is raised with a negative budget
+    """
+
+    def setUp(self):
+        """
+        Reads the schedule and cost data used by the tests
+        """
+        self.mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        self.mlb_schedule['date'] = pd.to_datetime(self.mlb_schedule['date'])
+        self.cost_dfx = pd.read_csv('data/cost_df.csv')
+        self.teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                         'Boston Red Sox', 'Chicago Cubs']
+
+    # Smoke tests
+    def test_find_tour(self):
+        """
+        Smoke test that tests if find_tour runs
+        """
+        short_sched = reduce_schedule(self.mlb_schedule, self.teamlist, '2024-05-06', '2024-06-02')
+        find_tour(self.teamlist, short_sched, self.cost_dfx, 'distance', max_moves=100)
+
+    # One Shot Tests
+
+    def test_same_as_exact(self):
+        """
+        One shot test that find_tour finds the same route and metrics as find_best_route for
+            5 teams, for every sort method
+        """
+        short_sched = reduce_schedule(self.mlb_schedule, self.teamlist, '2024-05-06', '2024-06-02')
+        for method in ['time', 'distance', 'cost']:
+            expected = find_best_route(self.teamlist, short_sched, self.cost_dfx, method)
+            result, stats = find_tour(self.teamlist, short_sched, self.cost_dfx, method,
+                                      max_moves=5000)
+            self.assertEqual(5000, stats['moves'])
+            for column in ['time', 'distance', 'cost']:
+                self.assertAlmostEqual(expected[column][0], result[column][0])
+
+    def test_all_teams(self):
+        """
+        One shot test that find_tour finds a route through all 30 teams over the season, with
+            one game on each day in order of the route
+        """
+        teamlist = sorted(self.mlb_schedule['home team'].unique())
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-03-28', '2024-09-29')
+        result, _ = find_tour(teamlist, short_sched, self.cost_dfx, 'distance',
+                              max_moves=2000)
+        games = result['games'][0]
+        self.assertEqual(30, len(games))
+        self.assertEqual(result['route'][0], games['home team'].tolist())
+        self.assertTrue((games['date'].diff().dropna() >= pd.Timedelta(days=1)).all())
+        self.assertEqual(result['time'][0],
+                         (games['date'].iloc[-1] - games['date'].iloc[0]).days + 1)
+
+    def test_same_seed(self):
+        """
+        One shot test that find_tour gives the same route for the same seed and moves
+        """
+        teamlist = sorted(self.mlb_schedule['home team'].unique())[:15]
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-04-01', '2024-06-30')
+        first, _ = find_tour(teamlist, short_sched, self.cost_dfx, 'cost', seed=7,
+                             max_moves=3000)
+        second, _ = find_tour(teamlist, short_sched, self.cost_dfx, 'cost', seed=7,
+                              max_moves=3000)
+        self.assertEqual(first['route'][0], second['route'][0])
+        self.assertEqual(first['cost'][0], second['cost'][0])
+
+    def test_seed_ignores_clock(self):
+        """
+        One shot test that a seeded search makes MOVES_PER_SECOND moves for each second of
+            its budget and gives the route of that many moves, even when every reading of
+            the clock is far past the budget, and that a search with no seed stops on time
+        """
+        teamlist = sorted(self.mlb_schedule['home team'].unique())[:15]
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-04-01', '2024-06-30')
+        moves = round(0.02 * MOVES_PER_SECOND)
+        expected, _ = find_tour(teamlist, short_sched, self.cost_dfx, 'cost', seed=7,
+                                max_moves=moves)
+        slow_clock = itertools.count(step=1000.0).__next__
+        with mock.patch('make_route.heuristic_search.perf_counter', slow_clock):
+            result, stats = find_tour(teamlist, short_sched, self.cost_dfx, 'cost', seed=7,
+                                      time_budget=0.02)
+            _, unseeded = find_tour(teamlist, short_sched, self.cost_dfx, 'cost', seed=None,
+                                    max_moves=moves)
+        self.assertEqual(moves, stats['moves'])
+        self.assertEqual(expected['route'][0], result['route'][0])
+        self.assertEqual(0, unseeded['moves'])
+
+    # Edge tests
+
+    def test_no_valid_route(self):
+        """
+        Edge test that tests find_tour returns an empty data frame when the teams can not all
+            be visited on different days
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-05-10')
+        short_sched = short_sched.loc[short_sched['date'] == short_sched['date'].min()]
+        result, _ = find_tour(teamlist, short_sched, self.cost_dfx, 'time', max_moves=500)
+        self.assertEqual(0, len(result))
+
+    def test_wrong_sort(self):
+        """
+        Edge test that tests if error is raised with bad sort order
+        """
+        with self.assertRaises(ValueError):
+            short_sched = reduce_schedule(self.mlb_schedule, self.teamlist,
+                                          '2024-05-06', '2024-08-02')
+            find_tour(self.teamlist, short_sched, self.cost_dfx, 'nothing at all')
+
+    def test_negative_budget(self):
+        """
+        Edge test that tests if error is raised with a negative time budget
+        """
+        with self.assertRaises(ValueError):
+            short_sched = reduce_schedule(self.mlb_schedule, self.teamlist,
+                                          '2024-05-06', '2024-08-02')
+            find_tour(self.teamlist, short_sched, self.cost_dfx, 'time', time_budget=-1)
+
+if __name__ == '__main__':
+    unittest.main()
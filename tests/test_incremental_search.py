@@ -0,0 +1,194 @@
+"""
+This module performs tests on the make_route.incremental_search package.
+
+Class: TestIncrementalSearch - Class where tests are defined and run
+
+Functions:
+    test_pareto_front - smoke test testing IncrementalSearch.pareto_front
+
+    test_add_remove - one shot test that the front after adding and removing teams is the
+        same as find_pareto_front
+    test_add_searches_new_sets - one shot test that adding a team only searches the sets
+        with the new team, and removing a team searches nothing
+    test_best_route - one shot test that best_route gives the route of find_best_route
+    test_saved_table - one shot test that a search started from a saved table searches
+        nothing again
+    test_max_sets - one shot test that the table keeps at most max_sets sets of teams and
+        the front stays the same
+    test_merge - one shot test that merging the tables of two searches keeps the sets of
+        both, and drops the other sets first past max_sets
+
+    test_no_home_game - edge test that the front is empty for a team with no home game
+    test_wrong_sort - edge test that tests if error is raised with bad sort order
+"""
+
+import pickle
+import unittest
+import pandas as pd
+from make_route.exhaustive_search import reduce_schedule
+from make_route.dynamic_search import find_best_route, find_pareto_front
+from make_route.incremental_search import IncrementalSearch
+
+class TestIncrementalSearch(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_pareto_front - smoke test testing IncrementalSearch.pareto_front
+
+        test_add_remove - one shot test that the front after adding and removing teams is
+            the same as find_pareto_front
+        test_add_searches_new_sets - one shot test that adding a team only searches the sets
+            with the new team, and removing a team searches nothing
+        test_best_route - one shot test that best_route gives the route of find_best_route
+        test_saved_table - one shot test that a search started from a saved table searches
+            nothing again
+        test_max_sets - one shot test that the table keeps at most max_sets sets of teams
+            and the front stays the same
+        test_merge - one shot test that merging the tables of two searches keeps the sets of
+            both, and drops the other sets first past max_sets
+
+        test_no_home_game - edge test that the front is empty for a team with no home game
+        test_wrong_sort - edge test that tests if error is raised with bad sort order
+    """
+
+    def setUp(self):
+        """
+        Reads the schedule and cost data used by the tests
+        """
+        self.mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        self.mlb_schedule['date'] = pd.to_datetime(self.mlb_schedule['date'])
+        self.cost_dfx = pd.read_csv('data/cost_df.csv')
+        self.search = IncrementalSearch(self.mlb_schedule, self.cost_dfx,
+                                        '2024-05-06', '2024-06-02')
+
+    # Smoke tests
+    def test_pareto_front(self):
+        """
+        Smoke test that tests if pareto_front runs
+        """
+        self.search.pareto_front(['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox'])
+
+    # One Shot Tests
+
+    def test_add_remove(self):
+        """
+        One shot test that the front of each set of teams, as teams are added and removed,
+            is the same as find_pareto_front on the sorted teams
+        """
+        steps = [['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox'],
+                 ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox', 'Chicago Cubs'],
+                 ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox', 'Chicago Cubs',
+                  'Houston Astros'],
+                 ['Seattle Mariners', 'Boston Red Sox', 'Chicago Cubs', 'Houston Astros'],
+                 ['Seattle Mariners', 'Boston Red Sox', 'Chicago Cubs', 'Houston Astros',
+                  'New York Yankees', 'Atlanta Braves']]
+        for teamlist in steps:
+            teamlist = sorted(teamlist)
+            short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-06-02')
+            self.assertEqual(find_pareto_front(teamlist, short_sched, self.cost_dfx),
+                             self.search.pareto_front(teamlist))
+
+    def test_add_searches_new_sets(self):
+        """
+        One shot test that adding a fourth team searches the 7 new sets of two or more teams
+            with it, and removing it again searches no set
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        self.search.pareto_front(teamlist)
+        searched = self.search.stats['searched']
+        self.search.pareto_front(teamlist + ['Chicago Cubs'])
+        self.assertEqual(searched + 7, self.search.stats['searched'])
+        self.search.pareto_front(teamlist)
+        self.assertEqual(searched + 7, self.search.stats['searched'])
+
+    def test_best_route(self):
+        """
+        One shot test that best_route gives the same route and metrics as find_best_route on
+            the sorted teams, for every sort method
+        """
+        teamlist = sorted(['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                           'Boston Red Sox', 'Chicago Cubs'])
+        short_sched = reduce_schedule(self.mlb_schedule, teamlist, '2024-05-06', '2024-06-02')
+        for method in ['time', 'distance', 'cost']:
+            expected = find_best_route(teamlist, short_sched, self.cost_dfx, method)
+            result = self.search.best_route(teamlist, method)
+            self.assertEqual(expected['route'][0], result['route'][0])
+            for column in ['time', 'distance', 'cost']:
+                self.assertAlmostEqual(expected[column][0], result[column][0])
+            self.assertTrue(expected['games'][0].equals(result['games'][0]))
+
+    def test_saved_table(self):
+        """
+        One shot test that a search started from the pickled table of another search gives
+            the same front without searching any set of teams
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox', 'Chicago Cubs']
+        front = self.search.pareto_front(teamlist)
+        table = pickle.loads(pickle.dumps(self.search.table))
+        search = IncrementalSearch(self.mlb_schedule, self.cost_dfx, '2024-05-06',
+                                   '2024-06-02', table=table)
+        self.assertEqual(front, search.pareto_front(teamlist))
+        self.assertEqual(0, search.stats['searched'])
+
+    def test_max_sets(self):
+        """
+        One shot test that with max_sets the table never holds more sets of teams than that,
+            the sets of the last search are kept, and the fronts are the same as without it
+        """
+        search = IncrementalSearch(self.mlb_schedule, self.cost_dfx, '2024-05-06',
+                                   '2024-06-02', max_sets=20)
+        steps = [['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox', 'Chicago Cubs'],
+                 ['Houston Astros', 'New York Yankees', 'Atlanta Braves'],
+                 ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']]
+        for teamlist in steps:
+            self.assertEqual(self.search.pareto_front(teamlist), search.pareto_front(teamlist))
+            self.assertLessEqual(len(search.table), 20)
+        searched = search.stats['searched']
+        search.pareto_front(steps[-1])
+        self.assertEqual(searched, search.stats['searched'])
+
+    def test_merge(self):
+        """
+        One shot test that a search merged with the table of another search of the window
+            searches neither set of teams again, and that past max_sets the sets of the
+            other table are dropped before its own
+        """
+        first = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        second = ['Houston Astros', 'New York Yankees', 'Atlanta Braves']
+        other = IncrementalSearch(self.mlb_schedule, self.cost_dfx, '2024-05-06', '2024-06-02')
+        other.pareto_front(second)
+        self.search.pareto_front(first)
+        own = list(self.search.table)
+        self.search.merge(other.table)
+        self.assertEqual(set(own) | set(other.table), set(self.search.table))
+        self.assertEqual(own, list(self.search.table)[-len(own):])
+        searched = self.search.stats['searched']
+        self.search.pareto_front(second)
+        self.assertEqual(searched, self.search.stats['searched'])
+
+        search = IncrementalSearch(self.mlb_schedule, self.cost_dfx, '2024-05-06',
+                                   '2024-06-02', max_sets=len(own))
+        search.pareto_front(first)
+        search.merge(other.table)
+        self.assertEqual(own, list(search.table))
+
+    # Edge tests
+
+    def test_no_home_game(self):
+        """
+        Edge test that tests the front is empty when a team has no home game in the dates
+        """
+        search = IncrementalSearch(self.mlb_schedule, self.cost_dfx, '2024-05-06', '2024-05-07')
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        self.assertEqual([], search.pareto_front(teamlist))
+        self.assertEqual([], search.pareto_front(['A', 'B']))
+
+    def test_wrong_sort(self):
+        """
+        Edge test that tests if error is raised with bad sort order
+        """
+        with self.assertRaises(ValueError):
+            self.search.best_route(['Seattle Mariners', 'Boston Red Sox'], 'nothing at all')
+
+if __name__ == '__main__':
+    unittest.main()
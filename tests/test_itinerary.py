@@ -0,0 +1,237 @@
+"""
+This module performs tests on the make_route.itinerary package.
+
+Class: TestItinerary - Class where tests are defined and run
+
+Functions:
+    test_team_codes - smoke test testing TeamCodes with the schedule and cost data
+
+    test_walk - one shot test that walk gives the games, trip length, distance and cost of
+        find_transition_games, calculate_distance and calculate_cost
+    test_dated_walk - one shot test that walk costs each leg with the fares of the period of
+        the game traveled to
+    test_encode_decode - one shot test that routes are coded as int8 and decoded back
+    test_pickle - one shot test that an Itinerary keeps its fields through pickle
+    test_mapped_table - one shot test that a memory mapped transition table is not copied
+    test_next_game - one shot test that next_game reads the cell of the transition table
+
+    test_unknown_team - edge test that tests if error is raised for a team with no location
+    test_no_fare - edge test that tests if error is raised for a leg with no fare
+    test_no_games - edge test that a route with a team with no game is not valid
+    test_no_periods - edge test that tests if error is raised for a fare store with no dates
+"""
+
+import pickle
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from make_route.exhaustive_search import reduce_schedule, find_all_routes, build_league_matrix
+from make_route.exhaustive_search import build_fare_matrix, build_transition_table
+from make_route.exhaustive_search import find_transition_games, calculate_distance
+from make_route.exhaustive_search import calculate_cost, fare_periods
+from make_route.exhaustive_search import save_transition_table, load_transition_table
+from make_route.itinerary import Itinerary, TeamCodes
+
+class TestItinerary(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_team_codes - smoke test testing TeamCodes with the schedule and cost data
+
+        test_walk - one shot test that walk gives the games, trip length, distance and cost
+            of find_transition_games, calculate_distance and calculate_cost
+        test_dated_walk - one shot test that walk costs each leg with the fares of the
+            period of the game traveled to
+        test_encode_decode - one shot test that routes are coded as int8 and decoded back
+        test_pickle - one shot test that an Itinerary keeps its fields through pickle
+        test_mapped_table - one shot test that a memory mapped transition table is not
+            copied
+        test_next_game - one shot test that next_game reads the cell of the transition table
+
+        test_unknown_team - edge test that tests if error is raised for a team with no
+            location
+        test_no_fare - edge test that tests if error is raised for a leg with no fare
+        test_no_games - edge test that a route with a team with no game is not valid
+        test_no_periods - edge test that tests if error is raised for a fare store with no
+            dates
+    """
+
+    def setUp(self):
+        """
+        Reads the schedule and cost data, and builds the tables of a short schedule
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        self.mlb_schedule = mlb_schedule
+        self.cost_dfx = pd.read_csv('data/cost_df.csv')
+        self.teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                         'Boston Red Sox']
+        self.short_sched = reduce_schedule(mlb_schedule, self.teamlist, '2024-05-06',
+                                           '2024-05-20')
+        self.league_matrix = build_league_matrix(mlb_schedule)
+        self.fare_matrix = build_fare_matrix(self.cost_dfx)
+        self.transition_table = build_transition_table(self.short_sched)
+
+    def team_codes(self, fare_matrix=None, periods=None):
+        """
+        Builds the team codes of the short schedule
+        :param fare_matrix: tuple - fare matrix or fare store, the fare matrix if not given
+        :param periods: numpy array - fare period of each row of the short schedule
+        :return: TeamCodes of the short schedule
+        """
+        if fare_matrix is None:
+            fare_matrix = self.fare_matrix
+        return TeamCodes(self.league_matrix, fare_matrix, self.transition_table, periods)
+
+    # Smoke tests
+    def test_team_codes(self):
+        """
+        Smoke test that tests if TeamCodes runs
+        """
+        self.team_codes()
+
+    # One Shot Tests
+
+    def test_walk(self):
+        """
+        One shot test that walk gives the same games, trip length, distance and cost as
+            find_transition_games, calculate_distance and calculate_cost for every route,
+            and None for the routes that are not valid
+        """
+        team_codes = self.team_codes()
+        valid = 0
+        for route in find_all_routes(self.teamlist):
+            itinerary = team_codes.walk(team_codes.encode(route))
+            game_rows, total_days = find_transition_games(route, self.transition_table)
+            if not game_rows:
+                self.assertIsNone(itinerary)
+                continue
+            valid += 1
+            self.assertEqual(game_rows, itinerary.games.tolist())
+            self.assertEqual(total_days, itinerary.time)
+            self.assertEqual(calculate_distance(route, self.short_sched, self.league_matrix),
+                             itinerary.distance)
+            self.assertEqual(calculate_cost(route, self.cost_dfx, self.fare_matrix),
+                             itinerary.cost)
+        self.assertLess(0, valid)
+
+    def test_dated_walk(self):
+        """
+        One shot test that walk with a fare store gives the cost of calculate_cost with the
+            periods of the games of the route
+        """
+        team_index, fares = self.fare_matrix
+        fare_store = (team_index, np.stack([fares * (period + 1) for period in range(4)]))
+        periods = fare_periods(self.short_sched['date'])
+        team_codes = self.team_codes(fare_store, periods)
+        for route in find_all_routes(self.teamlist):
+            itinerary = team_codes.walk(team_codes.encode(route))
+            if itinerary is not None:
+                self.assertEqual(
+                    calculate_cost(route, self.cost_dfx, fare_store, periods[itinerary.games]),
+                    itinerary.cost)
+
+    def test_encode_decode(self):
+        """
+        One shot test that routes are coded in alphabetical order into an int8 array, and
+            decoded back to the same team names
+        """
+        team_codes = self.team_codes()
+        self.assertEqual(sorted(self.league_matrix[0]), team_codes.teams)
+        routes = find_all_routes(self.teamlist)
+        coded = team_codes.encode_routes(routes)
+        self.assertEqual(np.int8, coded.dtype)
+        self.assertEqual((24, 4), coded.shape)
+        self.assertEqual(routes, [team_codes.decode(route) for route in coded.tolist()])
+
+    def test_pickle(self):
+        """
+        One shot test that an Itinerary has no attribute dictionary, and keeps its fields
+            through pickle
+        """
+        team_codes = self.team_codes()
+        itineraries = [team_codes.walk(team_codes.encode(route))
+                       for route in find_all_routes(self.teamlist)]
+        itinerary = [itinerary for itinerary in itineraries if itinerary is not None][0]
+        self.assertFalse(hasattr(itinerary, '__dict__'))
+        copy = pickle.loads(pickle.dumps(itinerary))
+        self.assertIsInstance(copy, Itinerary)
+        for field in ['route', 'time', 'distance', 'cost']:
+            self.assertEqual(getattr(itinerary, field), getattr(copy, field))
+        np.testing.assert_array_equal(itinerary.games, copy.games)
+
+    def test_mapped_table(self):
+        """
+        One shot test that TeamCodes reads the next games from a memory mapped transition
+            table without copying it, and walks the same routes as with the built table
+        """
+        team_codes = self.team_codes()
+        with tempfile.TemporaryDirectory() as table_path:
+            save_transition_table(self.transition_table, table_path)
+            mapped = TeamCodes(self.league_matrix, self.fare_matrix,
+                               load_transition_table(table_path))
+            self.assertIsInstance(mapped.transition[1], np.memmap)
+            for route in find_all_routes(self.teamlist):
+                itinerary = team_codes.walk(team_codes.encode(route))
+                mapped_itinerary = mapped.walk(mapped.encode(route))
+                if itinerary is None:
+                    self.assertIsNone(mapped_itinerary)
+                else:
+                    self.assertEqual(itinerary.games.tolist(), mapped_itinerary.games.tolist())
+                    self.assertEqual(itinerary.time, mapped_itinerary.time)
+
+    def test_next_game(self):
+        """
+        One shot test that next_game gives the cell of the transition table of the game and
+            the column of the team, for every game and team of the short schedule
+        """
+        team_codes = self.team_codes()
+        table_codes, _, next_games, _ = self.transition_table
+        for team in self.teamlist:
+            code = team_codes.encode([team])[0]
+            games = [team_codes.next_game(game, code) for game in range(len(next_games))]
+            self.assertEqual(next_games[:, table_codes[team]].tolist(), games)
+
+    # Edge tests
+
+    def test_unknown_team(self):
+        """
+        Edge test that tests if error is raised when a route has a team that is not in the
+            league matrix
+        """
+        with self.assertRaises(ValueError):
+            self.team_codes().encode(['Seattle Mariners', 'Montreal Expos'])
+
+    def test_no_fare(self):
+        """
+        Edge test that tests if error is raised when a leg of the route has no fare
+        """
+        cost_dfx = self.cost_dfx.loc[self.cost_dfx['Team1'] != 'Boston Red Sox']
+        team_codes = self.team_codes(build_fare_matrix(cost_dfx))
+        team_codes.walk(team_codes.encode(['Seattle Mariners', 'Boston Red Sox']))
+        with self.assertRaises(ValueError):
+            team_codes.walk(team_codes.encode(['Boston Red Sox', 'Seattle Mariners']))
+
+    def test_no_games(self):
+        """
+        Edge test that a route with a team with no home game in the schedule is not valid,
+            as the first team or a later one
+        """
+        team_codes = self.team_codes()
+        self.assertTrue(team_codes.scheduled(team_codes.encode(self.teamlist)))
+        self.assertFalse(team_codes.scheduled(team_codes.encode(['Chicago Cubs'])))
+        self.assertIsNone(team_codes.walk(team_codes.encode(['Chicago Cubs'] + self.teamlist)))
+        self.assertIsNone(team_codes.walk(team_codes.encode(self.teamlist + ['Chicago Cubs'])))
+
+    def test_no_periods(self):
+        """
+        Edge test that tests if error is raised when a fare store is given without the
+            periods of the games
+        """
+        team_index, fares = self.fare_matrix
+        with self.assertRaises(ValueError):
+            self.team_codes((team_index, np.stack([fares] * 4)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+This module performs tests on the make_route.labels package.
+
+Class: TestLabels - Class where tests are defined and run
+
+Functions:
+    test_team_games - smoke test testing team_games function
+
+    test_team_games_sorted - one shot test that team_games gives the schedule index of
+        each team
+    test_fare_legs - one shot test that fare_legs gives the fares of fare_lookup
+    test_route_key - one shot test that route_key orders routes like sort_order
+    test_next_games - one shot test that next_games gives the next game after every day
+    test_greedy_route - one shot test that greedy_route takes the soonest game or cheapest
+        leg
+
+    test_no_games - edge test that a team with no home game gets no game days
+    test_greedy_stuck - edge test that greedy_route gives None when it gets stuck
+    test_no_fare - edge test that tests if error is raised for a team with no fare
+    test_fare_store - edge test that tests if error is raised for a fare store
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+from make_route.exhaustive_search import reduce_schedule, build_schedule_index
+from make_route.exhaustive_search import build_fare_matrix, fare_lookup
+from make_route.labels import team_games, fare_legs, route_key, greedy_route, next_games
+
+class TestLabels(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_team_games - smoke test testing team_games function
+
+        test_team_games_sorted - one shot test that team_games gives the schedule index of
+            each team
+        test_fare_legs - one shot test that fare_legs gives the fares of fare_lookup
+        test_route_key - one shot test that route_key orders routes like sort_order
+        test_next_games - one shot test that next_games gives the next game after every day
+        test_greedy_route - one shot test that greedy_route takes the soonest game or cheapest
+            leg
+
+        test_no_games - edge test that a team with no home game gets no game days
+        test_greedy_stuck - edge test that greedy_route gives None when it gets stuck
+        test_no_fare - edge test that tests if error is raised for a team with no fare
+        test_fare_store - edge test that tests if error is raised for a fare store
+    """
+
+    def setUp(self):
+        """
+        Reads the schedule and cost data used by the tests
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        self.teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        self.short_sched = reduce_schedule(mlb_schedule, self.teamlist, '2024-05-06',
+                                           '2024-05-20')
+        self.fare_matrix = build_fare_matrix(pd.read_csv('data/cost_df.csv'))
+
+    # Smoke tests
+    def test_team_games(self):
+        """
+        Smoke test that tests if team_games runs
+        """
+        team_games(self.teamlist, build_schedule_index(self.short_sched))
+
+    # One Shot Tests
+
+    def test_team_games_sorted(self):
+        """
+        One shot test that team_games gives the sorted game days and rows of the schedule
+            index as lists, in the order of the teams
+        """
+        schedule_index = build_schedule_index(self.short_sched)
+        game_days, game_rows = team_games(self.teamlist, schedule_index)
+        for team, days, rows in zip(self.teamlist, game_days, game_rows):
+            self.assertEqual(schedule_index[team][0].tolist(), days)
+            self.assertEqual(schedule_index[team][1].tolist(), rows)
+            self.assertEqual(sorted(days), days)
+
+    def test_fare_legs(self):
+        """
+        One shot test that fare_legs gives the fare of fare_lookup for every pair of teams,
+            and 0 from a team to itself
+        """
+        fares = fare_legs(self.teamlist, self.fare_matrix)
+        for row, team1 in enumerate(self.teamlist):
+            for column, team2 in enumerate(self.teamlist):
+                expected = 0.0 if row == column else fare_lookup(self.fare_matrix, team1, team2)
+                self.assertEqual(expected, fares[row][column])
+
+    def test_route_key(self):
+        """
+        One shot test that route_key orders by the sort method, then the other metrics, then
+            the route order and the earliest start
+        """
+        short = (12, 10, 300.0, 900.0, (1, 0), (5, 2))
+        cheap = (15, 10, 200.0, 900.0, (0, 1), (2, 5))
+        late = (13, 11, 300.0, 900.0, (1, 0), (6, 3))
+        self.assertEqual([short, late, cheap],
+                         sorted([cheap, late, short], key=lambda label: route_key(label, 'time')))
+        self.assertEqual([cheap, short, late],
+                         sorted([late, short, cheap], key=lambda label: route_key(label, 'cost')))
+        self.assertEqual((900, 3, 300.0, (1, 0), 10), route_key(short, 'distance'))
+
+    def test_next_games(self):
+        """
+        One shot test that next_games gives, for every day from the first game day, the
+            position of each team's first game after that day
+        """
+        game_days = [[3, 5, 9], [4], [6, 7]]
+        first_day, next_game = next_games(game_days)
+        self.assertEqual(3, first_day)
+        for team, days in enumerate(game_days):
+            for position, day in enumerate(range(3, 10)):
+                expected = len([game_day for game_day in days if game_day <= day])
+                self.assertEqual(expected, next_game[team][position])
+
+    def test_greedy_route(self):
+        """
+        One shot test that greedy_route takes the team with the soonest game, or the team
+            with the cheapest leg, and starts on the given day
+        """
+        game_days = [[1, 10], [9], [5, 12]]
+        legs = [[0, 1, 9], [1, 0, 1], [9, 1, 0]]
+        self.assertEqual([0, 2, 1], greedy_route(0, game_days, legs, True))
+        self.assertEqual([0, 1, 2], greedy_route(0, game_days, legs, False))
+        self.assertEqual([2, 1, 0], greedy_route(2, game_days, legs, True))
+        self.assertEqual([2, 0, 1], greedy_route(2, [[1, 10], [11], [5, 12]], legs, True, 5))
+
+    # Edge tests
+
+    def test_no_games(self):
+        """
+        Edge test that a team with no home game in the schedule index gets empty lists
+        """
+        game_days, game_rows = team_games(['Chicago Cubs'],
+                                          build_schedule_index(self.short_sched))
+        self.assertEqual(([[]], [[]]), (game_days, game_rows))
+
+    def test_greedy_stuck(self):
+        """
+        Edge test that greedy_route gives None when no remaining team has a game left
+        """
+        self.assertIsNone(greedy_route(0, [[5], [2]], [[0, 1], [1, 0]], True))
+
+    def test_no_fare(self):
+        """
+        Edge test that tests if error is raised when a team has no fare in the fare matrix
+        """
+        with self.assertRaises(ValueError):
+            fare_legs(['Seattle Mariners', 'Montreal Expos'], self.fare_matrix)
+
+    def test_fare_store(self):
+        """
+        Edge test that tests if error is raised when the fares of each quarter are given,
+            even for teams that all have fares
+        """
+        team_index, fares = self.fare_matrix
+        with self.assertRaises(ValueError):
+            fare_legs(['Seattle Mariners', 'Boston Red Sox'],
+                      (team_index, np.stack([fares] * 4)))
+
+if __name__ == '__main__':
+    unittest.main()
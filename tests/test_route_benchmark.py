@@ -0,0 +1,104 @@
+"""
+This module performs tests on the benchmarks.route_benchmark package.
+
+Class: TestRouteBenchmark - Class where tests are defined and run
+
+Functions:
+    test_run_case - smoke test testing run_case function
+
+    test_compare_regression - one shot test that compare_results finds a slower stage
+    test_compare_memory - one shot test that compare_results finds a stage with a larger
+        peak memory
+
+    test_compare_noise - edge test that compare_results skips stages below min_seconds
+    test_no_home_game - edge test that run_case is empty when a team has no home game
+"""
+
+import unittest
+import pandas as pd
+from benchmarks.route_benchmark import run_case, compare_results
+
+class TestRouteBenchmark(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_run_case - smoke test testing run_case function
+
+        test_compare_regression - one shot test that compare_results finds a slower stage
+        test_compare_memory - one shot test that compare_results finds a stage with a larger
+            peak memory
+
+        test_compare_noise - edge test that compare_results skips stages below min_seconds
+        test_no_home_game - edge test that run_case is empty when a team has no home game
+    """
+
+    def setUp(self):
+        """
+        Reads the schedule and cost data used by the tests
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        self.data = (mlb_schedule, pd.read_csv('data/cost_df.csv'))
+
+    # Smoke tests
+    def test_run_case(self):
+        """
+        Smoke test that tests if run_case times every stage
+        """
+        teamlist = ['Seattle Mariners', 'Boston Red Sox']
+        stages = run_case(teamlist, '2024-05-06', '2024-06-02', self.data, repeat=1)
+        self.assertIn('reduce_routes', stages)
+        self.assertIn('find_best_route[cost]', stages)
+        self.assertLess(0, stages['reduce_routes']['peak_bytes'])
+
+    # One Shot Tests
+
+    def test_compare_regression(self):
+        """
+        One shot test that compare_results finds the stage that got slower past the threshold
+        """
+        baseline = {'cases': {'case': {'fast': {'seconds': 1.0}, 'slow': {'seconds': 1.0}}}}
+        current = {'cases': {'case': {'fast': {'seconds': 1.1}, 'slow': {'seconds': 1.5}}}}
+        regressions = compare_results(baseline, current, threshold=25.0)
+        self.assertEqual(1, len(regressions))
+        self.assertEqual(('case', 'slow'), regressions[0][:2])
+        self.assertAlmostEqual(50.0, regressions[0][4])
+
+    # Edge tests
+
+    def test_compare_memory(self):
+        """
+        One shot test that compare_results finds the stage whose peak memory grew past the
+            memory threshold, skips stages below min_bytes, and skips memory when the memory
+            threshold is None
+        """
+        baseline = {'cases': {'case': {
+            'small': {'seconds': 1.0, 'peak_bytes': 1000},
+            'same': {'seconds': 1.0, 'peak_bytes': 1000000},
+            'grown': {'seconds': 1.0, 'peak_bytes': 1000000}}}}
+        current = {'cases': {'case': {
+            'small': {'seconds': 1.0, 'peak_bytes': 4000},
+            'same': {'seconds': 1.0, 'peak_bytes': 1100000},
+            'grown': {'seconds': 1.0, 'peak_bytes': 2000000}}}}
+        regressions = compare_results(baseline, current, memory_threshold=25.0)
+        self.assertEqual([('case', 'grown', 1000000, 2000000, 100.0, 'peak_bytes')],
+                         regressions)
+        self.assertEqual([], compare_results(baseline, current, memory_threshold=None))
+
+    def test_compare_noise(self):
+        """
+        Edge test that compare_results skips stages faster than min_seconds
+        """
+        baseline = {'cases': {'case': {'stage': {'seconds': 0.0001}}}}
+        current = {'cases': {'case': {'stage': {'seconds': 0.0005}}}}
+        self.assertEqual([], compare_results(baseline, current, min_seconds=0.001))
+
+    def test_no_home_game(self):
+        """
+        Edge test that run_case gives no stages when a team has no home game in the window
+        """
+        teamlist = ['Seattle Mariners', 'New York Yankees']
+        self.assertEqual({}, run_case(teamlist, '2024-05-19', '2024-05-25', self.data, 1))
+
+if __name__ == '__main__':
+    unittest.main()
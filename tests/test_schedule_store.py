@@ -0,0 +1,146 @@
+"""
+This module performs tests on the make_route.schedule_store package.
+
+Class: TestScheduleStore - Class where tests are defined and run
+
+Functions:
+    test_build_store - smoke test testing build_schedule_store function
+
+    test_same_as_csv - one shot test that load_schedule gives the same schedule as the csv
+    test_date_filter - one shot test that load_schedule keeps only games between the dates
+    test_schedule_files - one shot test that schedule_files lists the csv and the bundle
+
+    test_missing_store - edge test that load_schedule builds the bundle when there is none
+    test_stale_store - edge test that load_schedule builds the bundle again when the csv
+        changed
+    test_store_dtypes - edge test that the bundle uses the compact types
+    test_truncated_store - edge test that load_schedule builds the bundle again when a file
+        is cut off
+"""
+
+import os
+import tempfile
+import unittest
+import numpy as np
+from make_route.schedule_store import build_schedule_store, load_schedule, read_schedule_csv
+from make_route.schedule_store import SCHEDULE_CSV, schedule_files
+
+class TestScheduleStore(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_build_store - smoke test testing build_schedule_store function
+
+        test_same_as_csv - one shot test that load_schedule gives the same schedule as the csv
+        test_date_filter - one shot test that load_schedule keeps only games between the dates
+        test_schedule_files - one shot test that schedule_files lists the csv and the bundle
+
+        test_missing_store - edge test that load_schedule builds the bundle when there is
+            none
+        test_stale_store - edge test that load_schedule builds the bundle again when the csv
+            changed
+        test_store_dtypes - edge test that the bundle uses the compact types
+        test_truncated_store - edge test that load_schedule builds the bundle again when a
+            file is cut off
+    """
+
+    def setUp(self):
+        """
+        Builds the bundle in a temporary folder used by the tests
+        """
+        self.folder = tempfile.TemporaryDirectory()
+        self.store_path = os.path.join(self.folder.name, 'schedule_store')
+        build_schedule_store(store_path=self.store_path)
+
+    def tearDown(self):
+        """
+        Removes the temporary folder
+        """
+        self.folder.cleanup()
+
+    # Smoke tests
+    def test_build_store(self):
+        """
+        Smoke test that tests if build_schedule_store writes the bundle
+        """
+        self.assertTrue(os.path.exists(os.path.join(self.store_path, 'day.npy')))
+
+    # One Shot Tests
+
+    def test_same_as_csv(self):
+        """
+        One shot test that the schedule loaded from the bundle matches the csv
+        """
+        self.assertTrue(read_schedule_csv().equals(load_schedule(store_path=self.store_path)))
+
+    def test_date_filter(self):
+        """
+        One shot test that load_schedule only keeps the games between the dates
+        """
+        schedule = read_schedule_csv()
+        expected = schedule.loc[(schedule['date'] >= '2024-05-06')
+                                & (schedule['date'] <= '2024-05-08')].reset_index(drop=True)
+        result = load_schedule(store_path=self.store_path,
+                               start_date='2024-05-06', end_date='2024-05-08')
+        self.assertTrue(expected.equals(result))
+
+    def test_schedule_files(self):
+        """
+        One shot test that schedule_files lists the csv and every file of the bundle, and
+            only the csv when there is no bundle
+        """
+        files = schedule_files(store_path=self.store_path)
+        self.assertEqual(SCHEDULE_CSV, files[0])
+        self.assertEqual(sorted(os.listdir(self.store_path)),
+                         sorted(os.path.basename(path) for path in files[1:]))
+        missing = os.path.join(self.folder.name, 'missing')
+        self.assertEqual([SCHEDULE_CSV], schedule_files(store_path=missing))
+
+    # Edge tests
+
+    def test_missing_store(self):
+        """
+        Edge test that tests load_schedule gives the schedule of the csv when there is no
+            bundle, and builds the bundle for the next load
+        """
+        missing = os.path.join(self.folder.name, 'missing')
+        self.assertTrue(read_schedule_csv().equals(load_schedule(store_path=missing)))
+        self.assertTrue(os.path.exists(os.path.join(missing, 'source.npy')))
+
+    def test_stale_store(self):
+        """
+        Edge test that tests load_schedule does not load a bundle built from another csv,
+            and builds it again from the csv it is given
+        """
+        csv_path = os.path.join(self.folder.name, 'schedule.csv')
+        with open(SCHEDULE_CSV, encoding='utf-8') as file:
+            lines = file.readlines()
+        with open(csv_path, 'w', encoding='utf-8') as file:
+            file.writelines(lines[:-10])
+        expected = read_schedule_csv(csv_path)
+        self.assertTrue(expected.equals(load_schedule(csv_path, self.store_path)))
+        self.assertEqual(len(lines) - 11, len(np.load(os.path.join(self.store_path, 'day.npy'))))
+
+    def test_store_dtypes(self):
+        """
+        Edge test that tests the bundle stores days, teams and times in compact types
+        """
+        for name, dtype in [('day', np.int16), ('home', np.int8), ('away', np.int8),
+                            ('minutes', np.int16)]:
+            array = np.load(os.path.join(self.store_path, name + '.npy'), mmap_mode='r')
+            self.assertEqual(np.dtype(dtype), array.dtype)
+
+    def test_truncated_store(self):
+        """
+        Edge test that tests load_schedule treats a bundle with a cut off file as stale,
+            builds it again in place and leaves no temporary folder behind
+        """
+        for name in ['day', 'source']:
+            path = os.path.join(self.store_path, name + '.npy')
+            with open(path, 'r+b') as file:
+                file.truncate(os.path.getsize(path) // 2)
+            self.assertTrue(read_schedule_csv().equals(load_schedule(store_path=self.store_path)))
+            self.assertEqual(['schedule_store'], os.listdir(self.folder.name))
+
+if __name__ == '__main__':
+    unittest.main()
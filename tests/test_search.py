@@ -12,19 +12,54 @@ Functions:
     test_find_length - one shot test if find_all_routes outputs expected number
         of combinations
     test_dist_calc - One shot tests that tests accuracy of calculate_distance function
+    test_league_dist_calc - One shot tests that calculate_distance gives the same distance
+        with the league distance matrix
     test_cost_calc - One shot tests that tests accuracy of calculate_cost function
+    test_fare_matrix - One shot tests that tests build_fare_matrix matches cost data frame
     test_final_result - One shot tests that tests accuracy of final output
+    test_route_games - One shot tests that tests find_route_games finds the soonest games
+    test_transition_games - One shot tests that tests find_transition_games gives the same
+        games as find_route_games for every route, also from a saved table
+    test_valid_route_tables - One shot tests that tests check_valid_route gives the same
+        games with a schedule index, a transition table, or neither
+    test_team_routes - One shot tests that tests reduce_team_routes gives the same routes
+        as reduce_routes
+    test_top_routes - One shot tests that tests top_routes keeps the first rows of sort_order
+    test_parallel_routes - One shot tests that tests reduce_routes gives the same result with
+        worker processes
+    test_pareto_pick - One shot tests that tests pick_route on the pareto_routes front gives
+        the first row of sort_order for every method
+    test_dated_fares - One shot tests that tests each leg of a route costs the fare of the
+        quarter of the game traveled to
 
     test_no_home_games - Edge test that tests if error is raised with no home games
     test_more_teams - Edge test that tests if error is raised with more teams than days
     test_too_many_teams - Edge test that tests if error is raised when more than 6 teams
     test_wrong_sort - Edge test that tests if error is raised with bad sort order
+    test_missing_fare - Edge test that tests if error is raised when a fare is missing
+    test_invalid_route_games - Edge test that tests find_route_games with no next game
+    test_invalid_transition - Edge test that tests find_transition_games with no next game
+    test_walk_cut_prefix - Edge test that tests walk_routes skips routes after a prefix
+        with no next game
+    test_walk_schedule_index - Edge test that tests walk_routes warns that schedule_index is
+        deprecated and gives the same routes
+    test_top_routes_k - Edge test that tests if error is raised when k is less than 1
+    test_pareto_ties - Edge test that tests pareto_routes keeps only the first of equal routes
+    test_no_travel_date - Edge test that tests if error is raised when a fare store has no
+        travel date
 """
 
+import tempfile
 import unittest
+import numpy as np
 import pandas as pd
 from make_route.exhaustive_search import reduce_routes, reduce_schedule, sort_order, find_all_routes
-from make_route.exhaustive_search import calculate_distance, calculate_cost
+from make_route.exhaustive_search import calculate_distance, calculate_cost, build_league_matrix
+from make_route.exhaustive_search import build_fare_matrix, build_schedule_index, find_route_games
+from make_route.exhaustive_search import build_transition_table, find_transition_games
+from make_route.exhaustive_search import save_transition_table, load_transition_table
+from make_route.exhaustive_search import reduce_team_routes, walk_routes, stream_routes, top_routes
+from make_route.exhaustive_search import pareto_routes, pick_route, fare_periods, check_valid_route
 
 class TestSearch(unittest.TestCase):
     """
@@ -38,13 +73,41 @@ class TestSearch(unittest.TestCase):
         test_find_length - one shot test if find_all_routes outputs expected number
             of combinations
         test_dist_calc - One shot tests that tests accuracy of calculate_distance function
+        test_league_dist_calc - One shot tests that calculate_distance gives the same distance
+            with the league distance matrix
         test_cost_calc - One shot tests that tests accuracy of calculate_cost function
+        test_fare_matrix - One shot tests that tests build_fare_matrix matches cost data frame
         test_final_result - One shot tests that tests accuracy of final output
+        test_route_games - One shot tests that tests find_route_games finds the soonest games
+        test_transition_games - One shot tests that tests find_transition_games gives the same
+            games as find_route_games for every route, also from a saved table
+        test_valid_route_tables - One shot tests that tests check_valid_route gives the same
+            games with a schedule index, a transition table, or neither
+        test_team_routes - One shot tests that tests reduce_team_routes gives the same routes
+            as reduce_routes
+        test_top_routes - One shot tests that tests top_routes keeps the first rows of sort_order
+        test_parallel_routes - One shot tests that tests reduce_routes gives the same result with
+            worker processes
+        test_pareto_pick - One shot tests that tests pick_route on the pareto_routes front gives
+            the first row of sort_order for every method
+        test_dated_fares - One shot tests that tests each leg of a route costs the fare of the
+            quarter of the game traveled to
 
         test_no_home_games - Edge test that tests if error is raised with no home games
         test_more_teams - Edge test that tests if error is raised with more teams than days
         test_too_many_teams - Edge test that tests if error is raised when more than 6 teams
         test_wrong_sort - Edge test that tests if error is raised with bad sort order
+        test_missing_fare - Edge test that tests if error is raised when a fare is missing
+        test_invalid_route_games - Edge test that tests find_route_games with no next game
+        test_invalid_transition - Edge test that tests find_transition_games with no next game
+        test_walk_cut_prefix - Edge test that tests walk_routes skips routes after a prefix
+            with no next game
+        test_walk_schedule_index - Edge test that tests walk_routes warns that schedule_index
+            is deprecated and gives the same routes
+        test_top_routes_k - Edge test that tests if error is raised when k is less than 1
+        test_pareto_ties - Edge test that tests pareto_routes keeps only the first of equal routes
+        test_no_travel_date - Edge test that tests if error is raised when a fare store has no
+            travel date
     """
 
     # Smoke tests
@@ -121,6 +184,21 @@ class TestSearch(unittest.TestCase):
         expected = 1589
         self.assertAlmostEqual(expected, calculate_distance(teamlist, short_sched))
 
+    def test_league_dist_calc(self):
+        """
+        One shot tests that calculate_distance gives the same distance when the route is looked
+            up in the distance matrix of the whole league
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        league_matrix = build_league_matrix(mlb_schedule)
+        self.assertEqual((30, 30), league_matrix[1].shape)
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros', 'Boston Red Sox']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-06', '2024-08-02')
+        for route in find_all_routes(teamlist):
+            self.assertEqual(calculate_distance(route, short_sched),
+                             calculate_distance(route, short_sched, league_matrix))
+
     def test_cost_calc(self):
         """
         One shot tests that tests accuracy of calculate_cost function
@@ -132,6 +210,19 @@ class TestSearch(unittest.TestCase):
         expected = 270.21 + 322.49
         self.assertAlmostEqual(expected, calculate_cost(teamlist, cost_dfx))
 
+    def test_fare_matrix(self):
+        """
+        One shot tests that tests every fare in build_fare_matrix matches the cost data frame
+        """
+        cost_dfx = pd.read_csv('data/cost_df.csv')
+        team_index, fares = build_fare_matrix(cost_dfx)
+        self.assertEqual((30, 30), fares.shape)
+        for team1, team2, fare in zip(cost_dfx['Team1'], cost_dfx['Team2'], cost_dfx['fare']):
+            self.assertEqual(fare, fares[team_index[team1]][team_index[team2]])
+        teamlist = ["Arizona D'Backs", "Atlanta Braves", "Seattle Mariners"]
+        self.assertAlmostEqual(270.21 + 322.49,
+                               calculate_cost(teamlist, cost_dfx, (team_index, fares)))
+
     def test_final_result(self):
         """
         One shot tests that tests accuracy of final output
@@ -159,6 +250,180 @@ class TestSearch(unittest.TestCase):
         differences = expected.compare(sched)
         self.assertAlmostEqual(0, len(differences))
 
+    def test_route_games(self):
+        """
+        One shot tests that tests find_route_games finds the soonest game of each team after
+            the last game, using the schedule index
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-06', '2024-08-02')
+        game_rows, total_days = find_route_games(teamlist, build_schedule_index(short_sched))
+        dates = short_sched['date'].iloc[game_rows].dt.strftime('%m-%d-%Y').tolist()
+        self.assertEqual(['05-10-2024', '05-17-2024', '05-24-2024'], dates)
+        self.assertEqual(teamlist, short_sched['home team'].iloc[game_rows].tolist())
+        self.assertEqual(15, total_days)
+
+    def test_transition_games(self):
+        """
+        One shot tests that tests find_transition_games gives the same games and trip length
+            as find_route_games for every route, and that a saved table loads the same
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                    'Boston Red Sox']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-06', '2024-05-20')
+        schedule_index = build_schedule_index(short_sched)
+        transition_table = build_transition_table(short_sched)
+        with tempfile.TemporaryDirectory() as table_path:
+            save_transition_table(transition_table, table_path)
+            loaded_table = load_transition_table(table_path)
+            for route in find_all_routes(teamlist):
+                expected = find_route_games(route, schedule_index)
+                self.assertEqual(expected, find_transition_games(route, transition_table))
+                self.assertEqual(expected, find_transition_games(route, loaded_table))
+
+    def test_valid_route_tables(self):
+        """
+        One shot tests that tests check_valid_route gives the same validity, games and trip
+            length with the schedule index as its third argument, with a transition table as
+            a keyword, or with neither
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-06', '2024-05-20')
+        schedule_index = build_schedule_index(short_sched)
+        transition_table = build_transition_table(short_sched)
+        for route in find_all_routes(teamlist):
+            valid, games, total_days = check_valid_route(route, short_sched)
+            for other in [check_valid_route(route, short_sched, schedule_index),
+                          check_valid_route(route, short_sched,
+                                            transition_table=transition_table)]:
+                self.assertEqual((valid, total_days), (other[0], other[2]))
+                if valid:
+                    pd.testing.assert_frame_equal(games, other[1])
+
+    def test_team_routes(self):
+        """
+        One shot tests that tests reduce_team_routes gives the same routes, games and metrics,
+            in the same order, as reduce_routes on every route
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        cost_dfx = pd.read_csv('data/cost_df.csv')
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                    'Boston Red Sox', 'Chicago Cubs']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-06', '2024-05-20')
+        expected = reduce_routes(find_all_routes(teamlist), short_sched, cost_dfx)
+        result = reduce_team_routes(teamlist, short_sched, cost_dfx)
+        self.assertEqual(expected['route'].tolist(), result['route'].tolist())
+        for column in ['time', 'distance', 'cost']:
+            self.assertEqual(expected[column].tolist(), result[column].tolist())
+        for expected_games, games in zip(expected['games'], result['games']):
+            self.assertTrue(expected_games.equals(games))
+
+    def test_parallel_routes(self):
+        """
+        One shot tests that tests reduce_routes gives the same routes, games and metrics, in
+            the same order, when the routes are split across worker processes
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        cost_dfx = pd.read_csv('data/cost_df.csv')
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                    'Boston Red Sox', 'Chicago Cubs']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-06', '2024-06-02')
+        rts = find_all_routes(teamlist)
+        expected = reduce_routes(rts, short_sched, cost_dfx)
+        result = reduce_routes(rts, short_sched, cost_dfx, workers=2)
+        self.assertEqual(expected['route'].tolist(), result['route'].tolist())
+        for column in ['time', 'distance', 'cost']:
+            self.assertEqual(expected[column].tolist(), result[column].tolist())
+        for expected_games, games in zip(expected['games'], result['games']):
+            self.assertTrue(expected_games.equals(games))
+
+    def test_dated_fares(self):
+        """
+        One shot tests that tests stream_routes, walk_routes and reduce_routes cost each leg of
+            a route with the fare of the quarter of the game traveled to, for a trip across
+            the end of June
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        cost_dfx = pd.read_csv('data/cost_df.csv')
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                    'Boston Red Sox']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-06-28', '2024-07-12')
+        team_index, fares = build_fare_matrix(cost_dfx)
+        fare_store = (team_index, np.stack([fares * (period + 1) for period in range(4)]))
+        streamed = list(stream_routes(find_all_routes(teamlist), short_sched, cost_dfx,
+                                      fare_matrix=fare_store))
+        walked = list(walk_routes(teamlist, short_sched, cost_dfx, fare_matrix=fare_store))
+        reduced = reduce_routes(find_all_routes(teamlist), short_sched, cost_dfx,
+                                fare_matrix=fare_store)
+        self.assertEqual([cost for _, _, _, cost in streamed], reduced['cost'].tolist())
+        self.assertEqual([cost for _, _, _, cost in streamed],
+                         [cost for _, _, _, _, cost in walked])
+        periods = set()
+        for route, games, cost in zip(reduced['route'], reduced['games'], reduced['cost']):
+            legs = [fares[team_index[team1]][team_index[team2]] * date.quarter
+                    for team1, team2, date in zip(route, route[1:], games['date'][1:])]
+            periods.update(fare_periods(games['date'][1:]))
+            self.assertAlmostEqual(round(sum(legs), 2), cost)
+            self.assertEqual(cost, calculate_cost(route, cost_dfx, fare_store,
+                                                  fare_periods(games['date'])))
+        self.assertEqual({1, 2}, periods)
+
+    def test_pareto_pick(self):
+        """
+        One shot tests that tests the route picked from the Pareto front for each sort method is
+            the first row of sort_order, and that the weighted pick has the smallest score
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        cost_dfx = pd.read_csv('data/cost_df.csv')
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros',
+                    'Boston Red Sox', 'Chicago Cubs']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-06', '2024-06-02')
+        rts = find_all_routes(teamlist)
+        game_log = reduce_routes(rts, short_sched, cost_dfx)
+        front = pareto_routes(stream_routes(rts, short_sched, cost_dfx))
+        self.assertLess(len(front), len(game_log))
+        for method in ['time', 'distance', 'cost']:
+            expected = sort_order(game_log, method)
+            result = pick_route(front, short_sched, method)
+            self.assertEqual(expected['route'][0], result['route'][0])
+            self.assertTrue(expected['games'][0].equals(result['games'][0]))
+        weights = {'time': 50, 'distance': 0.1, 'cost': 1}
+        scores = game_log['time'] * 50 + game_log['distance'] * 0.1 + game_log['cost']
+        result = pick_route(front, short_sched, weights=weights)
+        self.assertAlmostEqual(scores.min(), result['time'][0] * 50
+                               + result['distance'][0] * 0.1 + result['cost'][0])
+
+    def test_top_routes(self):
+        """
+        One shot tests that tests top_routes on stream_routes gives the first rows of
+            sort_order on reduce_routes, with the same tie breaks and games
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        cost_dfx = pd.read_csv('data/cost_df.csv')
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Houston Astros', 'Boston Red Sox']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-06', '2024-06-02')
+        game_log = reduce_routes(find_all_routes(teamlist), short_sched, cost_dfx)
+        for method in ['time', 'distance', 'cost']:
+            expected = sort_order(game_log, method).head(3)
+            result = top_routes(stream_routes(find_all_routes(teamlist), short_sched, cost_dfx),
+                                short_sched, 3, method)
+            self.assertEqual(expected['route'].tolist(), result['route'].tolist())
+            for column in ['time', 'distance', 'cost']:
+                self.assertEqual(expected[column].tolist(), result[column].tolist())
+            for expected_games, games in zip(expected['games'], result['games']):
+                self.assertTrue(expected_games.equals(games))
+
 
     # Edge tests
 
@@ -211,5 +476,111 @@ class TestSearch(unittest.TestCase):
             game_log = reduce_routes(rts, short_sched, cost_dfx)
             sort_order(game_log, 'nothing at all')
 
+    def test_missing_fare(self):
+        """
+        Edge test that tests if error is raised when the cost data frame has no fare
+            for a leg of the route
+        """
+        with self.assertRaises(ValueError):
+            cost_dfx = pd.read_csv('data/cost_df.csv')
+            cost_dfx = cost_dfx.loc[(cost_dfx['Team1'] != 'Atlanta Braves')
+                                    | (cost_dfx['Team2'] != 'Seattle Mariners')]
+            teamlist = ["Arizona D'Backs", "Atlanta Braves", "Seattle Mariners"]
+            calculate_cost(teamlist, cost_dfx)
+
+    def test_invalid_route_games(self):
+        """
+        Edge test that tests find_route_games returns no games when a team has no home game
+            after the last game of the route
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        teamlist = ['Seattle Mariners', 'Boston Red Sox']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-06', '2024-08-02')
+        short_sched = short_sched.loc[(short_sched['home team'] == 'Seattle Mariners')
+                                      | (short_sched['date'] < '2024-05-10')]
+        self.assertEqual(([], 0), find_route_games(teamlist, build_schedule_index(short_sched)))
+
+    def test_invalid_transition(self):
+        """
+        Edge test that tests find_transition_games returns no games when a team has no home
+            game after the last game of the route, or no home game at all
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        teamlist = ['Seattle Mariners', 'Boston Red Sox']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-06', '2024-08-02')
+        short_sched = short_sched.loc[(short_sched['home team'] == 'Seattle Mariners')
+                                      | (short_sched['date'] < '2024-05-10')]
+        transition_table = build_transition_table(short_sched)
+        self.assertEqual(([], 0), find_transition_games(teamlist, transition_table))
+        self.assertEqual(([], 0), find_transition_games(['Chicago Cubs'] + teamlist,
+                                                        transition_table))
+
+    def test_walk_cut_prefix(self):
+        """
+        Edge test that tests walk_routes yields no route that starts with a prefix that has
+            no next game
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        cost_dfx = pd.read_csv('data/cost_df.csv')
+        teamlist = ['Seattle Mariners', 'Boston Red Sox', 'Chicago Cubs']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-01', '2024-08-02')
+        short_sched = short_sched.loc[(short_sched['home team'] == 'Boston Red Sox')
+                                      | (short_sched['date'] < '2024-05-10')]
+        routes = walk_routes(teamlist, short_sched, cost_dfx,
+                             league_matrix=build_league_matrix(mlb_schedule))
+        routes = [route for route, _, _, _, _ in routes]
+        self.assertLess(0, len(routes))
+        self.assertTrue(all(route[0] != 'Boston Red Sox' for route in routes))
+
+    def test_walk_schedule_index(self):
+        """
+        Edge test that tests walk_routes warns that schedule_index is deprecated, and ignores
+            it to give the same routes as without it
+        """
+        mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+        cost_dfx = pd.read_csv('data/cost_df.csv')
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        short_sched = reduce_schedule(mlb_schedule, teamlist, '2024-05-06', '2024-05-20')
+        expected = [route[0] for route in walk_routes(teamlist, short_sched, cost_dfx)]
+        with self.assertWarns(DeprecationWarning):
+            routes = walk_routes(teamlist, short_sched, cost_dfx,
+                                 schedule_index=build_schedule_index(short_sched))
+            routes = [route[0] for route in routes]
+        self.assertEqual(expected, routes)
+
+    def test_top_routes_k(self):
+        """
+        Edge test that tests if error is raised when top_routes is asked for less than 1 route
+        """
+        with self.assertRaises(ValueError):
+            mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+            mlb_schedule['date'] = pd.to_datetime(mlb_schedule['date'])
+            top_routes([], mlb_schedule, 0, 'distance')
+
+    def test_no_travel_date(self):
+        """
+        Edge test that tests if error is raised when the cost of a route is looked up in a
+            fare store without the periods of its games
+        """
+        cost_dfx = pd.read_csv('data/cost_df.csv')
+        team_index, fares = build_fare_matrix(cost_dfx)
+        with self.assertRaises(ValueError):
+            calculate_cost(['Seattle Mariners', 'Boston Red Sox'], cost_dfx,
+                           (team_index, np.stack([fares] * 4)))
+
+    def test_pareto_ties(self):
+        """
+        Edge test that tests pareto_routes drops dominated routes and keeps only the first of
+            routes with the same metrics
+        """
+        stream = [(['A', 'B'], 3, 100, 50.0), (['B', 'A'], 3, 100, 50.0),
+                  (['A', 'C'], 4, 100, 50.0), (['C', 'A'], 2, 200, 60.0)]
+        self.assertEqual([(['A', 'B'], 3, 100, 50.0), (['C', 'A'], 2, 200, 60.0)],
+                         pareto_routes(stream))
+
 if __name__ == '__main__':
     unittest.main()
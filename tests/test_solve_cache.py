@@ -0,0 +1,228 @@
+"""
+This module performs tests on the make_route.solve_cache package.
+
+Class: TestSolveCache - Class where tests are defined and run
+
+Functions:
+    test_disk_cache - smoke test testing DiskRouteCache get function
+
+    test_disk_round_trip - one shot test that a route read from the disk cache is the same
+        as the solved route, for any order of teams and date format
+    test_disk_shared - one shot test that another process reads the routes of the file and
+        its hits are counted in the file
+    test_disk_eviction - one shot test that the least recently used route is removed first
+
+    test_bad_size - edge test that tests if error is raised with a cache size below 1
+    test_error_not_cached - edge test that errors raised by solve are not cached
+    test_disk_data_changed - edge test that routes of other data files are not used
+    test_disk_version_changed - edge test that routes of another solver version are not used
+    test_disk_no_route - edge test that an empty route is cached and read back empty
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pandas as pd
+from make_route.exhaustive_search import reduce_schedule
+from make_route.dynamic_search import find_best_route, ROUTE_COLUMNS
+from make_route.solve_cache import CACHE_VERSION, DiskRouteCache
+
+DATA_FILES = ['data/final_mlb_schedule.csv', 'data/cost_df.csv']
+
+
+def solve_route(teams, start_date, end_date, sort_method):
+    """
+    Solves a query with the bundled schedule and cost data
+    """
+    schedule = pd.read_csv('data/final_mlb_schedule.csv')
+    schedule['date'] = pd.to_datetime(schedule['date'])
+    cost_df = pd.read_csv('data/cost_df.csv')
+    short_sched = reduce_schedule(schedule, list(teams), start_date, end_date)
+    return find_best_route(list(teams), short_sched, cost_df, sort_method)
+
+
+def no_solve(teams, start_date, end_date, sort_method):
+    """
+    Fails the test if a query has to be solved
+    """
+    raise AssertionError('solved ' + ', '.join(teams) + start_date + end_date + sort_method)
+
+
+def read_disk_cache(cache_path, query):
+    """
+    Reads a query from the disk cache in another process, without solving it
+    """
+    cache = DiskRouteCache(no_solve, cache_path, DATA_FILES)
+    best_route = cache.get(*query)
+    return best_route['route'][0], cache.cache_info()['hits']
+
+class TestSolveCache(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_disk_cache - smoke test testing DiskRouteCache get function
+
+        test_disk_round_trip - one shot test that a route read from the disk cache is the same
+            as the solved route, for any order of teams and date format
+        test_disk_shared - one shot test that another process reads the routes of the file and
+        its hits are counted in the file
+        test_disk_eviction - one shot test that the least recently used route is removed first
+
+        test_bad_size - edge test that tests if error is raised with a cache size below 1
+        test_error_not_cached - edge test that errors raised by solve are not cached
+        test_disk_data_changed - edge test that routes of other data files are not used
+        test_disk_version_changed - edge test that routes of another solver version are not
+            used
+        test_disk_no_route - edge test that an empty route is cached and read back empty
+    """
+
+    def setUp(self):
+        """
+        Creates the list the solve functions of the tests record their queries in
+        """
+        self.calls = []
+
+    # Smoke tests
+    def test_disk_cache(self):
+        """
+        Smoke test that tests if DiskRouteCache get runs
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            cache = DiskRouteCache(solve_route, os.path.join(folder, 'routes.sqlite3'),
+                                   DATA_FILES)
+            cache.get(['Seattle Mariners', 'Boston Red Sox'], '2024-05-06', '2024-06-02',
+                      'time')
+
+    # One Shot Tests
+
+    def test_disk_round_trip(self):
+        """
+        One shot test that a route read from the disk cache has the same route, games and
+            metrics as the solved route, for any order of teams and format of the dates
+        """
+        teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+        with tempfile.TemporaryDirectory() as folder:
+            cache = DiskRouteCache(solve_route, os.path.join(folder, 'routes.sqlite3'),
+                                   DATA_FILES)
+            solved = cache.get(teamlist, '2024-05-06', '2024-06-02', 'cost')
+            cache.solve = no_solve
+            cached = cache.get(teamlist[::-1], 'May 6,  2024', 'June 2,  2024', 'COST')
+            self.assertEqual({'hits': 1, 'misses': 1, 'total_hits': 1, 'total_misses': 1,
+                              'size': 1, 'maxsize': 10000}, cache.cache_info())
+        self.assertEqual(ROUTE_COLUMNS, cached.columns.tolist())
+        self.assertEqual(solved['route'][0], cached['route'][0])
+        for column in ['time', 'distance', 'cost']:
+            self.assertEqual(solved[column][0], cached[column][0])
+        pd.testing.assert_frame_equal(solved['games'][0], cached['games'][0])
+
+    def test_disk_shared(self):
+        """
+        One shot test that routes solved in one process are read from the file by other
+            processes without solving them, and that their hits are counted in the file
+        """
+        query = (['Seattle Mariners', 'Boston Red Sox'], '2024-05-06', '2024-06-02', 'time')
+        with tempfile.TemporaryDirectory() as folder:
+            cache_path = os.path.join(folder, 'routes.sqlite3')
+            solved = DiskRouteCache(solve_route, cache_path, DATA_FILES).get(*query)
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                results = list(executor.map(read_disk_cache, [cache_path] * 4, [query] * 4))
+            info = DiskRouteCache(no_solve, cache_path, DATA_FILES).cache_info()
+        self.assertEqual([(solved['route'][0], 1)] * 4, results)
+        self.assertEqual((4, 1), (info['total_hits'], info['total_misses']))
+
+    def test_disk_eviction(self):
+        """
+        One shot test that the least recently used route is removed when the file is full
+        """
+        def solve(teams, start_date, end_date, sort_method):
+            self.calls.append(teams[0])
+            return pd.DataFrame(columns=ROUTE_COLUMNS)
+        with tempfile.TemporaryDirectory() as folder:
+            cache = DiskRouteCache(solve, os.path.join(folder, 'routes.sqlite3'), maxsize=2)
+            for team in ['Seattle Mariners', 'Boston Red Sox', 'Seattle Mariners',
+                         'Chicago Cubs', 'Seattle Mariners', 'Boston Red Sox']:
+                cache.get([team], '2024-05-06', '2024-06-02', 'time')
+            self.assertEqual(2, cache.cache_info()['size'])
+        self.assertEqual(['Seattle Mariners', 'Boston Red Sox', 'Chicago Cubs',
+                          'Boston Red Sox'], self.calls)
+
+    # Edge tests
+
+    def test_bad_size(self):
+        """
+        Edge test that tests if error is raised with a cache size below 1
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            with self.assertRaises(ValueError):
+                DiskRouteCache(no_solve, os.path.join(folder, 'routes.sqlite3'), maxsize=0)
+
+    def test_error_not_cached(self):
+        """
+        Edge test that errors raised by solve are raised again on the next call
+        """
+        def solve(teams, start_date, end_date, sort_method):
+            self.calls.append(teams)
+            raise ValueError(teams[0] + ' do not have a home game in this time frame')
+        with tempfile.TemporaryDirectory() as folder:
+            cache = DiskRouteCache(solve, os.path.join(folder, 'routes.sqlite3'))
+            for _ in range(2):
+                with self.assertRaises(ValueError):
+                    cache.get(['Seattle Mariners'], '2024-05-06', '2024-06-02', 'time')
+            self.assertEqual(0, cache.cache_info()['size'])
+        self.assertEqual(2, len(self.calls))
+
+    def test_disk_data_changed(self):
+        """
+        Edge test that routes solved from other data files are solved again
+        """
+        def solve(teams, start_date, end_date, sort_method):
+            self.calls.append(teams[0])
+            return pd.DataFrame(columns=ROUTE_COLUMNS)
+        with tempfile.TemporaryDirectory() as folder:
+            cache_path = os.path.join(folder, 'routes.sqlite3')
+            data_file = os.path.join(folder, 'cost_df.csv')
+            with open(data_file, 'w', encoding='utf-8') as file:
+                file.write('team1,team2,cost\n')
+            DiskRouteCache(solve, cache_path, [data_file]).get(['Chicago Cubs'], '2024-05-06',
+                                                                '2024-06-02', 'cost')
+            with open(data_file, 'a', encoding='utf-8') as file:
+                file.write('Chicago Cubs,Boston Red Sox,100\n')
+            DiskRouteCache(solve, cache_path, [data_file]).get(['Chicago Cubs'], '2024-05-06',
+                                                                '2024-06-02', 'cost')
+        self.assertEqual(['Chicago Cubs', 'Chicago Cubs'], self.calls)
+
+    def test_disk_version_changed(self):
+        """
+        Edge test that routes solved by another version of the solvers are solved again
+        """
+        def solve(teams, start_date, end_date, sort_method):
+            self.calls.append(teams[0])
+            return pd.DataFrame(columns=ROUTE_COLUMNS)
+        with tempfile.TemporaryDirectory() as folder:
+            cache = DiskRouteCache(solve, os.path.join(folder, 'routes.sqlite3'))
+            cache.get(['Chicago Cubs'], '2024-05-06', '2024-06-02', 'time')
+            with mock.patch('make_route.solve_cache.CACHE_VERSION', CACHE_VERSION + 1):
+                cache.get(['Chicago Cubs'], '2024-05-06', '2024-06-02', 'time')
+            cache.get(['Chicago Cubs'], '2024-05-06', '2024-06-02', 'time')
+        self.assertEqual(['Chicago Cubs', 'Chicago Cubs'], self.calls)
+
+    def test_disk_no_route(self):
+        """
+        Edge test that a query with no valid route is cached and read back as an empty data
+            frame
+        """
+        def solve(teams, start_date, end_date, sort_method):
+            self.calls.append(teams[0])
+            return pd.DataFrame(columns=ROUTE_COLUMNS)
+        with tempfile.TemporaryDirectory() as folder:
+            cache = DiskRouteCache(solve, os.path.join(folder, 'routes.sqlite3'), DATA_FILES)
+            cache.get(['Seattle Mariners'], '2024-05-06', '2024-05-08', 'time')
+            cached = cache.get(['Seattle Mariners'], '2024-05-06', '2024-05-08', 'time')
+        self.assertEqual(1, len(self.calls))
+        self.assertEqual(0, len(cached))
+        self.assertEqual(ROUTE_COLUMNS, cached.columns.tolist())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+This module performs tests on the make_route.timing package.
+
+Class: TestTiming - Class where tests are defined and run
+
+Functions:
+    test_solve_timer - smoke test testing SolveTimer with a route solve
+
+    test_stage_counts - one shot test that the timer counts stage calls and routes
+    test_summary - one shot test that summary gives one line with every stage
+    test_solve_progress - one shot test that SolveProgress reports the sets of teams
+        searched by find_best_route
+    test_search_stages - one shot test that the stages inside the dynamic and incremental
+        searches are timed
+
+    test_no_timer - edge test that stages run and record nothing without a timer
+    test_nested_timers - edge test that an inner timer does not record into the outer one
+"""
+
+import unittest
+import pandas as pd
+from make_route.exhaustive_search import reduce_routes, reduce_schedule, sort_order, find_all_routes
+from make_route.dynamic_search import find_best_route
+from make_route.incremental_search import IncrementalSearch
+from make_route.timing import SolveTimer, SolveProgress, count_routes, report_progress
+from make_route.timing import timed_stage
+
+class TestTiming(unittest.TestCase):
+    """
+    Class where all tests that are called will run and are defined
+    Functions:
+        test_solve_timer - smoke test testing SolveTimer with a route solve
+
+        test_stage_counts - one shot test that the timer counts stage calls and routes
+        test_summary - one shot test that summary gives one line with every stage
+        test_solve_progress - one shot test that SolveProgress reports the sets of teams
+            searched by find_best_route
+        test_search_stages - one shot test that the stages inside the dynamic and
+            incremental searches are timed
+
+        test_no_timer - edge test that stages run and record nothing without a timer
+        test_nested_timers - edge test that an inner timer does not record into the outer one
+    """
+
+    def setUp(self):
+        """
+        Reads the schedule and cost data used by the tests
+        """
+        self.mlb_schedule = pd.read_csv('data/final_mlb_schedule.csv')
+        self.mlb_schedule['date'] = pd.to_datetime(self.mlb_schedule['date'])
+        self.cost_dfx = pd.read_csv('data/cost_df.csv')
+        self.teamlist = ['Seattle Mariners', 'Kansas City Royals', 'Boston Red Sox']
+
+    def solve(self):
+        """
+        Runs the exhaustive search for the test teams
+        """
+        short_sched = reduce_schedule(self.mlb_schedule, self.teamlist,
+                                      '2024-05-06', '2024-08-02')
+        game_log = reduce_routes(find_all_routes(self.teamlist), short_sched, self.cost_dfx)
+        return sort_order(game_log, 'distance')
+
+    # Smoke tests
+    def test_solve_timer(self):
+        """
+        Smoke test that tests if a solve runs inside SolveTimer
+        """
+        with SolveTimer():
+            self.solve()
+
+    # One Shot Tests
+
+    def test_stage_counts(self):
+        """
+        One shot test that the timer counts each stage call and the routes checked
+        """
+        with SolveTimer() as timer:
+            game_log = self.solve()
+        self.assertEqual(1, timer.stages['reduce_schedule'][0])
+        self.assertEqual(1, timer.stages['reduce_routes'][0])
+        self.assertEqual(1, timer.stages['team_codes'][0])
+        self.assertEqual(1, timer.stages['walk_itineraries'][0])
+        self.assertEqual(1, timer.stages['route_frame'][0])
+        self.assertNotIn('check_valid_route', timer.stages)
+        self.assertEqual(1, timer.stages['sort_order'][0])
+        self.assertEqual(6, timer.counts['routes_evaluated'])
+        self.assertEqual(len(game_log), timer.counts['routes_valid'])
+        self.assertLessEqual(timer.stages['reduce_routes'][1], timer.total)
+
+    def test_summary(self):
+        """
+        One shot test that the summary is one line with the total, stages and counts
+        """
+        with SolveTimer() as timer:
+            self.solve()
+        summary = timer.summary()
+        self.assertNotIn('\n', summary)
+        self.assertTrue(summary.startswith('total '))
+        for name in ['reduce_schedule', 'reduce_routes', 'sort_order', 'routes_valid']:
+            self.assertIn(name, summary)
+
+    def test_solve_progress(self):
+        """
+        One shot test that SolveProgress reports every set of teams of the dynamic search,
+            ending with all of them searched
+        """
+        reports = []
+        short_sched = reduce_schedule(self.mlb_schedule, self.teamlist,
+                                      '2024-05-06', '2024-08-02')
+        with SolveProgress(lambda done, total: reports.append((done, total)), interval=0):
+            find_best_route(self.teamlist, short_sched, self.cost_dfx, 'distance')
+        self.assertEqual([(1, 4), (2, 4), (3, 4), (4, 4)], reports)
+        reports.clear()
+        with SolveProgress(lambda done, total: reports.append((done, total)), interval=60):
+            for done in range(1, 5):
+                report_progress(done, 4)
+        self.assertEqual([(1, 4), (4, 4)], reports)
+
+    def test_search_stages(self):
+        """
+        One shot test that a dynamic search times its bounds, each layer of sets of teams
+            and the data frame of the result, and an incremental search times its layers
+        """
+        short_sched = reduce_schedule(self.mlb_schedule, self.teamlist,
+                                      '2024-05-06', '2024-08-02')
+        with SolveTimer() as timer:
+            find_best_route(self.teamlist, short_sched, self.cost_dfx, 'time', all_starts=True)
+        self.assertEqual(1, timer.stages['greedy_bound'][0])
+        self.assertEqual(1, timer.stages['completion_bounds'][0])
+        self.assertEqual(2, timer.stages['expand_layer'][0])
+        self.assertEqual(1, timer.stages['route_frame'][0])
+        with SolveTimer() as timer:
+            search = IncrementalSearch(self.mlb_schedule, self.cost_dfx, '2024-05-06',
+                                       '2024-08-02')
+            search.best_route(self.teamlist)
+        self.assertEqual(2, timer.stages['expand_layer'][0])
+        self.assertEqual(1, timer.stages['top_routes'][0])
+
+    # Edge tests
+
+    def test_no_timer(self):
+        """
+        Edge test that a stage runs unchanged and nothing is recorded without a timer
+        """
+        @timed_stage('double')
+        def double(number):
+            return 2 * number
+        self.assertEqual(4, double(2))
+        count_routes('routes_valid')
+        with SolveTimer() as timer:
+            pass
+        self.assertEqual({}, timer.stages)
+        self.assertEqual({}, timer.counts)
+
+    def test_nested_timers(self):
+        """
+        Edge test that stages inside an inner timer only record to the inner timer
+        """
+        with SolveTimer() as outer:
+            with SolveTimer() as inner:
+                count_routes('routes_valid', 3)
+            count_routes('routes_valid')
+        self.assertEqual(3, inner.counts['routes_valid'])
+        self.assertEqual(1, outer.counts['routes_valid'])
+
+if __name__ == '__main__':
+    unittest.main()